@@ -11,12 +11,14 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "src"))
 
-from src.scraping.main import TheaterScrapingOrchestrator
+# オーケストレーター（requests・スクレイパー群）はスクレイピングを行うコマンドでのみ読み込む
+from src.scraping.registry import get_theater_entries
 
 def run_single_theater_test():
     """単一映画館のテストスクレイピング"""
     print("=== 単一映画館テストスクレイピング ===")
     
+    from src.scraping.main import TheaterScrapingOrchestrator
     orchestrator = TheaterScrapingOrchestrator(output_dir="test_output")
     
     # ケイズシネマでテスト
@@ -25,8 +27,8 @@ def run_single_theater_test():
     
     if result:
         print("✅ ケイズシネマのスクレイピング成功")
-        print(f"映画数: {len(result.get('movies', []))}")
-        print(f"スケジュール数: {len(result.get('schedules', []))}")
+        print(f"映画数: {result['counts']['movies']}")
+        print(f"スケジュール数: {result['counts']['schedules']}")
     else:
         print("❌ ケイズシネマのスクレイピング失敗")
 
@@ -34,6 +36,7 @@ def run_all_theaters():
     """全映画館のスクレイピング"""
     print("=== 全映画館スクレイピング ===")
     
+    from src.scraping.main import TheaterScrapingOrchestrator
     orchestrator = TheaterScrapingOrchestrator(output_dir="output")
     results = orchestrator.scrape_all_theaters()
     summary = orchestrator.generate_summary_report(results)
@@ -50,21 +53,66 @@ def show_available_theaters():
     """利用可能な映画館一覧表示"""
     print("=== 利用可能な映画館一覧 ===")
     
-    orchestrator = TheaterScrapingOrchestrator()
+    for entry in get_theater_entries():
+        print(f"📽️  {entry.name} ({entry.key})")
+        print(f"   URL: {entry.url}")
+        print()
+
+def run_compaction(dry_run: bool = False):
+    """output/の結果ファイルの重複削除・アーカイブ・保持期限の適用（ページ本文の整理を含む）"""
+    print("=== 結果ファイルの圧縮・整理 ===" + ("（確認のみ）" if dry_run else ""))
     
-    theaters = [
-        ("ks_cinema", "ケイズシネマ", "https://www.ks-cinema.com"),
-        ("pole_pole", "ポレポレ東中野", "https://pole2.co.jp"),
-        ("eurospace", "ユーロスペース", "https://www.eurospace.co.jp"),
-        ("shimotakaido", "下高井戸シネマ", "https://shimotakaido-cinema.stores.jp"),
-        ("waseda_shochiku", "早稲田松竹", "http://wasedashochiku.co.jp"),
-        ("shinjuku_musashino", "新宿武蔵野館", "https://shinjuku.musashino-k.jp")
-    ]
+    from src.scraping.snapshot_compaction import SnapshotCompactor
+    report = SnapshotCompactor(output_dir="output").compact(dry_run=dry_run)
     
-    for key, name, url in theaters:
-        print(f"📽️  {name} ({key})")
-        print(f"   URL: {url}")
-        print()
+    print(f"重複削除: {report.deduplicated}件")
+    print(f"アーカイブ: {report.archived}件（サマリーレポート {report.archived_summaries}件）")
+    print(f"保持期限切れ: {report.expired}件")
+    print(f"ページ本文: 取得記録 {report.pages_expired}件・本文 {report.pages_deleted}件を削除")
+    for archive in report.archives:
+        print(f"  - {archive}")
+    if not dry_run:
+        print(f"容量: {report.bytes_before:,} → {report.bytes_after:,} bytes")
+
+def run_reprocess(theater_key: str, at_text: str = None):
+    """保存済みのページ本文から抽出をやり直し、保存済みの結果と比べる"""
+    from datetime import datetime
+    from src.scraping.main import TheaterScrapingOrchestrator
+    from src.scraping.snapshot_catalog import get_snapshot_catalog
+    from src.scraping.snapshot_files import content_hash
+    
+    at = datetime.fromisoformat(at_text) if at_text else None
+    print(f"=== {theater_key} の再処理 ===" + (f"（{at.isoformat()} 時点）" if at else ""))
+    
+    orchestrator = TheaterScrapingOrchestrator(output_dir="output")
+    result = orchestrator.reprocess_theater(theater_key, at)
+    if not result:
+        print(f"❌ {theater_key} の再処理に失敗")
+        return
+    print(f"映画数: {len(result['movies'])}")
+    print(f"スケジュール数: {len(result['schedules'])}")
+    print(f"状態: {result['status']}（ページ取得日時: {result['scraped_at']}）")
+    
+    # 同じ時点の保存済みの結果と内容が同じか
+    catalog = get_snapshot_catalog("output")
+    entries = catalog.in_range(theater_key, datetime.min, at or datetime.max)
+    if entries:
+        same = entries[-1].content_hash == content_hash(result)
+        print(f"保存済みの結果（{entries[-1].file}）と" + ("同じ内容" if same else "異なる内容"))
+
+def export_archived_pages(dest_dir: str = "html/archive", theater_key: str = None):
+    """保存済みのページ本文をHTMLファイルとして書き出し（html/用のユーティリティで使う）"""
+    from src.scraping.page_archive import get_page_archive
+    
+    archive = get_page_archive()
+    if archive is None:
+        print("ページ本文の保存が無効です（PAGE_ARCHIVE_ENABLED）")
+        return
+    paths = archive.export(dest_dir, theater_key)
+    print(f"{len(paths)}ページを {dest_dir} に書き出しました")
+    stats = archive.stats()
+    print(f"取得記録 {stats['records']}件 / 保存ページ {stats['pages']}件 "
+          f"（{stats['raw_bytes']:,} → {stats['stored_bytes']:,} bytes）")
 
 def main():
     """メイン実行関数"""
@@ -77,8 +125,15 @@ def main():
             run_all_theaters()
         elif command == "list":
             show_available_theaters()
-        elif command in ["ks_cinema", "pole_pole", "eurospace", "shimotakaido", "waseda_shochiku", "shinjuku_musashino"]:
+        elif command == "compact":
+            run_compaction(dry_run="--dry-run" in sys.argv[2:])
+        elif command == "reprocess" and len(sys.argv) > 2:
+            run_reprocess(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        elif command == "export-pages":
+            export_archived_pages(*sys.argv[2:4])
+        elif command in [entry.key for entry in get_theater_entries()]:
             # 特定映画館のスクレイピング
+            from src.scraping.main import TheaterScrapingOrchestrator
             orchestrator = TheaterScrapingOrchestrator(output_dir="output")
             result = orchestrator.scrape_theater(command)
             if result:
@@ -90,6 +145,9 @@ def main():
             print("  python run_scraping.py test          # 単一映画館テスト")
             print("  python run_scraping.py all           # 全映画館スクレイピング")
             print("  python run_scraping.py list          # 利用可能映画館一覧")
+            print("  python run_scraping.py compact [--dry-run] # 結果ファイルの圧縮・整理")
+            print("  python run_scraping.py reprocess [theater_key] [ISO日時] # 保存済みページから再抽出")
+            print("  python run_scraping.py export-pages [出力先] [theater_key] # 保存済みページをHTMLで書き出し")
             print("  python run_scraping.py [theater_key] # 特定映画館スクレイピング")
     else:
         print("映画館スクレイピングシステム")
@@ -97,6 +155,9 @@ def main():
         print("  python run_scraping.py test          # 単一映画館テスト")
         print("  python run_scraping.py all           # 全映画館スクレイピング") 
         print("  python run_scraping.py list          # 利用可能映画館一覧")
+        print("  python run_scraping.py compact [--dry-run] # 結果ファイルの圧縮・整理")
+        print("  python run_scraping.py reprocess [theater_key] [ISO日時] # 保存済みページから再抽出")
+        print("  python run_scraping.py export-pages [出力先] [theater_key] # 保存済みページをHTMLで書き出し")
         print("  python run_scraping.py [theater_key] # 特定映画館スクレイピング")
 
 if __name__ == "__main__":
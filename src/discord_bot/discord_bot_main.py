@@ -2,20 +2,29 @@
 Discord Bot統合実行スクリプト
 """
 import asyncio
+import functools
 import logging
 import sys
 import datetime
+from datetime import timedelta
 from typing import Optional
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 
 from .weekly_notifier import WeeklyNotifier
+from .weekly_lineup import get_weekly_lineup
+from .send_queue import get_send_queue
 from .interactive_bot import InteractiveBot, MovieQueryParser, MovieDataSearcher, PlaywrightSearcher
 from .discord_config import load_config
+from .scheduler import (Job, JobScheduler, IntervalTrigger, WeeklyTrigger,
+                        format_weekly_time, get_timezone, stagger_phases)
 
 class CombinedMovieBot(commands.Bot):
     """週次通知＋インタラクティブ機能統合Bot"""
     
+    # 停止中に過ぎた週次レポートを起動後に送る猶予
+    REPORT_MISFIRE_GRACE_HOURS = 6
+    
     def __init__(self):
         intents = discord.Intents.default()
         intents.message_content = True
@@ -35,12 +44,82 @@ class CombinedMovieBot(commands.Bot):
         self.main_channel_id: Optional[int] = None
         self.detail_channel_id: Optional[int] = None
         
+        # スクレイピングの多重実行防止
+        self._scraping_lock = asyncio.Lock()
+        self._orchestrator = None
+        
+        # 定時・定期ジョブ（実行記録はlogs/に保存）
+        self.scheduler = JobScheduler()
+        self.refresh_cadence = None
+        
     async def setup_hook(self):
         """Bot起動時のセットアップ"""
-        # 週次タスク開始
-        self.weekly_report_task.start()
-        self.weekly_scraping_task.start()
-        self.logger.info("Weekly report and scraping tasks started")
+        # 週次スクレイピング・週次レポート・映画館ごとの定期更新を登録
+        self._setup_jobs()
+        self.scheduler.start()
+        self.logger.info("Scheduled jobs started")
+        
+    def _setup_jobs(self):
+        """ScheduleConfigからジョブを登録"""
+        config = self.schedule_config
+        tz = get_timezone(config.timezone)
+        jitter = timedelta(minutes=config.schedule_jitter_minutes)
+        
+        # レポート送信のscrape_lead_minutes分前に全館スクレイピング（開始時刻はjitterの範囲でずらす）
+        self.scheduler.add_job(Job(
+            name="weekly_scraping",
+            trigger=WeeklyTrigger.parse(config.weekly_report_time, tz,
+                                        offset=-timedelta(minutes=config.scrape_lead_minutes)),
+            func=self._perform_weekly_scraping,
+            jitter=jitter,
+            misfire_grace=timedelta(minutes=config.scrape_lead_minutes)
+        ))
+        self.scheduler.add_job(Job(
+            name="weekly_report",
+            trigger=WeeklyTrigger.parse(config.weekly_report_time, tz),
+            func=self._send_weekly_report,
+            misfire_grace=timedelta(hours=self.REPORT_MISFIRE_GRACE_HOURS)
+        ))
+        
+        # 映画館ごとの定期更新（初回を間隔内に均等にずらし、同時にアクセスしない）
+        # 2回目以降の間隔は各館の内容の変化頻度から決める
+        if config.data_update_interval > 0:
+            from ..scraping.registry import get_theater_entries
+            from ..scraping.refresh_cadence import RefreshCadence
+            interval = timedelta(hours=config.data_update_interval)
+            self.refresh_cadence = RefreshCadence(
+                default_interval=interval,
+                min_interval=timedelta(hours=config.refresh_min_hours),
+                max_interval=timedelta(hours=config.refresh_max_hours)
+            )
+            self.refresh_cadence.bootstrap()
+            keys = [entry.key for entry in get_theater_entries()]
+            for theater_key, phase in stagger_phases(keys, interval).items():
+                self.scheduler.add_job(Job(
+                    name=f"refresh:{theater_key}",
+                    trigger=IntervalTrigger(functools.partial(self.refresh_cadence.interval, theater_key), phase),
+                    func=functools.partial(self._refresh_theater, theater_key),
+                    jitter=min(jitter, interval / len(keys) / 2),
+                    misfire_grace=interval
+                ))
+                
+        # 結果ファイルの重複削除・アーカイブ化（起動直後のスクレイピングと重ならないよう1時間後から）
+        if config.snapshot_compact_hours > 0:
+            self.scheduler.add_job(Job(
+                name="compact_snapshots",
+                trigger=IntervalTrigger(timedelta(hours=config.snapshot_compact_hours), timedelta(hours=1)),
+                func=self._compact_snapshots,
+                misfire_grace=timedelta(hours=config.snapshot_compact_hours)
+            ))
+                
+    @property
+    def orchestrator(self):
+        """スクレイピング統合管理（取得したデータは週次ラインナップへ随時反映）"""
+        if self._orchestrator is None:
+            from ..scraping.main import TheaterScrapingOrchestrator
+            self._orchestrator = TheaterScrapingOrchestrator()
+            self._orchestrator.add_record_listener(get_weekly_lineup().on_record)
+        return self._orchestrator
         
     async def on_ready(self):
         """Bot準備完了"""
@@ -69,25 +148,59 @@ class CombinedMovieBot(commands.Bot):
                         self.detail_channel_id = channel.id
                         self.logger.info(f"Found detail channel: {channel.name} ({channel.id})")
                         
-    @tasks.loop(hours=1)  # 1時間毎にチェック
-    async def weekly_report_task(self):
-        """週次レポートタスク"""
-        import datetime
-        now = datetime.datetime.now()
-        
-        # 月曜日の7時台に実行（30分の余裕を持つ）
-        if now.weekday() == 0 and now.hour == 7:
-            await self._send_weekly_report()
-    
-    @tasks.loop(hours=1)  # 1時間毎にチェック
-    async def weekly_scraping_task(self):
-        """週次スクレイピングタスク（月曜日6時台に実行）"""
-        import datetime
-        now = datetime.datetime.now()
-        
-        # 月曜日の6時台にスクレイピング実行（レポート送信の1時間前）
-        if now.weekday() == 0 and now.hour == 6:
-            await self._perform_weekly_scraping()
+    async def _run_scraping(self) -> Optional[dict]:
+        """制限時間付きスクレイピング実行
+        
+        映画館1館の定期更新・結果ファイルの整理が実行中なら、終わるのを待ってから実行する
+        （週次スクレイピングを取りこぼさない。定期更新・整理の側が実行中のスクレイピングを見送る）。
+        """
+        if self._scraping_lock.locked():
+            self.logger.info("Another scraping job is running, waiting for it to finish")
+            
+        async with self._scraping_lock:
+            results = await self.orchestrator.scrape_all_theaters_async(
+                deadline_seconds=self.schedule_config.scrape_deadline_minutes * 60
+            )
+            get_weekly_lineup().update_results(results)
+            self._observe_changes(results)
+            
+            # 週次レポートを作成しておく（送信時は読み込んで投稿するだけ）
+            self.weekly_notifier.prepare_weekly_report()
+            return results
+            
+    async def _refresh_theater(self, theater_key: str):
+        """映画館1館分の定期更新（全館スクレイピング中は見送る）"""
+        if self._scraping_lock.locked():
+            self.logger.info(f"Scraping in progress, skipping refresh of {theater_key}")
+            return
+            
+        async with self._scraping_lock:
+            from ..scraping.deadline import Deadline
+            deadline = Deadline(self.schedule_config.scrape_deadline_minutes * 60)
+            result = await asyncio.to_thread(self.orchestrator.scrape_theater, theater_key, deadline)
+            
+        lineup = get_weekly_lineup()
+        lineup.update_results({theater_key: result})
+        self._observe_changes({theater_key: result})
+        self.weekly_notifier.prepare_weekly_report()
+        
+    async def _compact_snapshots(self):
+        """結果ファイルの圧縮・整理（スクレイピング中は見送る）"""
+        if self._scraping_lock.locked():
+            self.logger.info("Scraping in progress, skipping snapshot compaction")
+            return
+            
+        async with self._scraping_lock:
+            from ..scraping.snapshot_compaction import SnapshotCompactor
+            await asyncio.to_thread(SnapshotCompactor().compact)
+            
+    def _observe_changes(self, results: dict):
+        """取得結果の内容の変化を記録（映画館ごとの更新間隔に反映）"""
+        if self.refresh_cadence is None:
+            return
+        for theater_key, result in (results or {}).items():
+            self.refresh_cadence.observe(theater_key, result)
+        self.refresh_cadence.save()
             
     async def _perform_weekly_scraping(self):
         """週次スクレイピング実行"""
@@ -95,9 +208,7 @@ class CombinedMovieBot(commands.Bot):
             self.logger.info("Starting weekly scraping...")
             
             # スクレイピング実行
-            from ..scraping.main import TheaterScrapingOrchestrator
-            orchestrator = TheaterScrapingOrchestrator()
-            results = orchestrator.scrape_all_theaters()
+            results = await self._run_scraping()
             
             if results:
                 self.logger.info("Weekly scraping completed successfully")
@@ -110,6 +221,11 @@ class CombinedMovieBot(commands.Bot):
     async def _send_weekly_report(self):
         """週次レポート送信"""
         try:
+            # 起動直後（遅れた回の実行）はチャンネル取得を待つ
+            await self.wait_until_ready()
+            if not self.main_channel_id:
+                await self._find_channels()
+            
             self.logger.info("Sending weekly report...")
             
             if not self.main_channel_id:
@@ -122,7 +238,7 @@ class CombinedMovieBot(commands.Bot):
                 return
                 
             # WeeklyNotifierのメソッドを使用
-            await self.weekly_notifier.send_weekly_report()
+            await self.weekly_notifier.send_weekly_report(channel)
             
         except Exception as e:
             self.logger.error(f"Error sending weekly report: {e}")
@@ -224,7 +340,7 @@ class CombinedMovieBot(commands.Bot):
         
         embed.add_field(
             name="📅 週次通知",
-            value="毎週月曜日 7:30 に今週・来週の上映映画をお知らせ",
+            value=f"毎週{format_weekly_time(self.schedule_config.weekly_report_time)} に今週・来週の上映映画をお知らせ（`!preview` で内容を確認）",
             inline=False
         )
         
@@ -238,12 +354,12 @@ class CombinedMovieBot(commands.Bot):
             inline=False
         )
         
+        # 登録済み映画館（3館ごとに改行）
+        from ..scraping.registry import get_theater_entries
+        names = [entry.name for entry in get_theater_entries()]
         embed.add_field(
             name="🎭 対応映画館",
-            value=(
-                "ケイズシネマ、ポレポレ東中野、ユーロスペース\n"
-                "下高井戸シネマ、早稲田松竹、新宿武蔵野館"
-            ),
+            value="\n".join("、".join(names[i:i + 3]) for i in range(0, len(names), 3)) or "なし",
             inline=False
         )
         
@@ -261,7 +377,9 @@ class CombinedMovieBot(commands.Bot):
         )
         
         embed.add_field(name="🤖 Bot", value="✅ 稼働中", inline=True)
-        embed.add_field(name="📅 週次通知", value="✅ アクティブ", inline=True)
+        report_job = self.scheduler.jobs.get("weekly_report")
+        report_status = f"✅ 次回 {report_job.next_run.strftime('%m/%d %H:%M')}" if report_job else "⏸️ 停止中"
+        embed.add_field(name="📅 週次通知", value=report_status, inline=True)
         embed.add_field(name="💬 質問対応", value="✅ アクティブ", inline=True)
         
         if self.main_channel_id:
@@ -269,20 +387,44 @@ class CombinedMovieBot(commands.Bot):
         if self.detail_channel_id:
             embed.add_field(name="❓ 質問チャンネル", value=f"<#{self.detail_channel_id}>", inline=True)
             
-        embed.add_field(name="🎬 対応映画館", value="6館", inline=True)
+        from ..scraping.registry import get_theater_entries
+        embed.add_field(name="🎬 対応映画館", value=f"{len(get_theater_entries())}館", inline=True)
+        
+        # ブラウザプロセスの監視状況
+        from ..scraping.browser_supervisor import get_browser_supervisor
+        browser_stats = get_browser_supervisor().stats()
+        embed.add_field(
+            name="🌐 ブラウザ",
+            value=f"{browser_stats['live_browsers']}個稼働 / {browser_stats['rss_bytes'] // (1024 * 1024)}MB",
+            inline=True
+        )
         
         await ctx.send(embed=embed)
         
+    @commands.command(name='preview', aliases=['p'])
+    async def preview_command(self, ctx):
+        """週次レポートのプレビューコマンド（作成済みのレポートをこのチャンネルに表示）"""
+        report = self.weekly_notifier.load_weekly_report()
+        if report is None:
+            await ctx.send("📭 週次レポートを作成できるデータがありません。`!update` でデータを更新してください。")
+            return
+            
+        send_queue = get_send_queue()
+        for embeds in report.embeds():
+            await send_queue.send(ctx.channel, embeds=embeds)
+            
     @commands.command(name='update', aliases=['u'])
     async def manual_update_command(self, ctx):
         """手動データ更新コマンド"""
+        if self._scraping_lock.locked():
+            await ctx.send("⏳ データ更新は既に実行中です。")
+            return
+            
         await ctx.send("📡 データを更新中...")
         
         try:
             # データ更新実行
-            from ..scraping.main import TheaterScrapingOrchestrator
-            orchestrator = TheaterScrapingOrchestrator()
-            results = orchestrator.scrape_all_theaters()
+            results = await self._run_scraping() or {}
             
             success_count = sum(1 for result in results.values() if result)
             total_count = len(results)
@@ -18,7 +18,13 @@ class DiscordConfig:
 class ScheduleConfig:
     """スケジュール設定"""
     weekly_report_time: str = "MON 07:30"  # 毎週月曜日 7:30
-    data_update_interval: int = 6  # 6時間毎にデータ更新
+    data_update_interval: int = 6  # 6時間毎にデータ更新（映画館ごとに間隔内でずらす、0で無効）
+    refresh_min_hours: int = 2  # 更新頻度から決める映画館ごとの更新間隔の下限
+    refresh_max_hours: int = 48  # 同・上限
+    scrape_deadline_minutes: int = 30  # スクレイピング1回あたりの制限時間
+    scrape_lead_minutes: int = 60  # 週次レポートの何分前に全館スクレイピングするか
+    schedule_jitter_minutes: int = 10  # スクレイピング開始時刻のランダムなずらし幅
+    snapshot_compact_hours: int = 24  # 結果ファイルの圧縮・整理の間隔（0で無効）
     timezone: str = "Asia/Tokyo"
     
 @dataclass
@@ -42,6 +48,12 @@ def load_config() -> tuple[DiscordConfig, ScheduleConfig, BotConfig]:
     schedule_config = ScheduleConfig(
         weekly_report_time=os.getenv("WEEKLY_REPORT_TIME", "MON 07:30"),
         data_update_interval=int(os.getenv("DATA_UPDATE_INTERVAL", "6")),
+        refresh_min_hours=int(os.getenv("REFRESH_MIN_HOURS", "2")),
+        refresh_max_hours=int(os.getenv("REFRESH_MAX_HOURS", "48")),
+        scrape_deadline_minutes=int(os.getenv("SCRAPE_DEADLINE_MINUTES", "30")),
+        scrape_lead_minutes=int(os.getenv("SCRAPE_LEAD_MINUTES", "60")),
+        schedule_jitter_minutes=int(os.getenv("SCHEDULE_JITTER_MINUTES", "10")),
+        snapshot_compact_hours=int(os.getenv("SNAPSHOT_COMPACT_HOURS", "24")),
         timezone=os.getenv("TIMEZONE", "Asia/Tokyo")
     )
     
@@ -3,8 +3,9 @@ Discord Bot用データモデル
 """
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from ..scraping.models import MovieInfo, TheaterInfo, ShowtimeInfo
+from ..scraping.date_normalizer import minutes_to_time
 
 @dataclass
 class WeeklyMovieSchedule:
@@ -60,60 +61,67 @@ class BotResponse:
     embed_data: Optional[Dict[str, Any]] = None
     has_external_search: bool = False
     
+def build_weekly_movie_info(movie: MovieInfo, theaters: List[str],
+                            showtimes: List[ShowtimeInfo]) -> WeeklyMovieInfo:
+    """作品1件分の週次情報を作成（showtimesは対象期間内の上映回）"""
+    return WeeklyMovieInfo(
+        movie=movie,
+        theaters=theaters,
+        schedule_period=_format_schedule_period(showtimes),
+        showtimes_summary=_format_showtimes_summary(showtimes)
+    )
+
 def create_weekly_schedule_from_data(theater_data_list: List[Any], 
                                    current_week_start: date,
                                    next_week_start: date) -> WeeklyMovieSchedule:
-    """スクレイピングデータから週次スケジュールを作成"""
-    movies_dict = {}  # movie_title -> WeeklyMovieInfo
+    """スクレイピングデータから週次スケジュールを作成
+    
+    状態を持たずに1回だけ集計する場合に使う。継続的に更新する場合は
+    weekly_lineup.WeeklyLineupAggregate を使う。
+    """
+    window_end = next_week_start + timedelta(days=7)
+    movies_dict = {}  # movie_title -> (映画情報, 上映館, 期間内の上映回)
     
     for theater_data in theater_data_list:
         theater_name = theater_data.theater_info.name
         
+        # 作品名 -> 映画情報（同名が複数あれば最初のもの）
+        movies_by_title = {}
+        for movie in theater_data.movies:
+            movies_by_title.setdefault(movie.title, movie)
+        
         for schedule in theater_data.schedules:
             movie_title = schedule.movie_title
             
             # 今週・来週の上映があるかチェック
-            current_week_showtimes = []
-            for showtime in schedule.showtimes:
-                showtime_date = datetime.strptime(showtime.date, "%Y-%m-%d").date()
-                if current_week_start <= showtime_date < next_week_start + datetime.timedelta(days=7):
-                    current_week_showtimes.append(showtime)
-                    
-            if not current_week_showtimes:
+            window_showtimes = [
+                showtime for showtime in schedule.showtimes
+                if showtime.date_value and current_week_start <= showtime.date_value < window_end
+            ]
+            if not window_showtimes:
                 continue
                 
-            # 対応する映画情報を取得
-            movie_info = None
-            for movie in theater_data.movies:
-                if movie.title == movie_title:
-                    movie_info = movie
-                    break
-                    
-            if not movie_info:
+            if movie_title not in movies_dict:
                 # 映画情報がない場合は基本情報のみ作成
-                movie_info = MovieInfo(title=movie_title)
+                movie_info = movies_by_title.get(movie_title) or MovieInfo(title=movie_title)
+                movies_dict[movie_title] = (movie_info, [], [])
                 
-            # WeeklyMovieInfoに追加
-            if movie_title not in movies_dict:
-                movies_dict[movie_title] = WeeklyMovieInfo(
-                    movie=movie_info,
-                    theaters=[theater_name],
-                    schedule_period=_format_schedule_period(current_week_showtimes),
-                    showtimes_summary=_format_showtimes_summary(current_week_showtimes)
-                )
-            else:
-                # 既存の映画に映画館を追加
-                if theater_name not in movies_dict[movie_title].theaters:
-                    movies_dict[movie_title].theaters.append(theater_name)
+            movie_info, theaters, showtimes = movies_dict[movie_title]
+            if theater_name not in theaters:
+                theaters.append(theater_name)
+            showtimes.extend(window_showtimes)
                     
-    movies_list = list(movies_dict.values())
+    movies_list = [
+        build_weekly_movie_info(movie_info, theaters, showtimes)
+        for movie_info, theaters, showtimes in movies_dict.values()
+    ]
     theaters_set = set()
     for movie_info in movies_list:
         theaters_set.update(movie_info.theaters)
         
     return WeeklyMovieSchedule(
         week_start=current_week_start,
-        week_end=next_week_start + datetime.timedelta(days=6),
+        week_end=next_week_start + timedelta(days=6),
         movies=movies_list,
         total_movies=len(movies_list),
         total_theaters=len(theaters_set)
@@ -124,7 +132,9 @@ def _format_schedule_period(showtimes: List[ShowtimeInfo]) -> str:
     if not showtimes:
         return ""
         
-    dates = [datetime.strptime(st.date, "%Y-%m-%d").date() for st in showtimes]
+    dates = [st.date_value for st in showtimes if st.date_value]
+    if not dates:
+        return ""
     min_date = min(dates)
     max_date = max(dates)
     
@@ -143,19 +153,21 @@ def _format_showtimes_summary(showtimes: List[ShowtimeInfo]) -> str:
     weekend_times = set()
     
     for showtime in showtimes:
-        showtime_date = datetime.strptime(showtime.date, "%Y-%m-%d").date()
-        times = showtime.times
+        showtime_date = showtime.date_value
+        if not showtime_date:
+            continue
         
         if showtime_date.weekday() >= 5:  # 土日
-            weekend_times.update(times)
+            weekend_times.update(showtime.minutes)
         else:  # 平日
-            weekday_times.update(times)
+            weekday_times.update(showtime.minutes)
             
+    # 時刻順（"9:30" が "10:00" より前）
     summary_parts = []
     if weekday_times:
-        summary_parts.append(f"平日: {', '.join(sorted(weekday_times))}")
+        summary_parts.append(f"平日: {', '.join(minutes_to_time(m) for m in sorted(weekday_times))}")
     if weekend_times:
-        summary_parts.append(f"土日: {', '.join(sorted(weekend_times))}")
+        summary_parts.append(f"土日: {', '.join(minutes_to_time(m) for m in sorted(weekend_times))}")
         
     return " / ".join(summary_parts)
 
@@ -12,7 +12,6 @@ from discord.ext import commands
 
 from .discord_models import BotQuery, BotResponse, MovieSearchResult, ExternalMovieInfo
 from .discord_config import load_config
-from ..scraping.main import TheaterScrapingOrchestrator
 from .weekly_notifier import WeeklyNotifier
 
 class MovieQueryParser:
@@ -70,14 +69,24 @@ class MovieDataSearcher:
     """映画データ検索器"""
     
     def __init__(self):
-        self.orchestrator = TheaterScrapingOrchestrator()
+        self._orchestrator = None
         self.logger = logging.getLogger(__name__)
         
+    @property
+    def orchestrator(self):
+        """スクレイピング統合管理（スクレイパー群の読み込みを初回使用時まで遅らせる）"""
+        if self._orchestrator is None:
+            from ..scraping.main import TheaterScrapingOrchestrator
+            self._orchestrator = TheaterScrapingOrchestrator()
+        return self._orchestrator
+        
     async def search_movie_info(self, movie_title: str) -> Optional[MovieSearchResult]:
         """映画情報検索"""
         try:
-            # 最新データ取得
-            all_results = self.orchestrator.scrape_all_theaters()
+            # 最新データ取得（結果は目録から映画館ごとの最新を読む）
+            from ..scraping.snapshot_catalog import get_snapshot_catalog
+            await self.orchestrator.scrape_all_theaters_async()
+            all_results = get_snapshot_catalog().latest_results()
             
             for theater_key, result in all_results.items():
                 if not result:
@@ -126,51 +135,29 @@ class MovieDataSearcher:
             return []
     
     async def _search_from_existing_data(self, theater_name: str) -> List[MovieSearchResult]:
-        """既存データファイルから検索"""
+        """集計済みの週次ラインナップから検索"""
         try:
-            import json
-            import glob
-            import os
-            
-            # 最新のall_theaters_*.jsonファイルを取得
-            output_dir = "output"
-            if not os.path.exists(output_dir):
-                return []
-                
-            json_files = glob.glob(os.path.join(output_dir, "all_theaters_*.json"))
-            if not json_files:
-                return []
-                
-            latest_file = max(json_files, key=os.path.getctime)
-            self.logger.info(f"Using existing data from: {latest_file}")
+            from .weekly_lineup import get_weekly_lineup
             
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                all_results = json.load(f)
+            lineup = get_weekly_lineup()
+            lineup.sync_catalog()
             
             results = []
             
-            for theater_key, result in all_results.items():
-                if not result:
+            for theater_key, stored_name in lineup.theater_names().items():
+                if not self._is_theater_match(stored_name, theater_name):
                     continue
                     
-                theater_info = result.get("theater_info", {})
-                if self._is_theater_match(theater_info.get("name", ""), theater_name):
-                    # この映画館のスケジュール取得
-                    for schedule_dict in result.get("schedules", []):
-                        movie_title = schedule_dict.get("movie_title", "")
-                        
-                        # 対応する映画情報を取得
-                        movie_info = self._find_movie_info(movie_title, result.get("movies", []))
+                # この映画館のスケジュール（映画情報があるもののみ）
+                for movie_title, movie_info, showtimes in lineup.theater_lineup(theater_key):
+                    movie_info = movie_info or lineup.movie(movie_title)
+                    if movie_info:
+                        results.append(MovieSearchResult(
+                            movie=movie_info,
+                            theaters=[stored_name],
+                            current_showtimes=showtimes
+                        ))
                         
-                        if movie_info:
-                            showtimes = self._dict_to_showtimes(schedule_dict.get("showtimes", []))
-                            
-                            results.append(MovieSearchResult(
-                                movie=movie_info,
-                                theaters=[theater_info.get("name", "")],
-                                current_showtimes=showtimes
-                            ))
-                            
             return results
             
         except Exception as e:
@@ -211,22 +198,12 @@ class MovieDataSearcher:
     async def _search_director_from_existing_data(self, director_name: str) -> List[MovieSearchResult]:
         """既存データから監督検索"""
         try:
-            import json
-            import glob
-            import os
+            from ..scraping.snapshot_catalog import get_snapshot_catalog
             
-            output_dir = "output"
-            if not os.path.exists(output_dir):
-                return []
-                
-            json_files = glob.glob(os.path.join(output_dir, "all_theaters_*.json"))
-            if not json_files:
+            # 映画館ごとの最新の結果（目録から引く）
+            all_results = get_snapshot_catalog().latest_results()
+            if not all_results:
                 return []
-                
-            latest_file = max(json_files, key=os.path.getctime)
-            
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                all_results = json.load(f)
             
             results = []
             
@@ -294,13 +271,6 @@ class MovieDataSearcher:
                     
         return theaters, all_showtimes
         
-    def _find_movie_info(self, movie_title: str, movies_list: List[dict]):
-        """映画リストから映画情報を検索"""
-        for movie_dict in movies_list:
-            if self._is_title_match(movie_dict.get("title", ""), movie_title):
-                return self._dict_to_movie_info(movie_dict)
-        return None
-        
     def _dict_to_movie_info(self, movie_dict: dict):
         """辞書を MovieInfo オブジェクトに変換"""
         from ..scraping.models import MovieInfo
@@ -317,17 +287,9 @@ class MovieDataSearcher:
         )
         
     def _dict_to_showtimes(self, showtimes_list: List[dict]):
-        """辞書リストを ShowtimeInfo オブジェクトリストに変換"""
-        from ..scraping.models import ShowtimeInfo
-        return [
-            ShowtimeInfo(
-                date=st.get("date", ""),
-                times=st.get("times", []),
-                screen=st.get("screen"),
-                ticket_url=st.get("ticket_url")
-            )
-            for st in showtimes_list
-        ]
+        """辞書リストを ShowtimeInfo オブジェクトリストに変換（期間形式の上映回は日付ごとに展開）"""
+        from ..scraping.showtime_codec import decode_showtimes
+        return list(decode_showtimes(showtimes_list))
 
 class PlaywrightSearcher:
     """Playwright外部検索器"""
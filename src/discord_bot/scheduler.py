@@ -0,0 +1,257 @@
+"""
+定時・定期ジョブのスケジューラ（実行記録をlogs/に永続化）
+
+ジョブごとに次回実行時刻を計算して、その時刻まで待つ。最終実行時刻を保存するため、
+再起動しても同じ回を二重に実行せず、停止中に過ぎた回は猶予時間内なら起動後に1回だけ実行する。
+"""
+import asyncio
+import json
+import logging
+import random
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime, time as dt_time, timedelta, tzinfo
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+WEEKDAY_CODES = ["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"]
+WEEKDAY_NAMES_JP = "月火水木金土日"
+
+_WEEKLY_TIME_PATTERN = re.compile(r"^\s*([A-Za-z]{3})[A-Za-z]*\s+(\d{1,2}):(\d{2})\s*$")
+
+# 待機の最大秒数（時計の補正やスリープ復帰があっても大きくずれないように）
+MAX_SLEEP_SECONDS = 300
+
+
+def parse_weekly_time(text: str) -> Tuple[int, dt_time]:
+    """"MON 07:30" 形式を（曜日番号, 時刻）に変換（月曜=0）"""
+    match = _WEEKLY_TIME_PATTERN.match(text or "")
+    if not match or match.group(1).upper() not in WEEKDAY_CODES:
+        raise ValueError(f"Invalid weekly time: {text!r} (expected e.g. 'MON 07:30')")
+    hour, minute = int(match.group(2)), int(match.group(3))
+    return WEEKDAY_CODES.index(match.group(1).upper()), dt_time(hour, minute)
+
+
+def format_weekly_time(text: str) -> str:
+    """"MON 07:30" を「月曜日 7:30」の表記にする"""
+    weekday, at = parse_weekly_time(text)
+    return f"{WEEKDAY_NAMES_JP[weekday]}曜日 {at.hour}:{at.minute:02d}"
+
+
+class WeeklyTrigger:
+    """毎週決まった曜日・時刻"""
+
+    def __init__(self, weekday: int, at: dt_time, tz: tzinfo, offset: timedelta = timedelta(0)):
+        self.weekday = weekday
+        self.at = at
+        self.tz = tz
+        self.offset = offset  # 基準時刻からのずれ（レポートの1時間前など）
+
+    @classmethod
+    def parse(cls, text: str, tz: tzinfo, offset: timedelta = timedelta(0)) -> "WeeklyTrigger":
+        weekday, at = parse_weekly_time(text)
+        return cls(weekday, at, tz, offset)
+
+    def next_after(self, after: datetime, last_run: Optional[datetime] = None) -> datetime:
+        """after より後の直近の実行時刻"""
+        local = (after - self.offset).astimezone(self.tz)
+        day = local.date() + timedelta(days=(self.weekday - local.weekday()) % 7)
+        candidate = datetime.combine(day, self.at, tzinfo=self.tz) + self.offset
+        if candidate <= after:
+            candidate = datetime.combine(day + timedelta(days=7), self.at, tzinfo=self.tz) + self.offset
+        return candidate
+
+
+class IntervalTrigger:
+    """一定間隔（初回はphase後）
+
+    intervalに関数を渡すと、次回を決めるたびに呼んで間隔を求める（映画館ごとの更新頻度など）。
+    """
+
+    def __init__(self, interval: Union[timedelta, Callable[[], timedelta]], phase: timedelta = timedelta(0)):
+        self.interval = interval
+        self.phase = phase
+
+    def current_interval(self) -> timedelta:
+        return self.interval() if callable(self.interval) else self.interval
+
+    def next_after(self, after: datetime, last_run: Optional[datetime] = None) -> datetime:
+        if last_run is None:
+            return after + self.phase
+        candidate = last_run + self.current_interval()
+        # 停止中などで過ぎていた場合は、初回と同じだけずらして再開する
+        return candidate if candidate > after else after + self.phase
+
+
+@dataclass
+class Job:
+    """スケジュール対象の処理
+
+    jitter: 予定時刻に加える0〜jitterのランダムな遅れ
+    misfire_grace: 停止中などで予定時刻を過ぎた回を、遅れて実行してよい時間
+    """
+    name: str
+    trigger: Any
+    func: Callable[[], Awaitable[Any]]
+    jitter: timedelta = timedelta(0)
+    misfire_grace: timedelta = timedelta(hours=1)
+    next_run: Optional[datetime] = None  # 次回実行時刻（ゆらぎ込み）
+    scheduled: Optional[datetime] = None  # 次回の予定時刻（ゆらぎなし）
+    last_run: Optional[datetime] = None  # 前回の予定時刻（ゆらぎなし、次回の計算の基準）
+    running: bool = False
+
+
+class JobScheduler:
+    """asyncioで動くジョブスケジューラ"""
+
+    def __init__(self, state_path: Optional[str] = "logs/scheduler_state.json"):
+        self.state_path = Path(state_path) if state_path else None
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.jobs: Dict[str, Job] = {}
+        self._saved: Dict[str, Dict[str, str]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """保存済みの実行記録を読み込み"""
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self._saved = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Failed to load scheduler state: {e}")
+
+    def save(self):
+        """実行記録を保存"""
+        if not self.state_path:
+            return
+        data = dict(self._saved)
+        for name, job in self.jobs.items():
+            data[name] = {
+                key: value.isoformat() if value else None
+                for key, value in (("last_run", job.last_run), ("scheduled", job.scheduled), ("next_run", job.next_run))
+            }
+        try:
+            with self._lock:
+                self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.state_path.with_suffix(".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                tmp_path.replace(self.state_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to save scheduler state: {e}")
+
+    @staticmethod
+    def _parse_saved(value: Optional[str]) -> Optional[datetime]:
+        try:
+            return datetime.fromisoformat(value) if value else None
+        except ValueError:
+            return None
+
+    def add_job(self, job: Job, now: Optional[datetime] = None):
+        """ジョブを登録（保存済みの実行記録があれば引き継ぐ）"""
+        now = now or datetime.now().astimezone()
+        saved = self._saved.get(job.name, {})
+        job.last_run = self._parse_saved(saved.get("last_run"))
+        job.next_run = self._parse_saved(saved.get("next_run"))
+        job.scheduled = self._parse_saved(saved.get("scheduled")) or job.next_run
+
+        if job.next_run is not None and job.next_run <= now:
+            if now - job.next_run <= job.misfire_grace:
+                self.logger.info(f"Job {job.name} missed its run at {job.next_run}, running now")
+                job.next_run = now
+            else:
+                self.logger.warning(f"Job {job.name} missed its run at {job.next_run}, skipping to next")
+                job.next_run = None
+        if job.next_run is None:
+            self._schedule_next(job, now)
+
+        self.jobs[job.name] = job
+        self.logger.info(f"Scheduled {job.name} at {job.next_run.isoformat()}")
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _schedule_next(self, job: Job, after: datetime):
+        """次回の予定時刻を決める（ゆらぎは実行時刻にだけ加え、次の回の基準には含めない）"""
+        job.scheduled = job.trigger.next_after(after, job.last_run)
+        job.next_run = job.scheduled
+        if job.jitter:
+            job.next_run += timedelta(seconds=random.uniform(0, job.jitter.total_seconds()))
+
+    def start(self):
+        """スケジューラを開始（イベントループ内で呼ぶ）"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run_loop())
+        self.save()
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run_loop(self):
+        while True:
+            now = datetime.now().astimezone()
+            for job in self.jobs.values():
+                if not job.running and job.next_run <= now:
+                    self._dispatch(job, now)
+
+            pending = [job.next_run for job in self.jobs.values() if not job.running]
+            delay = min([(run - now).total_seconds() for run in pending] + [MAX_SLEEP_SECONDS])
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(delay, 0.0))
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch(self, job: Job, now: datetime):
+        """ジョブを実行し、完了後に次回を予約する（同じジョブは重ねて実行しない）"""
+        job.running = True
+        # 予定時刻を実行済みとして記録してから実行する（実行中の再起動で二重に実行しない）
+        job.last_run = job.scheduled or job.next_run
+        self._schedule_next(job, max(now, job.last_run))
+        self.save()
+
+        async def run():
+            self.logger.info(f"Running job {job.name}")
+            try:
+                await job.func()
+            except Exception as e:
+                self.logger.error(f"Job {job.name} failed: {e}")
+            finally:
+                job.running = False
+                self.logger.info(f"Next run of {job.name} at {job.next_run.isoformat()}")
+                if self._wakeup is not None:
+                    self._wakeup.set()
+
+        asyncio.create_task(run())
+
+    def status(self) -> List[Dict[str, Any]]:
+        """ジョブごとの前回・次回実行時刻"""
+        return [
+            {"name": job.name, "last_run": job.last_run, "next_run": job.next_run, "running": job.running}
+            for job in sorted(self.jobs.values(), key=lambda job: job.next_run)
+        ]
+
+
+def stagger_phases(keys: List[str], interval: timedelta) -> Dict[str, timedelta]:
+    """映画館ごとの初回実行を間隔内に均等にずらす"""
+    if not keys:
+        return {}
+    step = interval / len(keys)
+    return {key: step * index for index, key in enumerate(keys)}
+
+
+def get_timezone(name: str) -> tzinfo:
+    """タイムゾーン名から取得（不明ならローカル時間）"""
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        logging.getLogger(__name__).warning(f"Unknown timezone {name!r}, using local time")
+        return datetime.now().astimezone().tzinfo
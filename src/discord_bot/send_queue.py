@@ -0,0 +1,118 @@
+"""
+チャンネル別のレート制御付きメッセージ送信キュー
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import discord
+
+from ..scraping.rate_limiter import RateLimit, TokenBucket
+
+
+class MessageSendQueue:
+    """Discordへのメッセージ送信をチャンネルごとに順番に処理する
+
+    チャンネルごとにキューと送信タスクを1つ持ち、トークンバケットで送信間隔を空ける
+    （Discordのチャンネル単位の制限は5件/5秒）。429はサーバーが示す秒数だけ待ち、
+    5xxなどの一時的な失敗は間隔を倍々にして再送する。それ以外の4xxは再送しない。
+    """
+
+    def __init__(self, limit: Optional[RateLimit] = None, attempts: int = 3,
+                 retry_base_seconds: float = 5.0):
+        self.limit = limit or RateLimit(rate=1.0, burst=5)
+        self.attempts = attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._buckets: Dict[int, TokenBucket] = {}
+        self._queues: Dict[int, asyncio.Queue] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+
+    async def send(self, channel: discord.abc.Messageable, **kwargs) -> discord.Message:
+        """送信を予約し、送信完了まで待つ（引数は channel.send と同じ）"""
+        key = getattr(channel, "id", id(channel))
+        future = asyncio.get_running_loop().create_future()
+        if key not in self._queues:
+            self._queues[key] = asyncio.Queue()
+            self._buckets[key] = TokenBucket(self.limit)
+        self._queues[key].put_nowait((channel, kwargs, future))
+
+        worker = self._workers.get(key)
+        if worker is None or worker.done():
+            self._workers[key] = asyncio.create_task(self._drain(key))
+        return await future
+
+    async def _drain(self, key: int):
+        """チャンネルのキューを空になるまで順に送信"""
+        queue, bucket = self._queues[key], self._buckets[key]
+        while not queue.empty():
+            channel, kwargs, future = queue.get_nowait()
+            try:
+                message = await self._send_with_retry(bucket, channel, kwargs)
+                if not future.done():
+                    future.set_result(message)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                queue.task_done()
+
+    async def _send_with_retry(self, bucket: TokenBucket, channel: discord.abc.Messageable,
+                               kwargs: Dict[str, Any]) -> discord.Message:
+        for attempt in range(1, self.attempts + 1):
+            await bucket.acquire_async()
+            try:
+                return await channel.send(**kwargs)
+            except (discord.HTTPException, discord.RateLimited, asyncio.TimeoutError) as e:
+                retryable, wait = self._retry_after(e, attempt)
+                if not retryable or attempt == self.attempts:
+                    raise
+                self.logger.warning(f"Failed to send message (attempt {attempt}), retrying in {wait:.1f}s: {e}")
+                await asyncio.sleep(wait)
+
+    def _retry_after(self, error: Exception, attempt: int) -> Tuple[bool, float]:
+        """再送するか、何秒待つか"""
+        backoff = self.retry_base_seconds * 2 ** (attempt - 1)
+        if isinstance(error, discord.RateLimited):
+            return True, error.retry_after
+        status = getattr(error, "status", None)
+        if status == 429:
+            response = getattr(error, "response", None)
+            retry_after = response.headers.get("Retry-After") if response is not None else None
+            try:
+                return True, float(retry_after)
+            except (TypeError, ValueError):
+                return True, backoff
+        if status and 400 <= status < 500:
+            return False, 0.0
+        return True, backoff
+
+
+def load_send_queue() -> MessageSendQueue:
+    """送信キュー設定を環境変数から読み込み
+
+    DISCORD_SEND_RATE / DISCORD_SEND_BURST: チャンネルごとの送信レート（件/秒）・連続送信数
+    DISCORD_SEND_ATTEMPTS: 1メッセージあたりの送信試行回数
+    """
+    return MessageSendQueue(
+        limit=RateLimit(
+            rate=float(os.getenv("DISCORD_SEND_RATE", "1.0")),
+            burst=int(os.getenv("DISCORD_SEND_BURST", "5"))
+        ),
+        attempts=int(os.getenv("DISCORD_SEND_ATTEMPTS", "3"))
+    )
+
+
+_queue: Optional[MessageSendQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_send_queue() -> MessageSendQueue:
+    """プロセス共有の送信キューを取得"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = load_send_queue()
+        return _queue
@@ -0,0 +1,348 @@
+"""
+週次上映ラインナップの集計（映画館の結果が届くたびに差分更新し、logs/に永続化）
+
+映画館ごとの作品・上映回と、作品名→上映館の索引を保持する。週ごとの作品情報
+（WeeklyMovieInfo）は一度作ったら、更新のあった作品の分だけ作り直すため、
+週次レポートや「今週の上映予定」は集計済みの状態を読むだけで済む。
+"""
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..scraping.models import MovieInfo, ShowtimeInfo
+from ..scraping.showtime_codec import decode_showtimes
+from .discord_models import WeeklyMovieInfo, WeeklyMovieSchedule, build_weekly_movie_info
+
+# レポートの対象期間（今週・来週）
+LINEUP_WEEKS = 2
+
+# 作成済みの週次ラインナップを保持する週数
+MAX_CACHED_WEEKS = 4
+
+
+def monday_of(day: date) -> date:
+    """指定日の週の月曜日"""
+    return day - timedelta(days=day.weekday())
+
+
+def _movie_from_dict(movie_dict: Dict[str, Any]) -> MovieInfo:
+    return MovieInfo(
+        title=movie_dict.get("title", ""),
+        title_en=movie_dict.get("title_en"),
+        director=movie_dict.get("director"),
+        cast=movie_dict.get("cast", []),
+        genre=movie_dict.get("genre"),
+        duration=movie_dict.get("duration"),
+        rating=movie_dict.get("rating"),
+        synopsis=movie_dict.get("synopsis"),
+        poster_url=movie_dict.get("poster_url")
+    )
+
+
+class _TheaterLineup:
+    """1館分の作品・上映回（作品名で引ける形）"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.scraped_at: Optional[str] = None
+        self.movie_dicts: Dict[str, Dict[str, Any]] = {}
+        self.schedule_dicts: Dict[str, Dict[str, Any]] = {}
+        self.movies: Dict[str, MovieInfo] = {}
+        # 作品名 -> 日付順の上映回と、その日付（期間の切り出しを二分探索で行う）
+        self._showtimes: Dict[str, List[ShowtimeInfo]] = {}
+        self._days: Dict[str, List[date]] = {}
+
+    def set_movie(self, movie_dict: Dict[str, Any]) -> str:
+        title = (movie_dict.get("title") or "").strip()
+        if title:
+            self.movie_dicts[title] = movie_dict
+            self.movies[title] = _movie_from_dict(movie_dict)
+        return title
+
+    def set_schedule(self, schedule_dict: Dict[str, Any]) -> str:
+        title = (schedule_dict.get("movie_title") or "").strip()
+        if not title:
+            return title
+        showtimes = sorted(
+            (showtime for showtime in decode_showtimes(schedule_dict.get("showtimes", []))
+             if showtime.date_value),
+            key=lambda showtime: showtime.date_value
+        )
+        self.schedule_dicts[title] = schedule_dict
+        self._showtimes[title] = showtimes
+        self._days[title] = [showtime.date_value for showtime in showtimes]
+        return title
+
+    def titles(self) -> List[str]:
+        """上映予定または作品情報のある作品名（上映予定の順）"""
+        return list(dict.fromkeys([*self.schedule_dicts, *self.movie_dicts]))
+
+    def showtimes(self, title: str) -> List[ShowtimeInfo]:
+        return self._showtimes.get(title, [])
+
+    def window(self, title: str, start: date, end: date) -> List[ShowtimeInfo]:
+        """start以上end未満の日付の上映回"""
+        days = self._days.get(title)
+        if not days:
+            return []
+        return self._showtimes[title][bisect_left(days, start):bisect_left(days, end)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """スクレイピング結果と同じ形の辞書"""
+        return {
+            "theater_info": {"name": self.name},
+            "movies": list(self.movie_dicts.values()),
+            "schedules": list(self.schedule_dicts.values()),
+            "scraped_at": self.scraped_at
+        }
+
+
+class WeeklyLineupAggregate:
+    """映画館横断の週次ラインナップ
+
+    映画館ごとの結果（update_theater）または保存が確定した映画館のレコード
+    （on_record、TheaterScrapingOrchestrator.add_record_listener に登録する）で更新する。
+    """
+
+    def __init__(self, state_path: Optional[str] = "logs/weekly_lineup.json"):
+        self.state_path = Path(state_path) if state_path else None
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.updated_at = 0.0
+        self._theaters: Dict[str, _TheaterLineup] = {}
+        # 作品名 -> 上映・紹介している映画館キー（登録順）
+        self._index: Dict[str, Dict[str, None]] = {}
+        # 週の月曜日 -> 作品名 -> 週次情報（対象期間に上映のある作品のみ）
+        self._weeks: Dict[date, Dict[str, WeeklyMovieInfo]] = {}
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """保存済みの集計を読み込み"""
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for theater_key, result in data.get("theaters", {}).items():
+                self._apply(theater_key, result, replace=True)
+            self.updated_at = data.get("updated_at", 0.0)
+        except Exception as e:
+            self.logger.warning(f"Failed to load weekly lineup: {e}")
+
+    def save(self):
+        """集計を保存"""
+        if not self.state_path:
+            return
+        with self._lock:
+            data = {
+                "updated_at": self.updated_at,
+                "theaters": {key: lineup.to_dict() for key, lineup in self._theaters.items()}
+            }
+        try:
+            with self._save_lock:
+                self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.state_path.with_suffix(".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                tmp_path.replace(self.state_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to save weekly lineup: {e}")
+
+    # ---- 更新 ----
+
+    def on_record(self, theater_key: str, kind: str, record: Dict[str, Any]):
+        """保存が確定した映画・スケジュール1件を反映（作品単位で上書き）"""
+        with self._lock:
+            lineup = self._theaters.get(theater_key)
+            if lineup is None:
+                lineup = self._theaters[theater_key] = _TheaterLineup(record.get("theater_name") or theater_key)
+            if kind == "movies":
+                title = lineup.set_movie(record)
+            else:
+                title = lineup.set_schedule(record)
+                if record.get("theater_name"):
+                    lineup.name = record["theater_name"]
+            if not title:
+                return
+            self._index.setdefault(title, {})[theater_key] = None
+            self._refresh([title])
+            self.updated_at = time.time()
+
+    def update_theater(self, theater_key: str, result: Dict[str, Any]):
+        """映画館1館分の結果を反映
+
+        完了した結果はその映画館の内容を置き換え、期限で打ち切られた結果
+        （status="partial"）は取得できた作品だけを上書きする。
+        """
+        if not result:
+            return
+        with self._lock:
+            self._apply(theater_key, result, replace=result.get("status") != "partial")
+            self.updated_at = time.time()
+
+    def update_results(self, results: Dict[str, Dict[str, Any]]):
+        """全映画館の結果を反映して保存（結果ファイルは1館ずつ読み込む）"""
+        from ..scraping.snapshot_files import load_result
+        for theater_key, result in (results or {}).items():
+            try:
+                self.update_theater(theater_key, load_result(result))
+            except Exception as e:
+                self.logger.error(f"Error loading theater data {result.get('file')}: {e}")
+        self.save()
+
+    def sync_catalog(self, output_dir: str = "output") -> bool:
+        """集計より新しい映画館の結果ファイルがあれば反映（Bot外で実行したスクレイピング分）"""
+        from ..scraping.snapshot_catalog import get_snapshot_catalog
+        catalog = get_snapshot_catalog(output_dir)
+        updated = False
+        for theater_key, entry in catalog.latest_per_theater().items():
+            with self._lock:
+                known = self._theaters.get(theater_key)
+                if known is not None and known.scraped_at and known.scraped_at >= entry.scraped_at:
+                    continue
+            try:
+                result = catalog.load(entry)
+            except Exception as e:
+                self.logger.error(f"Error loading theater data {entry.file}: {e}")
+                continue
+            self.logger.info(f"Updating weekly lineup from: {entry.file}")
+            self.update_theater(theater_key, result)
+            updated = True
+        if updated:
+            self.save()
+        return updated
+
+    def _apply(self, theater_key: str, result: Dict[str, Any], replace: bool):
+        old = self._theaters.get(theater_key)
+        affected = set(old.titles()) if old else set()
+        name = result.get("theater_info", {}).get("name") or (old.name if old else theater_key)
+        lineup = old if old is not None and not replace else _TheaterLineup(name)
+        lineup.name = name
+        lineup.scraped_at = result.get("scraped_at") or lineup.scraped_at
+        for movie_dict in result.get("movies", []):
+            lineup.set_movie(movie_dict)
+        for schedule_dict in result.get("schedules", []):
+            lineup.set_schedule(schedule_dict)
+        self._theaters[theater_key] = lineup
+
+        titles = lineup.titles()
+        for title in affected.difference(titles):
+            theaters = self._index.get(title, {})
+            theaters.pop(theater_key, None)
+            if not theaters:
+                self._index.pop(title, None)
+        for title in titles:
+            self._index.setdefault(title, {})[theater_key] = None
+        affected.update(titles)
+        self._refresh(affected)
+
+    def _refresh(self, titles: Iterable[str]):
+        """作成済みの週について、指定作品の週次情報を作り直す"""
+        for week_start, entries in self._weeks.items():
+            for title in titles:
+                entry = self._build_entry(title, week_start)
+                if entry is not None:
+                    entries[title] = entry
+                else:
+                    entries.pop(title, None)
+
+    # ---- 参照 ----
+
+    def _build_entry(self, title: str, week_start: date) -> Optional[WeeklyMovieInfo]:
+        window_end = week_start + timedelta(weeks=LINEUP_WEEKS)
+        theaters: List[str] = []
+        showtimes: List[ShowtimeInfo] = []
+        movie = None
+        for theater_key in self._index.get(title, ()):
+            lineup = self._theaters[theater_key]
+            window = lineup.window(title, week_start, window_end)
+            if not window:
+                continue
+            if lineup.name not in theaters:
+                theaters.append(lineup.name)
+            showtimes.extend(window)
+            movie = movie or lineup.movies.get(title)
+        if not theaters:
+            return None
+        # 映画情報がない場合は他館の情報、それもなければ基本情報のみ
+        movie = movie or self.movie(title) or MovieInfo(title=title)
+        return build_weekly_movie_info(movie, theaters, sorted(showtimes, key=lambda showtime: showtime.date_value))
+
+    def _week_entries(self, week_start: date) -> Dict[str, WeeklyMovieInfo]:
+        entries = self._weeks.get(week_start)
+        if entries is None:
+            entries = {}
+            for lineup in self._theaters.values():
+                for title in lineup.schedule_dicts:
+                    if title not in entries:
+                        entry = self._build_entry(title, week_start)
+                        if entry is not None:
+                            entries[title] = entry
+            self._weeks[week_start] = entries
+            for stale in sorted(self._weeks)[:-MAX_CACHED_WEEKS]:
+                del self._weeks[stale]
+        return entries
+
+    def weekly_schedule(self, week_start: Optional[date] = None) -> WeeklyMovieSchedule:
+        """指定週（省略時は今週）からLINEUP_WEEKS週分のラインナップ"""
+        week_start = monday_of(week_start or date.today())
+        with self._lock:
+            movies = list(self._week_entries(week_start).values())
+        theaters = set()
+        for movie_info in movies:
+            theaters.update(movie_info.theaters)
+        return WeeklyMovieSchedule(
+            week_start=week_start,
+            week_end=week_start + timedelta(weeks=LINEUP_WEEKS, days=-1),
+            movies=movies,
+            total_movies=len(movies),
+            total_theaters=len(theaters)
+        )
+
+    def movie(self, title: str) -> Optional[MovieInfo]:
+        """作品名から映画情報（最初に登録した映画館のもの）"""
+        with self._lock:
+            for theater_key in self._index.get(title, ()):
+                movie = self._theaters[theater_key].movies.get(title)
+                if movie is not None:
+                    return movie
+        return None
+
+    def theater_names(self) -> Dict[str, str]:
+        """映画館キー -> 映画館名"""
+        with self._lock:
+            return {key: lineup.name for key, lineup in self._theaters.items()}
+
+    def theater_lineup(self, theater_key: str) -> List[Tuple[str, Optional[MovieInfo], List[ShowtimeInfo]]]:
+        """映画館の上映予定（作品名, 映画情報, 上映回）"""
+        with self._lock:
+            lineup = self._theaters.get(theater_key)
+            if lineup is None:
+                return []
+            return [
+                (title, lineup.movies.get(title), list(lineup.showtimes(title)))
+                for title in lineup.schedule_dicts
+            ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._theaters)
+
+
+_aggregate: Optional[WeeklyLineupAggregate] = None
+_aggregate_lock = threading.Lock()
+
+
+def get_weekly_lineup() -> WeeklyLineupAggregate:
+    """プロセス共有の週次ラインナップを取得"""
+    global _aggregate
+    with _aggregate_lock:
+        if _aggregate is None:
+            _aggregate = WeeklyLineupAggregate()
+        return _aggregate
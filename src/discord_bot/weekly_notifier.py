@@ -8,18 +8,22 @@ import logging
 from datetime import datetime, date, timedelta
 from typing import List, Optional
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 
-from ..scraping.main import TheaterScrapingOrchestrator
-from .discord_models import WeeklyMovieSchedule, create_weekly_schedule_from_data
+from .weekly_lineup import get_weekly_lineup
+from .send_queue import get_send_queue
+from .weekly_report import WeeklyReport, WeeklyReportStore, render_weekly_report
 from .discord_config import load_config
+from .scheduler import Job, JobScheduler, WeeklyTrigger, get_timezone
 
 class WeeklyNotifier:
     """週次通知管理クラス"""
     
     def __init__(self):
         self.discord_config, self.schedule_config, self.bot_config = load_config()
-        self.orchestrator = TheaterScrapingOrchestrator()
+        self._orchestrator = None
+        self.report_store = WeeklyReportStore()
+        self.scheduler: Optional[JobScheduler] = None
         self.logger = logging.getLogger(__name__)
         
         # Discord Bot設定
@@ -30,6 +34,14 @@ class WeeklyNotifier:
         # イベントハンドラー設定
         self.setup_bot_events()
         
+    @property
+    def orchestrator(self):
+        """スクレイピング統合管理（スクレイパー群の読み込みを初回使用時まで遅らせる）"""
+        if self._orchestrator is None:
+            from ..scraping.main import TheaterScrapingOrchestrator
+            self._orchestrator = TheaterScrapingOrchestrator()
+        return self._orchestrator
+        
     def setup_bot_events(self):
         """Bot イベントハンドラー設定"""
         
@@ -42,7 +54,7 @@ class WeeklyNotifier:
                 await self._find_channels()
                 
             # 週次タスク開始
-            self.weekly_task.start()
+            self.start_weekly_job()
             
         @self.bot.event
         async def on_message(message):
@@ -61,183 +73,76 @@ class WeeklyNotifier:
                 elif channel.name == self.discord_config.detail_channel_name:
                     self.discord_config.detail_channel_id = channel.id
                     
-    @tasks.loop(time=datetime.strptime("07:30", "%H:%M").time())
-    async def weekly_task(self):
-        """週次タスク（毎週月曜日実行）"""
-        now = datetime.now()
-        if now.weekday() == 0:  # 月曜日
-            await self.send_weekly_report()
-            
-    async def send_weekly_report(self):
-        """週次レポート送信"""
+    def start_weekly_job(self):
+        """週次レポートのジョブを開始（ScheduleConfig.weekly_report_timeに送信）"""
+        if self.scheduler is None:
+            self.scheduler = JobScheduler("logs/notifier_schedule.json")
+            self.scheduler.add_job(Job(
+                name="weekly_report",
+                trigger=WeeklyTrigger.parse(self.schedule_config.weekly_report_time,
+                                            get_timezone(self.schedule_config.timezone)),
+                func=self.send_weekly_report,
+                misfire_grace=timedelta(hours=6)
+            ))
+        self.scheduler.start()
+            
+    def prepare_weekly_report(self, today: Optional[date] = None) -> Optional[WeeklyReport]:
+        """週次レポートを作成して保存（スクレイピング後に実行）"""
         try:
-            self.logger.info("Starting weekly report generation")
-            
-            # データ取得（既存データファイルから）
-            all_results = self._load_latest_theater_data()
-            if not all_results:
+            # 集計済みの週次ラインナップ（Bot外で実行したスクレイピング結果があれば反映）
+            lineup = get_weekly_lineup()
+            lineup.sync_catalog()
+            if not len(lineup):
                 self.logger.error("No theater data available for weekly report")
-                return
-            
-            # 週次スケジュール生成
-            current_week_start = self._get_monday_of_week(datetime.now().date())
-            next_week_start = current_week_start + timedelta(days=7)
-            
-            theater_data_list = []
-            for theater_key, result in all_results.items():
-                if result:
-                    theater_data_list.append(self._convert_result_to_theater_data(result))
-                    
-            weekly_schedule = create_weekly_schedule_from_data(
-                theater_data_list, current_week_start, next_week_start
+                return None
+            
+            # 週次スケジュール（今週・来週）
+            weekly_schedule = lineup.weekly_schedule(today or datetime.now().date())
+            report = render_weekly_report(weekly_schedule)
+            self.report_store.save(report)
+            self.logger.info(
+                f"Prepared weekly report for {report.week_start}: "
+                f"{report.total_movies} movies, {len(report.messages)} messages"
             )
+            return report
             
-            # Discord Embed作成
-            embed = self._create_weekly_embed(weekly_schedule)
-            
-            # 送信
-            if self.discord_config.main_channel_id:
-                channel = self.bot.get_channel(self.discord_config.main_channel_id)
-                if channel:
-                    await channel.send(embed=embed)
-                    self.logger.info("Weekly report sent successfully")
-                else:
-                    self.logger.error(f"Channel not found: {self.discord_config.main_channel_id}")
-            else:
-                self.logger.error("Main channel ID not configured")
-                
         except Exception as e:
-            self.logger.error(f"Error sending weekly report: {e}")
+            self.logger.error(f"Error preparing weekly report: {e}")
+            return None
             
-    def _get_monday_of_week(self, date_obj: date) -> date:
-        """指定日の週の月曜日を取得"""
-        days_since_monday = date_obj.weekday()
-        monday = date_obj - timedelta(days=days_since_monday)
-        return monday
-    
-    def _load_latest_theater_data(self) -> dict:
-        """最新の映画館データファイルを読み込み"""
+    def load_weekly_report(self, today: Optional[date] = None) -> Optional[WeeklyReport]:
+        """今週の週次レポート（保存済みのものがなければその場で作成）"""
+        today = today or datetime.now().date()
+        return self.report_store.load(today) or self.prepare_weekly_report(today)
+        
+    async def send_weekly_report(self, channel: Optional[discord.abc.Messageable] = None):
+        """週次レポート送信（作成済みのレポートを読み込んで投稿）"""
         try:
-            import json
-            import glob
-            import os
-            
-            output_dir = "output"
-            if not os.path.exists(output_dir):
-                self.logger.error(f"Output directory {output_dir} not found")
-                return {}
+            if channel is None:
+                if not self.discord_config.main_channel_id:
+                    self.logger.error("Main channel ID not configured")
+                    return
+                channel = self.bot.get_channel(self.discord_config.main_channel_id)
+                if not channel:
+                    self.logger.error(f"Channel not found: {self.discord_config.main_channel_id}")
+                    return
+                    
+            report = self.load_weekly_report()
+            if report is None:
+                return
                 
-            json_files = glob.glob(os.path.join(output_dir, "all_theaters_*.json"))
-            if not json_files:
-                self.logger.error("No theater data files found")
-                return {}
+            # 1メッセージに複数のEmbedをまとめ、送信キュー経由でレート制限内に送る
+            send_queue = get_send_queue()
+            for embeds in report.embeds():
+                await send_queue.send(channel, embeds=embeds)
                 
-            latest_file = max(json_files, key=os.path.getctime)
-            self.logger.info(f"Using data from: {latest_file}")
-            
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            report.sent_at = datetime.now().isoformat()
+            self.report_store.save(report)
+            self.logger.info("Weekly report sent successfully")
                 
         except Exception as e:
-            self.logger.error(f"Error loading theater data: {e}")
-            return {}
-        
-    def _convert_result_to_theater_data(self, result: dict):
-        """辞書データをTheaterDataオブジェクトに変換"""
-        from ..scraping.models import TheaterInfo, MovieInfo, MovieSchedule, ShowtimeInfo, TheaterData
-        
-        # 映画館情報
-        theater_info_dict = result.get("theater_info", {})
-        theater_info = TheaterInfo(
-            name=theater_info_dict.get("name", ""),
-            url=theater_info_dict.get("url", ""),
-            address=theater_info_dict.get("address"),
-            phone=theater_info_dict.get("phone"),
-            access=theater_info_dict.get("access"),
-            screens=theater_info_dict.get("screens")
-        )
-        
-        # 映画情報
-        movies = []
-        for movie_dict in result.get("movies", []):
-            movie = MovieInfo(
-                title=movie_dict.get("title", ""),
-                title_en=movie_dict.get("title_en"),
-                director=movie_dict.get("director"),
-                cast=movie_dict.get("cast", []),
-                genre=movie_dict.get("genre"),
-                duration=movie_dict.get("duration"),
-                rating=movie_dict.get("rating"),
-                synopsis=movie_dict.get("synopsis"),
-                poster_url=movie_dict.get("poster_url")
-            )
-            movies.append(movie)
-            
-        # スケジュール情報
-        schedules = []
-        for schedule_dict in result.get("schedules", []):
-            showtimes = []
-            for showtime_dict in schedule_dict.get("showtimes", []):
-                showtime = ShowtimeInfo(
-                    date=showtime_dict.get("date", ""),
-                    times=showtime_dict.get("times", []),
-                    screen=showtime_dict.get("screen"),
-                    ticket_url=showtime_dict.get("ticket_url")
-                )
-                showtimes.append(showtime)
-                
-            schedule = MovieSchedule(
-                theater_name=schedule_dict.get("theater_name", ""),
-                movie_title=schedule_dict.get("movie_title", ""),
-                showtimes=showtimes
-            )
-            schedules.append(schedule)
-            
-        return TheaterData(
-            theater_info=theater_info,
-            movies=movies,
-            schedules=schedules
-        )
-        
-    def _create_weekly_embed(self, weekly_schedule: WeeklyMovieSchedule) -> discord.Embed:
-        """週次レポート用Embed作成"""
-        title = f"🎬 【今週・来週の上映映画】{weekly_schedule.week_start.strftime('%m/%d')}〜{weekly_schedule.week_end.strftime('%m/%d')}"
-        
-        embed = discord.Embed(
-            title=title,
-            color=0x7289da,
-            timestamp=datetime.now()
-        )
-        
-        # 映画情報を追加
-        description_parts = ["━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"]
-        
-        for movie_info in weekly_schedule.movies[:10]:  # 最大10件
-            movie_part = f"🎭 **『{movie_info.movie.title}』**\n"
-            movie_part += f"📍 上映館: {', '.join(movie_info.theaters)}\n"
-            movie_part += f"📅 期間: {movie_info.schedule_period}\n"
-            
-            # あらすじ（150文字まで）
-            if movie_info.movie.synopsis:
-                synopsis = movie_info.movie.synopsis[:150]
-                if len(movie_info.movie.synopsis) > 150:
-                    synopsis += "..."
-                movie_part += f"💭 {synopsis}\n"
-                
-            description_parts.append(movie_part + "\n")
+            self.logger.error(f"Error sending weekly report: {e}")
             
-        # 統計情報
-        description_parts.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
-        description_parts.append(f"📊 合計: {weekly_schedule.total_movies}作品 | {weekly_schedule.total_theaters}映画館\n")
-        description_parts.append("🤖 詳細情報は #映画-質問 で「映画名について教えて」と質問してください")
-        
-        embed.description = "".join(description_parts)
-        
-        # フッター
-        embed.set_footer(text="東京独立系映画館情報 | 毎週月曜更新")
-        
-        return embed
-        
     def run(self):
         """Bot実行"""
         if not self.discord_config.token:
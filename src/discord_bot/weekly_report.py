@@ -0,0 +1,229 @@
+"""
+週次レポートの作成・保存
+
+スクレイピング直後に週次ラインナップからEmbedのペイロード・メッセージ分割・統計までを
+作って保存しておき、送信時やプレビュー時は保存済みのレポートを読んで投稿するだけにする。
+"""
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import discord
+
+from .discord_models import WeeklyMovieInfo, WeeklyMovieSchedule
+from .weekly_lineup import monday_of
+
+DEFAULT_REPORT_DIR = "output/reports"
+
+# Discordの上限（文字数はUTF-16換算で数える）
+DESCRIPTION_LIMIT = 4096  # Embed1件の本文
+MESSAGE_LIMIT = 6000  # 1メッセージ内の全Embedのタイトル・本文・フッターの合計
+EMBEDS_PER_MESSAGE = 10
+TITLE_LIMIT = 256
+
+# あらすじの最大文字数
+SYNOPSIS_LENGTH = 150
+
+EMBED_COLOR = 0x7289da
+SEPARATOR = "━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+FOOTER_TEXT = "東京独立系映画館情報 | 毎週月曜更新"
+
+
+def text_size(text: str) -> int:
+    """Discordの文字数制限で数える長さ（UTF-16のコード単位数）"""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _clip(text: str, limit: int) -> str:
+    """limit以内に切り詰める（末尾は…）"""
+    if text_size(text) <= limit:
+        return text
+    size = 0
+    for index, char in enumerate(text):
+        size += text_size(char)
+        if size > limit - 1:
+            return text[:index] + "…"
+    return text
+
+
+@dataclass
+class WeeklyReport:
+    """送信用に作成済みの週次レポート"""
+    week_start: date
+    week_end: date
+    generated_at: str
+    messages: List[List[Dict[str, Any]]]  # メッセージごとのEmbedのペイロード（discord.Embed.to_dict()の形）
+    total_movies: int
+    total_theaters: int
+    sent_at: Optional[str] = None
+
+    def embeds(self) -> List[List[discord.Embed]]:
+        """メッセージごとのEmbed"""
+        return [[discord.Embed.from_dict(payload) for payload in message] for message in self.messages]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "week_start": self.week_start.isoformat(),
+            "week_end": self.week_end.isoformat(),
+            "generated_at": self.generated_at,
+            "total_movies": self.total_movies,
+            "total_theaters": self.total_theaters,
+            "sent_at": self.sent_at,
+            "messages": self.messages
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WeeklyReport":
+        # 1メッセージ1Embedの旧形式（"pages"）も読めるようにする
+        messages = data.get("messages") or [[page] for page in data.get("pages", [])]
+        return cls(
+            week_start=date.fromisoformat(data["week_start"]),
+            week_end=date.fromisoformat(data["week_end"]),
+            generated_at=data.get("generated_at", ""),
+            messages=messages,
+            total_movies=data.get("total_movies", 0),
+            total_theaters=data.get("total_theaters", 0),
+            sent_at=data.get("sent_at")
+        )
+
+
+def _movie_section(movie_info: WeeklyMovieInfo) -> str:
+    """作品1件分の本文"""
+    movie_part = f"🎭 **『{movie_info.movie.title}』**\n"
+    movie_part += f"📍 上映館: {', '.join(movie_info.theaters)}\n"
+    movie_part += f"📅 期間: {movie_info.schedule_period}\n"
+
+    # あらすじ（150文字まで）
+    synopsis = movie_info.movie.synopsis
+    if synopsis:
+        movie_part += f"💭 {synopsis[:SYNOPSIS_LENGTH]}{'...' if len(synopsis) > SYNOPSIS_LENGTH else ''}\n"
+    return movie_part + "\n"
+
+
+def pack_sections(sections: List[str], reserved: int) -> List[List[str]]:
+    """本文の区切りを、上限内に収まるメッセージ（Embed本文のリスト）に詰める
+
+    1つの区切りを複数のEmbedにまたがせず、Embedの本文上限・1メッセージあたりの
+    Embed数と合計文字数（タイトル・フッター分のreservedを含む）を超えない範囲で前から詰める。
+    """
+    messages: List[List[str]] = []
+    embeds: List[str] = []
+    current: List[str] = []
+    current_size = 0
+    message_size = reserved
+
+    def flush_embed():
+        nonlocal current, current_size
+        if current:
+            embeds.append("".join(current))
+        current, current_size = [], 0
+
+    def flush_message():
+        nonlocal embeds, message_size
+        flush_embed()
+        if embeds:
+            messages.append(embeds)
+        embeds, message_size = [], reserved
+
+    for section in sections:
+        section = _clip(section, min(DESCRIPTION_LIMIT, MESSAGE_LIMIT - reserved))
+        size = text_size(section)
+        if message_size + size > MESSAGE_LIMIT:
+            flush_message()
+        elif current and current_size + size > DESCRIPTION_LIMIT:
+            flush_embed()
+            if len(embeds) == EMBEDS_PER_MESSAGE:
+                flush_message()
+        current.append(section)
+        current_size += size
+        message_size += size
+    flush_message()
+    return messages
+
+
+def render_weekly_report(weekly_schedule: WeeklyMovieSchedule,
+                         generated_at: Optional[datetime] = None) -> WeeklyReport:
+    """週次スケジュールからレポートを作成
+
+    全作品を省略せずに載せ、Discordの上限に収まるようにメッセージ・Embedへ分割する。
+    各メッセージの先頭のEmbedにタイトル、レポート最後のEmbedに統計とフッターを付ける。
+    """
+    generated_at = generated_at or datetime.now()
+    title = (f"🎬 【今週・来週の上映映画】{weekly_schedule.week_start.strftime('%m/%d')}"
+             f"〜{weekly_schedule.week_end.strftime('%m/%d')}")
+
+    sections = [SEPARATOR]
+    sections.extend(_movie_section(movie_info) for movie_info in weekly_schedule.movies)
+    sections.append(
+        SEPARATOR
+        + f"📊 合計: {weekly_schedule.total_movies}作品 | {weekly_schedule.total_theaters}映画館\n"
+        + "🤖 詳細情報は #映画-質問 で「映画名について教えて」と質問してください"
+    )
+
+    # タイトル（続きのメッセージは「（n/N）」付き）とフッターの分を空けておく
+    reserved = text_size(title) + len("（999/999）") + text_size(FOOTER_TEXT)
+    descriptions = pack_sections(sections, reserved)
+
+    messages = []
+    for number, message_descriptions in enumerate(descriptions, start=1):
+        payloads = []
+        for index, description in enumerate(message_descriptions):
+            embed = discord.Embed(color=EMBED_COLOR, description=description)
+            if index == 0:
+                page_title = title if len(descriptions) == 1 else f"{title}（{number}/{len(descriptions)}）"
+                embed.title = _clip(page_title, TITLE_LIMIT)
+            payloads.append(embed)
+        messages.append(payloads)
+
+    # 最後のEmbedにフッター・作成日時
+    last = messages[-1][-1]
+    last.set_footer(text=FOOTER_TEXT)
+    last.timestamp = generated_at.astimezone()
+
+    return WeeklyReport(
+        week_start=weekly_schedule.week_start,
+        week_end=weekly_schedule.week_end,
+        generated_at=generated_at.isoformat(),
+        messages=[[embed.to_dict() for embed in message] for message in messages],
+        total_movies=weekly_schedule.total_movies,
+        total_theaters=weekly_schedule.total_theaters
+    )
+
+
+class WeeklyReportStore:
+    """週次レポートの保存先（週の月曜日ごとに1ファイル）"""
+
+    def __init__(self, report_dir: Optional[str] = None):
+        self.report_dir = Path(report_dir or os.getenv("WEEKLY_REPORT_DIR", DEFAULT_REPORT_DIR))
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def path(self, week_start: date) -> Path:
+        return self.report_dir / f"weekly_report_{monday_of(week_start).isoformat()}.json"
+
+    def save(self, report: WeeklyReport):
+        """レポートを保存"""
+        path = self.path(report.week_start)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+            tmp_path.replace(path)
+        except Exception as e:
+            self.logger.error(f"Failed to save weekly report: {e}")
+
+    def load(self, week_start: date) -> Optional[WeeklyReport]:
+        """指定日の週のレポート（なければNone）"""
+        path = self.path(week_start)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return WeeklyReport.from_dict(json.load(f))
+        except Exception as e:
+            self.logger.error(f"Failed to load weekly report {path.name}: {e}")
+            return None
@@ -1,25 +1,128 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple, Union
+from datetime import datetime
 import requests
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
-import time
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import os
+import time
 from .models import MovieInfo, ShowtimeInfo, MovieSchedule, TheaterInfo, TheaterData
+from .readiness import ReadinessCondition, DEFAULT_READINESS, get_load_time_tracker
+from .browser_supervisor import get_browser_supervisor
+from .rate_limiter import get_rate_limiter
+from .health import get_health_registry
+from .deadline import Deadline
+from .selector_memo import get_selector_memo_registry
+from .date_normalizer import DateNormalizer
+from .schedule_merge import ScheduleMerger, merge_schedules
+from .page_archive import PageArchive, get_page_archive
+from .title_dictionary import TitleDictionary, get_title_dictionary
+
+# 抽出対象の種別（iter_recordsが返すレコードの種別）
+MOVIES = "movies"
+SCHEDULES = "schedules"
+
+# 統合待ちで保持する上映回のまとまり（映画・日付・スクリーン単位）の上限
+MAX_MERGE_GROUPS = int(os.getenv("SCHEDULE_MERGE_MAX_GROUPS", "20000"))
+
+logger = logging.getLogger(__name__)
+
+
+def merge_schedule_records(records: Iterable[Tuple[str, Any]],
+                           max_groups: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+    """(種別, レコード) の列のうちスケジュールを映画ごとに統合する
+    
+    映画はそのまま逐次返し、スケジュールは取得計画の全ページを読み終えてから統合して返す
+    （同じ映画の上映回が日付別の複数ページに分かれるため、途中では確定できない）。
+    統合待ちの間は映画・日付・スクリーンごとに重複を除いた上映回だけを保持し、
+    そのまとまりがmax_groups（既定はSCHEDULE_MERGE_MAX_GROUPS）に達したら
+    そこまでの統合結果を先に返す（この場合、同じ映画が複数件に分かれることがある）。
+    """
+    limit = MAX_MERGE_GROUPS if max_groups is None else max_groups
+    merger = ScheduleMerger()
+    for kind, record in records:
+        if kind != SCHEDULES:
+            yield kind, record
+            continue
+        merger.add(record)
+        if limit and merger.group_count >= limit:
+            logger.warning(f"Schedule merge buffer reached {merger.group_count} groups; flushing early")
+            for schedule in merger.results():
+                yield SCHEDULES, schedule
+            merger = ScheduleMerger()
+    for schedule in merger.results():
+        yield SCHEDULES, schedule
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    """取得対象ページ
+    
+    labelはextract_movies/extract_schedulesでページ種別を判別するために使う。
+    """
+    url: str
+    label: str = "main"
+    render: bool = False  # Seleniumで取得
+    fallback_render: bool = False  # 通常取得に失敗した場合にSeleniumで再取得
+
 
 class BaseScraper(ABC):
     """映画館スクレイピング基底クラス"""
     
+    # Seleniumページの準備完了条件（URLパスのプレフィックス -> 条件リスト）
+    # 最長一致のプレフィックスを使用し、該当がなければ "" のエントリ、それもなければ<body>出現待ち
+    readiness_conditions: Dict[str, List[ReadinessCondition]] = {}
+    
+    # 接続確立のタイムアウト（読み込みタイムアウトはヘルス状態から算出）
+    connect_timeout: float = 5.0
+    
+    # タイトル辞書（title_dictionary）に登録する既知の作品名。Noneは辞書を使わないスクレイパー
+    KNOWN_TITLES: Optional[Tuple[str, ...]] = None
+    
     def __init__(self, theater_name: str, base_url: str):
         self.theater_name = theater_name
         self.base_url = base_url
         self.session = requests.Session()
         self.setup_session()
         self.logger = logging.getLogger(f"{self.__class__.__name__}")
+        self.rate_limiter = get_rate_limiter()
+        self.health = get_health_registry().get(theater_name)
+        self.health.set_probe(self._probe_site)
+        # フォールバック候補のうち前回一致したセレクタを優先する
+        self.selector_memo = get_selector_memo_registry().get(theater_name)
+        # 日付の正規化（年のない日付は取得日に最も近い年とする）
+        self.date_normalizer = DateNormalizer()
+        
+        # 実行期限（オーケストレーターが設定）と期限による打ち切り有無
+        self.deadline: Optional[Deadline] = None
+        self.cut_off = False
+        
+        # 映画館キー（レジストリが設定、ページ本文の保存に使う）
+        self.theater_key: Optional[str] = None
+        # この映画館の既知タイトル辞書（KNOWN_TITLESがある場合、初回参照時に作る）
+        self._title_dictionary: Optional[TitleDictionary] = None
+        # 保存済みページからの再処理（設定中は通信せず保存済みの本文を返す）
+        self.replay: Optional[Tuple[PageArchive, Optional[datetime]]] = None
+        self.replay_missing: List[str] = []
+        
+    def __getstate__(self):
+        """解析プロセスへ渡す状態（通信・ヘルス管理用のオブジェクトは除く）"""
+        state = self.__dict__.copy()
+        for key in ("session", "logger", "rate_limiter", "health", "deadline", "replay"):
+            state.pop(key, None)
+        # タイトル辞書は過去の結果を読み込み済みで渡す（解析プロセスでは目録を読まない）
+        if self.KNOWN_TITLES is not None:
+            state["_title_dictionary"] = self.title_dictionary
+        return state
+        
+    def __setstate__(self, state):
+        """解析専用のインスタンスとして復元"""
+        self.__dict__.update(state)
+        self.logger = logging.getLogger(f"{self.__class__.__name__}")
+        self.deadline = None
+        self.replay = None
         
     def setup_session(self):
         """セッション設定"""
@@ -42,8 +145,10 @@ class BaseScraper(ABC):
         from requests.adapters import HTTPAdapter
         from urllib3.util.retry import Retry
         
+        # 読み込みタイムアウトの再試行は1回まで（応答しないサイトで時間を浪費しないため）
         retry_strategy = Retry(
             total=3,
+            read=1,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
         )
@@ -51,49 +156,196 @@ class BaseScraper(ABC):
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
-    def get_page(self, url: str, timeout: int = 30) -> Optional[BeautifulSoup]:
+    def set_deadline(self, deadline: Optional[Deadline]):
+        """実行期限を設定（期限到達後のページ取得は即座にNoneを返す）"""
+        self.deadline = deadline
+        self.cut_off = False
+        
+    def _deadline_reached(self, url: str) -> bool:
+        """期限到達チェック"""
+        if self.deadline is not None and self.deadline.expired():
+            if not self.cut_off:
+                self.logger.warning(f"Deadline reached for {self.theater_name}, skipping remaining pages from {url}")
+            self.cut_off = True
+            return True
+        return False
+        
+    @property
+    def archive_key(self) -> str:
+        """ページ本文の保存に使う映画館の識別子"""
+        return self.theater_key or self.theater_name
+        
+    @property
+    def title_dictionary(self) -> TitleDictionary:
+        """この映画館の既知タイトル辞書（この映画館の過去の結果とKNOWN_TITLESから作る）"""
+        if self._title_dictionary is None:
+            self._title_dictionary = get_title_dictionary(self.archive_key, self.KNOWN_TITLES or ())
+        return self._title_dictionary
+        
+    def set_replay(self, archive: Optional[PageArchive], at: Optional[datetime] = None):
+        """保存済みのページ本文で再処理する（archive=Noneで通常の取得に戻す）
+        
+        at指定時はその時点までに取得した本文を使う。年の推定も各ページの取得日を基準にする。
+        """
+        self.replay = (archive, at) if archive is not None else None
+        self.replay_missing = []
+        if archive is None:
+            self.date_normalizer = DateNormalizer()
+            
+    def _replayed(self, url: str) -> Optional[bytes]:
+        """再処理用の保存済み本文"""
+        archive, at = self.replay
+        record = archive.latest(self.archive_key, url, at)
+        body = archive.body(self.archive_key, url, at) if record else None
+        if body is None:
+            self.logger.warning(f"No archived page for {url}")
+            self.replay_missing.append(url)
+            return None
+        self.date_normalizer = DateNormalizer(record.time.date())
+        return body
+        
+    def _archive_page(self, url: str, content: bytes, method: str):
+        """取得した本文を保存（保存の失敗は取得結果に影響させない）"""
+        archive = get_page_archive()
+        if archive is None:
+            return
+        try:
+            archive.store(self.archive_key, url, content, method)
+        except Exception as e:
+            self.logger.warning(f"Failed to archive page {url}: {e}")
+            
+    def _clip_timeout(self, timeout: float) -> float:
+        """タイムアウトを期限内に丸める"""
+        if self.deadline is None:
+            return timeout
+        return max(0.1, self.deadline.clip(timeout))
+        
+    def get_page(self, url: str, timeout: Optional[float] = None) -> Optional[BeautifulSoup]:
         """ページ取得"""
+        content = self.fetch_raw(url, timeout)
+        if content is None:
+            return None
+        return BeautifulSoup(content, 'html.parser')
+        
+    def fetch_raw(self, url: str, timeout: Optional[float] = None) -> Optional[bytes]:
+        """ページ本文をバイト列で取得
+        
+        遮断中の映画館・期限到達後は即座にNoneを返す。timeout未指定時は観測レイテンシから算出した値を使う。
+        取得した本文はページ保存先に保存する。
+        """
+        if self.replay is not None:
+            return self._replayed(url)
+            
+        if self._deadline_reached(url):
+            return None
+            
+        if not self.health.allow_request():
+            self.logger.warning(f"Circuit open for {self.theater_name}, skipping {url}")
+            return None
+            
+        read_timeout = timeout if timeout is not None else self.health.timeout()
+        started = time.monotonic()
         try:
-            response = self.session.get(url, timeout=timeout)
+            self.rate_limiter.acquire(url)
+            started = time.monotonic()
+            response = self.session.get(
+                url,
+                timeout=(self._clip_timeout(self.connect_timeout), self._clip_timeout(read_timeout))
+            )
             response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            self.health.record_success(time.monotonic() - started)
+            self._archive_page(url, response.content, "http")
+            return response.content
+        except requests.HTTPError as e:
+            # 4xxはサイト自体は応答しているため障害として扱わない
+            if e.response is not None and e.response.status_code < 500:
+                self.health.record_success(time.monotonic() - started)
+            else:
+                self.health.record_failure(str(e))
+            self.logger.error(f"Failed to get page {url}: {e}")
+            return None
         except Exception as e:
+            if self._deadline_reached(url):
+                # 期限による打ち切りはサイト障害として扱わない
+                self.logger.warning(f"Request cut off by deadline: {url}")
+                return None
+            self.health.record_failure(str(e))
             self.logger.error(f"Failed to get page {url}: {e}")
             return None
             
-    def get_page_with_selenium(self, url: str, wait_time: int = 10) -> Optional[BeautifulSoup]:
+    def _probe_site(self) -> bool:
+        """遮断中のバックグラウンド疎通確認"""
+        response = self.session.head(self.base_url, timeout=(self.connect_timeout, 10), allow_redirects=True)
+        return response.status_code < 500
+            
+    def readiness_for(self, url: str) -> List[ReadinessCondition]:
+        """URLに対応する準備完了条件を取得"""
+        path = urlparse(url).path or "/"
+        best_prefix = None
+        for prefix in self.readiness_conditions:
+            if path.startswith(prefix) and (best_prefix is None or len(prefix) > len(best_prefix)):
+                best_prefix = prefix
+        if best_prefix is None:
+            return DEFAULT_READINESS
+        return self.readiness_conditions[best_prefix]
+            
+    def get_page_with_selenium(self, url: str, wait_time: Optional[float] = None,
+                               conditions: Optional[List[ReadinessCondition]] = None) -> Optional[BeautifulSoup]:
         """Selenium使用ページ取得"""
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        
-        # SSL関連のオプションを追加
-        options.add_argument('--ignore-ssl-errors=yes')
-        options.add_argument('--ignore-certificate-errors')
-        options.add_argument('--ignore-certificate-errors-spki-list')
-        options.add_argument('--ignore-ssl-errors-list')
-        options.add_argument('--allow-running-insecure-content')
-        options.add_argument('--disable-web-security')
-        options.add_argument('--allow-running-insecure-content')
-        options.add_argument('--ignore-urlfetcher-cert-requests')
+        content = self.render_raw(url, wait_time, conditions)
+        if content is None:
+            return None
+        return BeautifulSoup(content, 'html.parser')
+            
+    def render_raw(self, url: str, wait_time: Optional[float] = None,
+                   conditions: Optional[List[ReadinessCondition]] = None) -> Optional[bytes]:
+        """Seleniumで描画したページをバイト列で取得
+        
+        準備完了条件を満たした時点で即座にページを返す。待機上限は過去の所要時間から
+        算出し（wait_time指定時はそれを優先）、上限に達した場合はその時点のページを返す。
+        """
+        if self.replay is not None:
+            return self._replayed(url)
+            
+        if self._deadline_reached(url):
+            return None
+            
+        if not self.health.allow_request():
+            self.logger.warning(f"Circuit open for {self.theater_name}, skipping {url}")
+            return None
+            
+        conditions = conditions or self.readiness_for(url)
+        tracker = get_load_time_tracker()
+        timeout = wait_time if wait_time is not None else tracker.timeout_for(url, default=10)
+        supervisor = get_browser_supervisor()
         
         try:
-            driver = webdriver.Chrome(options=options)
-            driver.get(url)
-            WebDriverWait(driver, wait_time).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            self.rate_limiter.acquire(url)
+            # ブラウザの起動・終了・異常時の回収はスーパーバイザーに任せる
+            html, elapsed, ready = supervisor.render(
+                url, conditions, self._clip_timeout(timeout),
+                page_timeout=self._clip_timeout(supervisor.page_timeout)
             )
-            html = driver.page_source
-            driver.quit()
-            return BeautifulSoup(html, 'html.parser')
+            if ready:
+                tracker.record(url, elapsed)
+            else:
+                # 待機上限で打ち切った所要時間は上限そのものなので記録しない（上限が伸び続けるため）
+                self.logger.warning(f"Readiness conditions not met within {timeout:.1f}s: {url}")
+            content = html.encode('utf-8')
+            self._archive_page(url, content, "render")
+            return content
         except Exception as e:
             self.logger.error(f"Failed to get page with Selenium {url}: {e}")
+            if self._deadline_reached(url):
+                return None
+            # 接続エラー・タイムアウトはヘルス状態に反映（ブラウザ側の問題は除く）
+            message = str(e).lower()
+            if "net::err_" in message or "timeout" in message or "timed out" in message:
+                self.health.record_failure(str(e))
             # SSL エラーの場合、通常のrequestsセッションでも試行
             if "SSL" in str(e) or "certificate" in str(e).lower():
                 self.logger.info(f"Trying with requests session for {url}")
-                return self.get_page(url)
+                return self.fetch_raw(url)
             return None
             
     def safe_extract_text(self, element, default: str = "") -> str:
@@ -114,37 +366,131 @@ class BaseScraper(ABC):
             return ""
         return " ".join(text.split())
         
-    def delay(self, seconds: float = 1.0):
-        """リクエスト間隔調整"""
-        time.sleep(seconds)
+    def format_date(self, date_text: str) -> Optional[str]:
+        """日付をYYYY-MM-DDに変換（年がなければ取得日から推定、変換できなければNone）"""
+        return self.date_normalizer.format_date(date_text)
+        
+    def format_month_day(self, month, day) -> Optional[str]:
+        """月・日をYYYY-MM-DDに変換（年は取得日から推定、変換できなければNone）"""
+        return self.date_normalizer.format_month_day(month, day)
+        
+    def delay(self):
+        """リクエスト間隔調整（ホスト別レート制御の次の枠まで待機）"""
+        self.rate_limiter.acquire(self.base_url)
         
     @abstractmethod
     def get_theater_info(self) -> TheaterInfo:
         """映画館情報取得"""
         pass
         
-    @abstractmethod
+    def movie_pages(self) -> List[PageRequest]:
+        """映画情報の取得対象ページ"""
+        return []
+        
+    def schedule_pages(self) -> List[PageRequest]:
+        """スケジュール情報の取得対象ページ"""
+        return []
+        
+    def extract_movies(self, page: PageRequest, soup: BeautifulSoup) -> Iterable[MovieInfo]:
+        """取得済みページから映画情報抽出
+        
+        リストを返しても、見つけた順にyieldするジェネレーターにしてもよい。
+        通信を行わない純粋な解析処理とすること（パイプラインでは別プロセスで実行される）。
+        """
+        return []
+        
+    def extract_schedules(self, page: PageRequest, soup: BeautifulSoup) -> Iterable[MovieSchedule]:
+        """取得済みページからスケジュール情報抽出（extract_moviesと同じく通信しないこと）"""
+        return []
+        
+    def extract(self, kind: str, page: PageRequest, soup: BeautifulSoup) -> Iterable[Union[MovieInfo, MovieSchedule]]:
+        """種別に応じた抽出処理"""
+        if kind == MOVIES:
+            return self.extract_movies(page, soup)
+        return self.extract_schedules(page, soup)
+        
+    def page_plan(self) -> List[Tuple[PageRequest, List[Tuple[str, PageRequest]]]]:
+        """取得計画（同一URLは1回だけ取得する）
+        
+        Returns:
+            [(取得するページ, [(抽出種別, 抽出時に渡すページ), ...]), ...]
+        """
+        plan: Dict[Tuple[str, bool], Tuple[PageRequest, List[Tuple[str, PageRequest]]]] = {}
+        pages = [(MOVIES, page) for page in self.movie_pages()]
+        pages += [(SCHEDULES, page) for page in self.schedule_pages()]
+        for kind, page in pages:
+            key = (page.url, page.render)
+            if key in plan:
+                fetch_page, targets = plan[key]
+                if page.fallback_render and not fetch_page.fallback_render:
+                    fetch_page = PageRequest(fetch_page.url, fetch_page.label, fetch_page.render, True)
+                plan[key] = (fetch_page, targets + [(kind, page)])
+            else:
+                plan[key] = (page, [(kind, page)])
+        return list(plan.values())
+        
+    def fetch(self, page: PageRequest) -> Optional[bytes]:
+        """取得計画のページを取得"""
+        if page.render:
+            return self.render_raw(page.url)
+        content = self.fetch_raw(page.url)
+        if content is None and page.fallback_render and not self._deadline_reached(page.url):
+            content = self.render_raw(page.url)
+        return content
+        
+    def _iter_pages(self, kind: str, pages: List[PageRequest]) -> Iterator[Any]:
+        """ページを順に取得し、抽出したレコードを逐次返す"""
+        for page in pages:
+            content = self.fetch(page)
+            if content:
+                yield from self.extract(kind, page, BeautifulSoup(content, 'html.parser'))
+                
+    def iter_movies(self) -> Iterator[MovieInfo]:
+        """映画情報を見つけた順に返す"""
+        return self._iter_pages(MOVIES, self.movie_pages())
+        
+    def iter_schedules(self) -> Iterator[MovieSchedule]:
+        """スケジュール情報を見つけた順に返す"""
+        return self._iter_pages(SCHEDULES, self.schedule_pages())
+        
+    def iter_records(self) -> Iterator[Tuple[str, Union[MovieInfo, MovieSchedule]]]:
+        """映画・スケジュールを (種別, レコード) として逐次返す
+        
+        映画・スケジュールで共通のページは1回だけ取得・解析する。
+        解析済みのページは次のページの取得前に破棄される。
+        スケジュールは統合前のまま返す（映画ごとの統合は merge_schedule_records で行い、
+        統合待ちの上映回はそこで上限つきで保持される）。
+        """
+        for fetch_page, targets in self.page_plan():
+            content = self.fetch(fetch_page)
+            if not content:
+                continue
+            soup = BeautifulSoup(content, 'html.parser')
+            for kind, page in targets:
+                for record in self.extract(kind, page, soup):
+                    yield kind, record
+                    
     def get_movies(self) -> List[MovieInfo]:
         """映画情報取得"""
-        pass
+        return list(self.iter_movies())
         
-    @abstractmethod
     def get_schedules(self) -> List[MovieSchedule]:
-        """スケジュール情報取得"""
-        pass
+        """スケジュール情報取得（映画ごとに統合・日時順）"""
+        return merge_schedules(self.iter_schedules())
         
     def scrape_all(self) -> TheaterData:
         """全データ取得"""
         self.logger.info(f"Starting scrape for {self.theater_name}")
         
         theater_info = self.get_theater_info()
-        movies = self.get_movies()
-        schedules = self.get_schedules()
+        results = {MOVIES: [], SCHEDULES: []}
+        for kind, record in merge_schedule_records(self.iter_records()):
+            results[kind].append(record)
         
         return TheaterData(
             theater_info=theater_info,
-            movies=movies,
-            schedules=schedules
+            movies=results[MOVIES],
+            schedules=results[SCHEDULES]
         )
         
     def __del__(self):
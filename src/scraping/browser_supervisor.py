@@ -0,0 +1,429 @@
+"""
+Seleniumブラウザプロセスの監視・回収
+"""
+import atexit
+import logging
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Set, Tuple
+
+# seleniumは起動に時間がかかるため、ブラウザを実際に使う時点で読み込む
+from .readiness import ReadinessCondition, all_conditions_met
+
+try:
+    import psutil
+except ImportError:  # psutil未導入時は/procを直接参照
+    psutil = None
+
+# 起動したChromeに付与する識別フラグ（孤児プロセス判定用）
+OWNER_FLAG = "--scraping-theatre-owner"
+# chromedriverに付与する識別用の環境変数（Chromeにも引き継がれる）
+OWNER_ENV = "SCRAPING_THEATRE_OWNER"
+
+# ブラウザのクラッシュを示すエラーメッセージ
+_CRASH_MARKERS = (
+    "invalid session id",
+    "session deleted",
+    "chrome not reachable",
+    "tab crashed",
+    "disconnected",
+    "no such window",
+)
+
+
+def _is_crash(error: Exception) -> bool:
+    """ブラウザ自体が使えなくなったエラーかチェック"""
+    message = str(error).lower()
+    return any(marker in message for marker in _CRASH_MARKERS)
+
+
+def _pid_alive(pid: int) -> bool:
+    """プロセス生存確認"""
+    if psutil:
+        return psutil.pid_exists(pid)
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def _descendants(pid: int) -> List[int]:
+    """子孫プロセスのPID一覧"""
+    if psutil:
+        try:
+            return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+
+    result = []
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    children = [int(c) for c in f.read().split()]
+                result.extend(children)
+                stack.extend(children)
+        except OSError:
+            continue
+    return result
+
+
+def _rss_bytes(pid: int) -> int:
+    """プロセスの常駐メモリ量"""
+    if psutil:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return 0
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def _cmdline(pid: int) -> List[str]:
+    """プロセスのコマンドライン"""
+    if psutil:
+        try:
+            return psutil.Process(pid).cmdline()
+        except psutil.Error:
+            return []
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return [part.decode(errors="replace") for part in f.read().split(b"\0") if part]
+    except OSError:
+        return []
+
+
+def _environ_value(pid: int, name: str) -> Optional[str]:
+    """プロセスの環境変数の値（読めなければNone）"""
+    if psutil:
+        try:
+            return psutil.Process(pid).environ().get(name)
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/environ", "rb") as f:
+            for part in f.read().split(b"\0"):
+                key, _, value = part.partition(b"=")
+                if key.decode(errors="replace") == name:
+                    return value.decode(errors="replace")
+    except OSError:
+        pass
+    return None
+
+
+def _owner_of(pid: int) -> Optional[str]:
+    """起動元プロセスのPID（Chromeはコマンドライン、chromedriverは環境変数から）"""
+    for arg in _cmdline(pid):
+        if arg.startswith(f"{OWNER_FLAG}="):
+            return arg.split("=", 1)[1]
+    return _environ_value(pid, OWNER_ENV)
+
+
+def _all_pids() -> List[int]:
+    """全プロセスのPID一覧"""
+    if psutil:
+        return psutil.pids()
+    try:
+        return [int(name) for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return []
+
+
+def _kill(pid: int) -> bool:
+    """プロセスを強制終了"""
+    try:
+        os.kill(pid, signal.SIGKILL)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+
+@dataclass
+class BrowserStats:
+    """ブラウザ監視カウンター"""
+    live_browsers: int = 0
+    launched: int = 0
+    pages_rendered: int = 0
+    crashes: int = 0
+    recycled: int = 0
+    page_timeouts: int = 0
+    reaped_processes: int = 0
+    rss_bytes: int = 0
+
+
+class _ManagedBrowser:
+    """監視対象のブラウザ1個分"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.service_pid: Optional[int] = None
+        self.pids: Set[int] = set()
+        self.pages = 0
+        self.broken = False
+
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is not None:
+            self.service_pid = process.pid
+            self.refresh_pids()
+
+    def refresh_pids(self):
+        """chromedriver配下のプロセスを追跡対象に追加"""
+        if self.service_pid:
+            self.pids.add(self.service_pid)
+            self.pids.update(_descendants(self.service_pid))
+
+    def rss(self) -> int:
+        """プロセスツリー全体の常駐メモリ量"""
+        self.refresh_pids()
+        return sum(_rss_bytes(pid) for pid in self.pids if _pid_alive(pid))
+
+
+class BrowserSupervisor:
+    """ブラウザの起動・再利用・終了を一元管理
+
+    例外時も必ずdriver.quit()とプロセスツリーの強制終了を行い、ページ毎の
+    時間・メモリ上限を超えたブラウザやクラッシュしたブラウザは作り直す。
+    """
+
+    def __init__(self, max_browsers: int = 2, max_pages_per_browser: int = 20,
+                 page_timeout: float = 45.0, max_rss_mb: int = 1024):
+        self.max_pages_per_browser = max_pages_per_browser
+        self.page_timeout = page_timeout
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._slots = threading.BoundedSemaphore(max_browsers)
+        self._lock = threading.Lock()
+        self._idle: List[_ManagedBrowser] = []
+        self._live: Dict[int, _ManagedBrowser] = {}
+        self._stats = BrowserStats()
+
+        self.reap_orphans()
+        atexit.register(self.shutdown)
+
+    def _build_options(self):
+        """Chrome起動オプション"""
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        options.add_argument('--headless')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+
+        # SSL関連のオプションを追加
+        options.add_argument('--ignore-ssl-errors=yes')
+        options.add_argument('--ignore-certificate-errors')
+        options.add_argument('--ignore-certificate-errors-spki-list')
+        options.add_argument('--ignore-ssl-errors-list')
+        options.add_argument('--allow-running-insecure-content')
+        options.add_argument('--disable-web-security')
+        options.add_argument('--ignore-urlfetcher-cert-requests')
+
+        # 孤児プロセス回収用の識別フラグ
+        options.add_argument(f'{OWNER_FLAG}={os.getpid()}')
+        return options
+
+    def _launch(self) -> _ManagedBrowser:
+        """ブラウザを起動"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        # chromedriverはコマンドラインに識別フラグを付けられないため環境変数で識別する
+        service = Service(env={**os.environ, OWNER_ENV: str(os.getpid())})
+        driver = webdriver.Chrome(service=service, options=self._build_options())
+        browser = _ManagedBrowser(driver)
+        try:
+            driver.set_page_load_timeout(self.page_timeout)
+            driver.set_script_timeout(self.page_timeout)
+        except Exception:
+            self._discard(browser)
+            raise
+        with self._lock:
+            self._live[id(browser)] = browser
+            self._stats.launched += 1
+        self.logger.info(f"Launched browser (chromedriver pid={browser.service_pid})")
+        return browser
+
+    def _discard(self, browser: _ManagedBrowser):
+        """ブラウザを終了し、残ったプロセスを強制終了"""
+        browser.refresh_pids()
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            self.logger.warning(f"driver.quit() failed: {e}")
+        finally:
+            killed = sum(1 for pid in browser.pids if _pid_alive(pid) and _kill(pid))
+            with self._lock:
+                self._live.pop(id(browser), None)
+                self._stats.reaped_processes += killed
+            if killed:
+                self.logger.warning(f"Killed {killed} leftover browser processes")
+
+    def _acquire(self) -> _ManagedBrowser:
+        """待機中のブラウザを取得（なければ起動）"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._launch()
+
+    def _release(self, browser: _ManagedBrowser):
+        """ブラウザを返却（上限超過・故障時は終了）"""
+        if browser.broken:
+            self._discard(browser)
+            return
+
+        if browser.pages >= self.max_pages_per_browser:
+            self._recycle(browser, "page limit reached")
+            return
+
+        rss = browser.rss()
+        if rss > self.max_rss_bytes:
+            self._recycle(browser, f"RSS {rss // (1024 * 1024)}MB exceeds limit")
+            return
+
+        with self._lock:
+            self._idle.append(browser)
+
+    def _recycle(self, browser: _ManagedBrowser, reason: str):
+        """上限超過のブラウザを作り直し対象として終了"""
+        self.logger.info(f"Recycling browser: {reason}")
+        with self._lock:
+            self._stats.recycled += 1
+        self._discard(browser)
+
+    @contextmanager
+    def browser(self):
+        """ブラウザを貸し出し、終了・返却を保証するコンテキスト"""
+        self._slots.acquire()
+        browser = None
+        try:
+            browser = self._acquire()
+            yield browser
+        except Exception:
+            if browser is not None:
+                browser.broken = True
+            raise
+        finally:
+            try:
+                if browser is not None:
+                    self._release(browser)
+            finally:
+                self._slots.release()
+
+    def render(self, url: str, conditions: List[ReadinessCondition], timeout: float,
+               page_timeout: Optional[float] = None, max_attempts: int = 2) -> Tuple[str, float, bool]:
+        """ページを描画してHTMLを取得
+
+        page_timeoutを指定すると、このページに限り読み込み上限を短縮する。
+
+        Returns:
+            (HTML, 準備完了までの秒数, 条件を満たしたか)
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+
+        last_error: Optional[Exception] = None
+        for attempt in range(max_attempts):
+            try:
+                with self.browser() as browser:
+                    driver = browser.driver
+                    driver.set_page_load_timeout(page_timeout or self.page_timeout)
+                    try:
+                        driver.get(url)
+                    except TimeoutException:
+                        # ページ読み込み上限超過: このブラウザは再利用しない
+                        browser.broken = True
+                        with self._lock:
+                            self._stats.page_timeouts += 1
+                        raise
+                    started = time.monotonic()
+                    ready = True
+                    try:
+                        WebDriverWait(driver, timeout, poll_frequency=0.2).until(all_conditions_met(conditions))
+                    except TimeoutException:
+                        ready = False
+                    elapsed = time.monotonic() - started
+                    html = driver.page_source
+                    browser.pages += 1
+                    with self._lock:
+                        self._stats.pages_rendered += 1
+                    return html, elapsed, ready
+            except WebDriverException as e:
+                last_error = e
+                if not _is_crash(e):
+                    raise
+                with self._lock:
+                    self._stats.crashes += 1
+                self.logger.warning(f"Browser crashed on {url} (attempt {attempt + 1}/{max_attempts}): {e}")
+        raise last_error
+
+    def reap_orphans(self) -> int:
+        """終了済みプロセスが起動したまま残ったブラウザ・chromedriverを回収"""
+        my_pid = os.getpid()
+        with self._lock:
+            tracked = set()
+            for browser in self._live.values():
+                tracked.update(browser.pids)
+
+        killed = 0
+        for pid in _all_pids():
+            if pid in tracked:
+                continue
+            owner = _owner_of(pid)
+            if owner is None or not owner.isdigit():
+                continue
+            owner_pid = int(owner)
+            if owner_pid != my_pid and not _pid_alive(owner_pid) and _kill(pid):
+                killed += 1
+
+        if killed:
+            self.logger.warning(f"Reaped {killed} orphaned browser processes")
+            with self._lock:
+                self._stats.reaped_processes += killed
+        return killed
+
+    def stats(self) -> Dict[str, int]:
+        """監視カウンターを取得"""
+        with self._lock:
+            browsers = list(self._live.values())
+            stats = BrowserStats(**asdict(self._stats))
+        stats.live_browsers = len(browsers)
+        stats.rss_bytes = sum(browser.rss() for browser in browsers)
+        return asdict(stats)
+
+    def shutdown(self):
+        """全ブラウザを終了"""
+        with self._lock:
+            browsers = list(self._live.values())
+            self._idle.clear()
+        for browser in browsers:
+            self._discard(browser)
+
+
+_supervisor: Optional[BrowserSupervisor] = None
+_supervisor_lock = threading.Lock()
+
+
+def get_browser_supervisor() -> BrowserSupervisor:
+    """プロセス共有のスーパーバイザーを取得"""
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = BrowserSupervisor()
+        return _supervisor
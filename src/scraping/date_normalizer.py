@@ -0,0 +1,135 @@
+"""
+日付・時刻の正規化（コンパイル済みパターン、取得日からの年の推定、生文字列単位のキャッシュ）
+"""
+from datetime import date
+from functools import lru_cache
+from typing import Optional, Tuple
+import re
+
+# 年を含む形式（先に試す）
+_FULL_DATE_PATTERNS = [
+    re.compile(r"(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})"),  # YYYY-MM-DD, YYYY/MM/DD, YYYY.MM.DD
+    re.compile(r"(\d{4})年\s*(\d{1,2})月\s*(\d{1,2})日"),  # YYYY年MM月DD日
+]
+
+# 年を含まない形式（先頭から順に試す）
+_MONTH_DAY_PATTERNS = [
+    re.compile(r"(\d{1,2})/(\d{1,2})"),  # MM/DD
+    re.compile(r"(\d{1,2})月\s*(\d{1,2})日"),  # MM月DD日
+    re.compile(r"(\d{1,2})\.(\d{1,2})"),  # MM.DD
+]
+
+# HH:MM, HH：MM, HH時MM分（深夜上映の24時以降も許容）
+_TIME_PATTERN = re.compile(r"(\d{1,2})\s*[:：時]\s*(\d{2})")
+
+_TRANSLATE = str.maketrans("０１２３４５６７８９／：．", "0123456789/:.")
+
+
+def _is_valid(year: int, month: int, day: int) -> bool:
+    try:
+        date(year, month, day)
+        return True
+    except ValueError:
+        return False
+
+
+@lru_cache(maxsize=4096)
+def parse_date_parts(text: str) -> Optional[Tuple[Optional[int], int, int]]:
+    """日付文字列を（年 or None, 月, 日）に分解（変換できなければNone）"""
+    if not text:
+        return None
+    text = text.translate(_TRANSLATE)
+    for pattern in _FULL_DATE_PATTERNS:
+        for match in pattern.finditer(text):
+            year, month, day = (int(group) for group in match.groups())
+            if _is_valid(year, month, day):
+                return year, month, day
+    for pattern in _MONTH_DAY_PATTERNS:
+        for match in pattern.finditer(text):
+            month, day = (int(group) for group in match.groups())
+            if 1 <= month <= 12 and 1 <= day <= 31:
+                return None, month, day
+    return None
+
+
+@lru_cache(maxsize=4096)
+def time_to_minutes(text: str) -> Optional[int]:
+    """時刻文字列を0時からの分に変換（"10:40～" → 640、変換できなければNone）"""
+    if not text:
+        return None
+    match = _TIME_PATTERN.search(text.translate(_TRANSLATE))
+    if not match:
+        return None
+    hours, minutes = int(match.group(1)), int(match.group(2))
+    if hours > 29 or minutes > 59:
+        return None
+    return hours * 60 + minutes
+
+
+def minutes_to_time(minutes: int) -> str:
+    """0時からの分を"H:MM"に変換"""
+    return f"{minutes // 60}:{minutes % 60:02d}"
+
+
+def infer_year(month: int, day: int, reference: date) -> Optional[date]:
+    """年のない日付を取得日に最も近い年の日付にする（12月に取得した1月の日付は翌年など）"""
+    candidates = [
+        date(year, month, day)
+        for year in (reference.year - 1, reference.year, reference.year + 1)
+        if _is_valid(year, month, day)
+    ]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda candidate: (abs((candidate - reference).days), -candidate.toordinal()))
+
+
+class DateNormalizer:
+    """スクレイピング結果の日付・時刻を正規化する
+
+    Args:
+        reference: 年の推定に使う取得日（省略時は変換時点の今日）
+    """
+
+    def __init__(self, reference: Optional[date] = None):
+        self._reference = reference
+
+    @property
+    def reference(self) -> date:
+        return self._reference or date.today()
+
+    def to_date(self, text: str) -> Optional[date]:
+        """日付文字列をdateに変換（変換できなければNone）"""
+        parts = parse_date_parts(text)
+        if parts is None:
+            return None
+        year, month, day = parts
+        if year is not None:
+            return date(year, month, day)
+        return infer_year(month, day, self.reference)
+
+    def from_month_day(self, month, day) -> Optional[date]:
+        """月・日（文字列も可）から年を推定してdateにする"""
+        try:
+            return infer_year(int(month), int(day), self.reference)
+        except (TypeError, ValueError):
+            return None
+
+    def format_date(self, text: str) -> Optional[str]:
+        """日付文字列をYYYY-MM-DDに変換（変換できなければNone）"""
+        value = self.to_date(text)
+        return value.isoformat() if value else None
+
+    def format_month_day(self, month, day) -> Optional[str]:
+        """月・日をYYYY-MM-DDに変換（変換できなければNone）"""
+        value = self.from_month_day(month, day)
+        return value.isoformat() if value else None
+
+
+def parse_iso_date(text: Optional[str]) -> Optional[date]:
+    """YYYY-MM-DD（保存済みデータの形式）をdateに変換（変換できなければNone）"""
+    if not text:
+        return None
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        return None
@@ -0,0 +1,47 @@
+"""
+スクレイピング実行の期限管理とキャンセル
+"""
+import math
+import threading
+import time
+from typing import Optional
+
+
+class Deadline:
+    """実行期限（親の期限・キャンセルを引き継ぐ）"""
+
+    def __init__(self, seconds: Optional[float] = None, parent: Optional["Deadline"] = None):
+        self.parent = parent
+        self.expires_at = time.monotonic() + seconds if seconds is not None else math.inf
+        if parent is not None:
+            self.expires_at = min(self.expires_at, parent.expires_at)
+        self._cancelled = threading.Event()
+
+    def child(self, seconds: Optional[float]) -> "Deadline":
+        """この期限内に収まる子期限を作成"""
+        return Deadline(seconds, parent=self)
+
+    def cancel(self):
+        """キャンセル"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """キャンセル済みか（親のキャンセルを含む）"""
+        if self._cancelled.is_set():
+            return True
+        return self.parent.cancelled if self.parent is not None else False
+
+    def remaining(self) -> float:
+        """残り秒数（期限なしはinf）"""
+        if self.cancelled:
+            return 0.0
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """期限切れ・キャンセル済みか"""
+        return self.remaining() <= 0
+
+    def clip(self, timeout: float) -> float:
+        """タイムアウト値を残り時間以内に丸める"""
+        return min(timeout, self.remaining())
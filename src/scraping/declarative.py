@@ -0,0 +1,333 @@
+"""
+宣言的な抽出定義（config/extractors/*.json）と抽出処理へのコンパイル
+
+定義は読み込み時に1回だけコンパイルし、CSSセレクタはsoupsieve、
+正規表現はreのコンパイル済みオブジェクトとして保持する。
+"""
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+from .base_scraper import BaseScraper, PageRequest
+from .models import MovieInfo, ShowtimeInfo, MovieSchedule, TheaterInfo
+from .readiness import ReadinessCondition
+from .selector_memo import SelectorMemo
+from .labeled_fields import LabeledFieldExtractor
+from .date_normalizer import DateNormalizer
+
+DEFAULT_SPEC_DIR = Path(__file__).resolve().parents[2] / "config" / "extractors"
+
+_MOVIE_FIELDS = ("title", "title_en", "director", "cast", "genre", "duration", "rating", "synopsis", "poster_url")
+_THEATER_FIELDS = ("address", "phone", "access", "screens")
+
+
+class CompiledSelector:
+    """コンパイル済みセレクタ
+
+    文字列は1つのセレクタ（カンマ区切りは文書順で最初の一致）、
+    リストは先頭のセレクタから順に試す優先順位付きの候補として扱う。
+    """
+
+    def __init__(self, spec: Union[str, List[str]]):
+        self.sources = [spec] if isinstance(spec, str) else list(spec)
+        self.patterns = [soupsieve.compile(pattern) for pattern in self.sources]
+
+    def first(self, element) -> Optional[Any]:
+        """最初に一致した要素"""
+        for pattern in self.patterns:
+            found = pattern.select_one(element)
+            if found is not None:
+                return found
+        return None
+
+    def all(self, element) -> List[Any]:
+        """最初に一致したセレクタの全要素"""
+        for pattern in self.patterns:
+            found = pattern.select(element)
+            if found:
+                return found
+        return []
+
+    def union(self, element) -> List[Any]:
+        """全セレクタの一致要素（セレクタ順）"""
+        results = []
+        for pattern in self.patterns:
+            results.extend(pattern.select(element))
+        return results
+
+
+class CompiledField:
+    """1項目の抽出定義
+
+    指定できるキー:
+        value: 固定値
+        selector: 対象要素（省略時は要素全体のテキスト）
+        attr: 属性値を使う（属性がない要素はテキスト）
+        all: 一致した全要素のテキストをリストで返す
+        label: 「ラベル：値」形式の値を取り出す
+        regex / group: 正規表現の一致部分を取り出す
+        strip_prefix: 先頭の文字列を除去
+        normalize: 空白を1つにまとめる
+        url: 相対URLを絶対URLにする
+        split: 区切り文字でリストに分割
+        type: "int" で整数に変換
+        format: "date" で日付をYYYY-MM-DDに変換（変換できなければNone）
+    """
+
+    def __init__(self, spec: Union[str, Dict[str, Any]]):
+        if isinstance(spec, str):
+            spec = {"selector": spec}
+        self.has_value = "value" in spec
+        self.value = spec.get("value")
+        self.selector = CompiledSelector(spec["selector"]) if "selector" in spec else None
+        self.attr = spec.get("attr")
+        self.all = spec.get("all", False)
+        self.label = spec.get("label")
+        self.labels = LabeledFieldExtractor({self.label: [self.label]}) if self.label else None
+        self.regex = re.compile(spec["regex"]) if "regex" in spec else None
+        self.group = spec.get("group", 1)
+        self.strip_prefix = spec.get("strip_prefix")
+        self.normalize = spec.get("normalize", False)
+        self.url = spec.get("url", False)
+        self.split = spec.get("split")
+        self.type = spec.get("type")
+        self.format = spec.get("format")
+
+    @property
+    def uses_element_text(self) -> bool:
+        """要素全体のテキストから取り出す項目か"""
+        return not self.has_value and self.selector is None and not self.attr
+
+    def extract(self, element, base_url: str = "", text: Optional[str] = None,
+                labeled: Optional[Dict[str, str]] = None, dates: Optional[DateNormalizer] = None) -> Any:
+        """要素から値を取り出す（見つからなければNone）
+
+        text: 要素全体のテキスト（生成済みなら再利用）
+        labeled: ラベル→値（複数項目のラベルをまとめて抽出済みの場合）
+        dates: format="date" の変換に使う正規化（スクレイパーの取得日基準。省略時は今日基準）
+        """
+        if self.has_value:
+            return self.value
+        if self.uses_element_text and not self.all:
+            if text is None:
+                text = element.get_text()
+            return self._convert(text, base_url, labeled, dates)
+
+        if self.all:
+            nodes = self.selector.all(element) if self.selector else [element]
+            values = [self._convert(node.get_text().strip(), base_url, dates=dates) for node in nodes]
+            return [value for value in values if value]
+
+        node = self.selector.first(element) if self.selector else element
+        if node is None:
+            return None
+        text = node.get(self.attr) if self.attr else None
+        if text is None:
+            text = node.get_text()
+        return self._convert(text, base_url, dates=dates)
+
+    def _convert(self, text: str, base_url: str, labeled: Optional[Dict[str, str]] = None,
+                 dates: Optional[DateNormalizer] = None) -> Any:
+        if self.label:
+            if labeled is None:
+                labeled = self.labels.extract(text)
+            text = labeled.get(self.label)
+            if text is None:
+                return None
+        if self.regex:
+            match = self.regex.search(text)
+            if not match:
+                return None
+            text = match.group(self.group)
+        text = " ".join(text.split()) if self.normalize else text.strip()
+        if self.strip_prefix and text.startswith(self.strip_prefix):
+            text = text[len(self.strip_prefix):].strip()
+        if not text:
+            return None
+        if self.url and not text.startswith("http"):
+            text = f"https:{text}" if text.startswith("//") else f"{base_url}{text}"
+        if self.format == "date":
+            text = (dates or DateNormalizer()).format_date(text)
+            if text is None:
+                return None
+        if self.split:
+            return [part.strip() for part in text.split(self.split) if part.strip()]
+        if self.type == "int":
+            try:
+                return int(text)
+            except ValueError:
+                return None
+        return text
+
+
+class CompiledItems:
+    """繰り返し要素の定義
+
+    mode: "union" は全セレクタの一致要素、"first" は最初に一致したセレクタの要素
+    （"first" はサイトごとに前回一致したセレクタから試す）。
+    fallback: 一致がない場合に、見出し等の親要素のうちcontains_anyの語を含むものを使う。
+    """
+
+    def __init__(self, spec: Union[str, List[str], Dict[str, Any]]):
+        if not isinstance(spec, dict):
+            spec = {"selector": spec}
+        self.selector = CompiledSelector(spec["selector"])
+        self.mode = spec.get("mode", "union")
+        fallback = spec.get("fallback")
+        self.fallback = CompiledSelector(fallback["selector"]) if fallback else None
+        self.fallback_parent = fallback.get("parent", False) if fallback else False
+        self.contains_any = fallback.get("contains_any", []) if fallback else []
+
+    def select(self, soup, memo: Optional[SelectorMemo] = None, slot: str = "") -> List[Any]:
+        """対象要素一覧"""
+        if self.mode == "union":
+            elements = self.selector.union(soup)
+        elif memo is not None:
+            elements = memo.select(slot, soup, self.selector.sources)
+        else:
+            elements = self.selector.all(soup)
+        if elements or self.fallback is None:
+            return elements
+
+        for element in self.fallback.union(soup):
+            target = element.parent if self.fallback_parent else element
+            if target is None:
+                continue
+            text = target.get_text().lower()
+            if not self.contains_any or any(word in text for word in self.contains_any):
+                elements.append(target)
+        return elements
+
+
+class MovieExtractor:
+    """映画情報抽出（コンパイル済み）"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.items = CompiledItems(spec["items"])
+        self.fields = {name: CompiledField(field) for name, field in spec["fields"].items()}
+        unknown = set(self.fields) - set(_MOVIE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown movie fields: {sorted(unknown)}")
+        # 要素全体のテキストを使う項目はテキスト生成とラベル走査を1回にまとめる
+        self._text_fields = [field for field in self.fields.values() if field.uses_element_text and not field.all]
+        labels = sorted({field.label for field in self._text_fields if field.label})
+        self.labels = LabeledFieldExtractor({label: [label] for label in labels}) if labels else None
+
+    def extract(self, soup, base_url: str, memo: Optional[SelectorMemo] = None,
+                dates: Optional[DateNormalizer] = None) -> Iterator[MovieInfo]:
+        for element in self.items.select(soup, memo, "movie_items"):
+            text = element.get_text() if self._text_fields else None
+            labeled = self.labels.extract(text) if self.labels else None
+            values = {name: field.extract(element, base_url, text, labeled, dates) for name, field in self.fields.items()}
+            if values.get("title"):
+                yield MovieInfo(**values)
+
+
+class ScheduleExtractor:
+    """スケジュール情報抽出（コンパイル済み）"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.items = CompiledItems(spec["items"])
+        self.title = CompiledField(spec["title"])
+        self.rows = CompiledSelector(spec["rows"]) if "rows" in spec else None
+        self.date = CompiledField(spec["date"])
+        self.times = CompiledField(dict(spec["times"], all=True))
+        self.screen = CompiledField(spec.get("screen", {"value": None}))
+
+    def extract(self, soup, theater_name: str, memo: Optional[SelectorMemo] = None,
+                dates: Optional[DateNormalizer] = None) -> Iterator[MovieSchedule]:
+        for element in self.items.select(soup, memo, "schedule_items"):
+            movie_title = self.title.extract(element, dates=dates)
+            if not movie_title:
+                continue
+            rows = self.rows.all(element) if self.rows else [element]
+            showtimes = []
+            for row in rows:
+                date = self.date.extract(row, dates=dates)
+                times = self.times.extract(row, dates=dates)
+                if date and times:
+                    screen = self.screen.extract(row, dates=dates)
+                    showtimes.append(ShowtimeInfo(date=date, times=times, screen=screen))
+            if showtimes:
+                yield MovieSchedule(theater_name=theater_name, movie_title=movie_title, showtimes=showtimes)
+
+
+class DeclarativeScraper(BaseScraper):
+    """抽出定義ファイルから動作するスクレイパー
+
+    定義ファイルの項目:
+        pages: {"movies": [...], "schedules": [...]}  取得ページ（path, label, render, fallback_render）
+        readiness: {パスのプレフィックス: [準備完了条件, ...]}
+        theater: {"info": 固定値, "page": 取得ページ, "fields": ページから取り出す項目}
+        movies: {"items": 繰り返し要素, "fields": {MovieInfoの項目: 抽出定義}}
+        schedules: {"items", "title", "rows", "date", "times", "screen"}
+    """
+
+    def __init__(self, theater_name: str, base_url: str, spec: Dict[str, Any]):
+        super().__init__(theater_name=theater_name, base_url=base_url)
+        self.spec = spec
+        self.readiness_conditions = {
+            prefix: [ReadinessCondition(**condition) for condition in conditions]
+            for prefix, conditions in spec.get("readiness", {}).items()
+        }
+        pages = spec.get("pages", {})
+        self._movie_pages = [self._page(page) for page in pages.get("movies", [])]
+        self._schedule_pages = [self._page(page) for page in pages.get("schedules", [])]
+
+        theater = spec.get("theater", {})
+        self._theater_defaults = {key: theater.get("info", {}).get(key) for key in _THEATER_FIELDS}
+        self._theater_page = self._page(theater["page"]) if "page" in theater else None
+        self._theater_fields = {name: CompiledField(field) for name, field in theater.get("fields", {}).items()}
+
+        self._movies = MovieExtractor(spec["movies"]) if "movies" in spec else None
+        self._schedules = ScheduleExtractor(spec["schedules"]) if "schedules" in spec else None
+
+    @classmethod
+    def from_file(cls, theater_name: str, base_url: str, path: Union[str, Path]) -> "DeclarativeScraper":
+        """定義ファイルから生成（相対パスは config/extractors/ 基準）"""
+        path = Path(path)
+        if not path.is_absolute():
+            path = DEFAULT_SPEC_DIR / path
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(theater_name, base_url, json.load(f))
+
+    def _page(self, spec: Dict[str, Any]) -> PageRequest:
+        return PageRequest(
+            url=f"{self.base_url}{spec.get('path', '')}",
+            label=spec.get("label", "main"),
+            render=spec.get("render", False),
+            fallback_render=spec.get("fallback_render", False)
+        )
+
+    def get_theater_info(self) -> TheaterInfo:
+        """映画館情報取得（取得できない項目は定義ファイルの固定値）"""
+        values = dict(self._theater_defaults)
+        if self._theater_page is not None and self._theater_fields:
+            content = self.fetch(self._theater_page)
+            if content:
+                soup = BeautifulSoup(content, 'html.parser')
+                for name, field in self._theater_fields.items():
+                    value = field.extract(soup, self.base_url, dates=self.date_normalizer)
+                    if value:
+                        values[name] = value
+        return TheaterInfo(name=self.theater_name, url=self.base_url, **values)
+
+    def movie_pages(self) -> List[PageRequest]:
+        return list(self._movie_pages)
+
+    def schedule_pages(self) -> List[PageRequest]:
+        return list(self._schedule_pages)
+
+    def extract_movies(self, page: PageRequest, soup: BeautifulSoup) -> Iterator[MovieInfo]:
+        if self._movies is None:
+            return iter(())
+        return self._movies.extract(soup, self.base_url, self.selector_memo, self.date_normalizer)
+
+    def extract_schedules(self, page: PageRequest, soup: BeautifulSoup) -> Iterator[MovieSchedule]:
+        if self._schedules is None:
+            return iter(())
+        return self._schedules.extract(soup, self.theater_name, self.selector_memo, self.date_normalizer)
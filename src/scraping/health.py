@@ -0,0 +1,247 @@
+"""
+映画館別のヘルス管理（サーキットブレーカー・適応タイムアウト）
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, Optional
+
+# サーキット状態
+CLOSED = "closed"  # 通常
+OPEN = "open"  # 遮断中（即失敗）
+
+
+class TheaterHealth:
+    """映画館1館分のヘルス状態
+
+    連続失敗がfailure_thresholdに達すると遮断し、以降のリクエストは即失敗させる。
+    遮断中はバックグラウンドでプローブし、成功した時点で復帰する。
+    on_changeは遮断・復帰・待機延長のときだけ呼ぶ（レイテンシ等は実行の終わりにまとめて保存する）。
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown: float = 300.0,
+                 max_cooldown: float = 3600.0, default_timeout: float = 30.0,
+                 min_timeout: float = 5.0, max_timeout: float = 30.0,
+                 timeout_multiplier: float = 3.0, max_samples: int = 50,
+                 on_change: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_until = 0.0  # 遮断解除予定時刻（UNIX時刻）
+        self.cooldown = cooldown
+        self.latencies: Deque[float] = deque(maxlen=max_samples)
+        self.total_requests = 0
+        self.total_failures = 0
+        self.rejected = 0
+
+        self._probe: Optional[Callable[[], bool]] = None
+        self._probe_timer: Optional[threading.Timer] = None
+        self._on_change = on_change
+        self._lock = threading.RLock()
+
+    def set_probe(self, probe: Callable[[], bool]):
+        """遮断中に使用するプローブ関数を設定"""
+        with self._lock:
+            self._probe = probe
+            if self.state == OPEN:
+                self._schedule_probe()
+
+    def allow_request(self) -> bool:
+        """リクエスト可否"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            self.rejected += 1
+            return False
+
+    def timeout(self) -> float:
+        """観測したレイテンシのp95から算出したタイムアウト"""
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < 5:
+            return self.default_timeout
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return max(self.min_timeout, min(self.max_timeout, p95 * self.timeout_multiplier))
+
+    def record_success(self, latency: float):
+        """成功を記録"""
+        with self._lock:
+            self.total_requests += 1
+            self.latencies.append(round(latency, 3))
+            self.consecutive_failures = 0
+            self.cooldown = self.base_cooldown
+
+    def record_failure(self, error: str = ""):
+        """失敗を記録"""
+        with self._lock:
+            self.total_requests += 1
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            opened = self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            if opened:
+                self._open(error)
+        if opened:
+            self._changed()
+
+    def _open(self, reason: str):
+        """遮断状態へ移行"""
+        self.state = OPEN
+        self.opened_until = time.time() + self.cooldown
+        self.logger.warning(
+            f"Circuit opened for {self.name} after {self.consecutive_failures} failures "
+            f"(retry in {self.cooldown:.0f}s): {reason}"
+        )
+        self._schedule_probe()
+
+    def _close(self):
+        """通常状態へ復帰"""
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.cooldown = self.base_cooldown
+        self.opened_until = 0.0
+        self.logger.info(f"Circuit closed for {self.name}")
+
+    def _schedule_probe(self):
+        """遮断解除予定時刻にプローブを予約"""
+        if self._probe is None or (self._probe_timer and self._probe_timer.is_alive()):
+            return
+        delay = max(0.0, self.opened_until - time.time())
+        self._probe_timer = threading.Timer(delay, self._run_probe)
+        self._probe_timer.daemon = True
+        self._probe_timer.start()
+
+    def _run_probe(self):
+        """バックグラウンドプローブ"""
+        try:
+            healthy = bool(self._probe())
+        except Exception as e:
+            self.logger.debug(f"Probe failed for {self.name}: {e}")
+            healthy = False
+
+        with self._lock:
+            self._probe_timer = None
+            if self.state != OPEN:
+                return
+            if healthy:
+                self._close()
+            else:
+                # 失敗のたびに待機時間を延長
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self.opened_until = time.time() + self.cooldown
+                self._schedule_probe()
+        self._changed()
+
+    def _changed(self):
+        if self._on_change:
+            self._on_change()
+
+    def to_dict(self) -> Dict:
+        """状態を辞書に変換"""
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "opened_until": self.opened_until,
+                "cooldown": self.cooldown,
+                "latencies": list(self.latencies),
+                "total_requests": self.total_requests,
+                "total_failures": self.total_failures,
+                "rejected": self.rejected,
+                "timeout": round(self.timeout(), 2),
+            }
+
+    def restore(self, data: Dict):
+        """保存済み状態を復元"""
+        with self._lock:
+            self.latencies.extend(data.get("latencies", []))
+            self.consecutive_failures = data.get("consecutive_failures", 0)
+            self.cooldown = data.get("cooldown", self.base_cooldown)
+            self.opened_until = data.get("opened_until", 0.0)
+            if data.get("state") == OPEN:
+                if self.opened_until > time.time():
+                    self.state = OPEN
+                else:
+                    # 遮断期間が過ぎていれば最初のリクエストを試行として通す
+                    self.consecutive_failures = self.failure_threshold - 1
+
+
+class HealthRegistry:
+    """映画館別ヘルス状態の管理（logs/に永続化）"""
+
+    def __init__(self, state_path: Optional[str] = "logs/theater_health.json"):
+        self.state_path = Path(state_path) if state_path else None
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._theaters: Dict[str, TheaterHealth] = {}
+        self._saved: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """保存済み状態を読み込み"""
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self._saved = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Failed to load theater health: {e}")
+
+    def save(self):
+        """状態を保存"""
+        if not self.state_path:
+            return
+        with self._lock:
+            theaters = list(self._theaters.items())
+        data = dict(self._saved)
+        data.update({name: health.to_dict() for name, health in theaters})
+        try:
+            with self._save_lock:
+                self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.state_path.with_suffix(".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                tmp_path.replace(self.state_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to save theater health: {e}")
+
+    def get(self, name: str) -> TheaterHealth:
+        """映画館のヘルス状態を取得"""
+        with self._lock:
+            if name not in self._theaters:
+                health = TheaterHealth(name, on_change=self.save)
+                if name in self._saved:
+                    health.restore(self._saved[name])
+                self._theaters[name] = health
+            return self._theaters[name]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """全映画館の状態"""
+        with self._lock:
+            theaters = list(self._theaters.items())
+        return {name: health.to_dict() for name, health in theaters}
+
+
+_registry: Optional[HealthRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_health_registry() -> HealthRegistry:
+    """プロセス共有のヘルスレジストリを取得"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = HealthRegistry()
+        return _registry
@@ -0,0 +1,54 @@
+"""
+「ラベル：値」形式の項目抽出（全ラベルを1つの正規表現で1回走査）
+"""
+import re
+from typing import Dict, Optional, Sequence, Tuple
+
+
+class LabeledFieldExtractor:
+    """テキスト中の「ラベル：値」を項目ごとにまとめて取り出す
+
+    全項目のラベルを1つの正規表現に結合し、テキストを先頭から1回だけ走査する。
+    項目ごとにテキスト中で最初に現れたラベルの値を採用する（別名の宣言順ではない）。
+    値の途中から次のラベルを探し直すため、「監督：A 出演：B」のように
+    1行に複数のラベルがあっても個別に検索した場合と同じ値になる。
+
+    例:
+        LabeledFieldExtractor({"director": ["監督", "Director"], "cast": ["出演"]})
+    """
+
+    def __init__(self, fields: Dict[str, Sequence[str]], value_pattern: str = r"[^\n]*", separators: str = "：:"):
+        self.fields = {name: list(labels) for name, labels in fields.items()}
+        self._field_by_label: Dict[str, str] = {}
+        for name, labels in self.fields.items():
+            for label in labels:
+                self._field_by_label.setdefault(label, name)
+
+        # 同じ位置で一致する場合は長いラベルを優先（「脚本・監督」と「監督」など）
+        labels = sorted(self._field_by_label, key=len, reverse=True)
+        alternation = "|".join(re.escape(label) for label in labels)
+        self.pattern = re.compile(
+            rf"(?P<label>{alternation})[{re.escape(separators)}](?P<value>{value_pattern})"
+        )
+
+    def extract(self, text: Optional[str]) -> Dict[str, str]:
+        """項目名→値（前後の空白を除去、見つからない項目は含まない）"""
+        values: Dict[str, str] = {}
+        if not text or not self._field_by_label:
+            return values
+
+        position = 0
+        while len(values) < len(self.fields):
+            match = self.pattern.search(text, position)
+            if not match:
+                break
+            name = self._field_by_label[match.group("label")]
+            if name not in values:
+                values[name] = match.group("value").strip()
+            position = match.start("value")
+        return values
+
+    def extract_element(self, element) -> Tuple[str, Dict[str, str]]:
+        """要素のテキスト（1回だけ生成）と項目の値"""
+        text = element.get_text() if element is not None else ""
+        return text, self.extract(text)
@@ -0,0 +1,107 @@
+"""
+テキスト行の分類（除外語・日付・時刻・タイトル判定をコンパイル済み正規表現で行う）
+
+ページ全体のテキストを行単位で解析するスクレイパー向け。
+除外語のリストは1つの正規表現にまとめ、行ごとに1回の検索で判定する。
+"""
+import re
+from typing import Iterable, Optional, Pattern, Sequence, Tuple
+
+DATE = "date"
+TIME = "time"
+TITLE = "title"
+OTHER = "other"
+
+
+def compile_keywords(words: Iterable[str]) -> Optional[Pattern]:
+    """語のいずれかを含むかを1回の検索で判定する正規表現（語がなければNone）
+
+    1文字の語は文字クラス、それ以外は長い順の選択肢にまとめる。
+    """
+    words = set(words)
+    chars = sorted(word for word in words if len(word) == 1)
+    longer = sorted((word for word in words if len(word) > 1), key=lambda word: (-len(word), word))
+    parts = [re.escape(word) for word in longer]
+    if chars:
+        parts.append("[" + "".join(re.escape(char) for char in chars) + "]")
+    return re.compile("|".join(parts)) if parts else None
+
+
+class LineClassifier:
+    """テキスト1行を日付・タイトル・時刻・その他に分類する
+
+    Args:
+        skip_words: 含まれていればタイトルではない語
+        reject_patterns: 行頭が一致すればタイトルではない正規表現
+        title_markers: タイトルとみなすために含むべき語（空なら条件なし）
+        title_patterns: タイトルとみなす正規表現（title_markersといずれか一致でよい）
+        non_ascii_ratio: 非ASCII文字の割合がこれを超えればタイトルとみなす
+        min_length / max_length: タイトルの文字数（min_length < 長さ < max_length）
+        date_pattern: 行頭が一致すれば日付の行
+        time_pattern: 行頭が一致すれば時刻の行（タイトル判定より後）
+    """
+
+    def __init__(
+        self,
+        skip_words: Sequence[str] = (),
+        reject_patterns: Sequence[str] = (),
+        title_markers: Sequence[str] = (),
+        title_patterns: Sequence[str] = (),
+        non_ascii_ratio: Optional[float] = None,
+        min_length: int = 0,
+        max_length: Optional[int] = None,
+        date_pattern: Optional[str] = None,
+        time_pattern: Optional[str] = None,
+    ):
+        self.min_length = min_length
+        self.max_length = max_length
+        self.non_ascii_ratio = non_ascii_ratio
+
+        # 除外語（行内のどこか）と除外パターン（行頭）を1つの検索にまとめる
+        rejects = [f"^(?:{pattern})" for pattern in reject_patterns]
+        keywords = compile_keywords(skip_words)
+        if keywords is not None:
+            rejects.append(keywords.pattern)
+        self._reject = re.compile("|".join(rejects)) if rejects else None
+
+        requires = [pattern.pattern for pattern in [compile_keywords(title_markers)] if pattern is not None]
+        requires.extend(title_patterns)
+        self._require = re.compile("|".join(f"(?:{pattern})" for pattern in requires)) if requires else None
+
+        markers = []
+        if date_pattern:
+            markers.append(f"(?P<{DATE}>{date_pattern})")
+        if time_pattern:
+            markers.append(f"(?P<{TIME}>{time_pattern})")
+        self._marker = re.compile("|".join(markers)) if markers else None
+
+    def is_title(self, line: str) -> bool:
+        """タイトルらしい行か（前後の空白は除去済みであること）"""
+        length = len(line)
+        if length <= self.min_length or (self.max_length is not None and length >= self.max_length):
+            return False
+        if line.isdigit():
+            return False
+        if self._reject is not None and self._reject.search(line):
+            return False
+        if self._require is None and self.non_ascii_ratio is None:
+            return True
+        if self._require is not None and self._require.search(line):
+            return True
+        if self.non_ascii_ratio is not None:
+            return sum(1 for char in line if ord(char) > 127) > length * self.non_ascii_ratio
+        return False
+
+    def classify(self, line: str) -> Tuple[str, Optional[re.Match]]:
+        """行の種別と日付・時刻の一致結果（前後の空白は除去済みであること）
+
+        判定順: 日付 → タイトル → 時刻 → その他
+        """
+        match = self._marker.match(line) if self._marker is not None and line else None
+        if match and match.groupdict().get(DATE) is not None:
+            return DATE, match
+        if line and self.is_title(line):
+            return TITLE, None
+        if match and match.groupdict().get(TIME) is not None:
+            return TIME, match
+        return OTHER, None
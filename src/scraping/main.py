@@ -2,41 +2,63 @@
 """
 映画館スクレイピングシステム - メイン実行ファイル
 """
+import asyncio
 import json
 import logging
+import math
 import sys
-from typing import List, Dict, Any
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, List, Dict, Any, Optional, Set
 from datetime import datetime
 from pathlib import Path
 
-# スクレイパークラスのインポート
-from .scrapers.ks_cinema_scraper import KsCinemaScraper
-from .scrapers.pole_pole_scraper import PolePoleHigashinakanoScraper
-from .scrapers.eurospace_scraper import EurospaceScraper
-from .scrapers.shimotakaido_scraper import ShimotakaidoCinemaScraper
-from .scrapers.waseda_shochiku_scraper import WasedaShochikuScraper
-from .scrapers.shinjuku_musashino_scraper import ShinjukuMusashinoScraper
-from .models import TheaterData
+from .models import TheaterData, TheaterInfo, MovieInfo, MovieSchedule
+from .base_scraper import MOVIES, SCHEDULES, merge_schedule_records
+from .result_writer import TheaterResultWriter, write_combined
+from .deadline import Deadline
+from .registry import ScraperRegistry
+from .pipeline import ParsePipeline
+from .showtime_codec import encode_showtime_dicts
+from .snapshot_catalog import get_snapshot_catalog
+from .snapshot_files import COMBINED_KEY
+from .page_archive import get_page_archive
+from .title_dictionary import set_snapshot_dir
 
 class TheaterScrapingOrchestrator:
     """映画館スクレイピング統合管理クラス"""
     
+    # 実行期限到達後、打ち切った映画館の部分結果を待つ猶予
+    CANCEL_GRACE_SECONDS = 10
+    
+    # キャンセル後、打ち切った映画館のスレッドが抜けるのを待つ時間
+    CANCEL_JOIN_SECONDS = 30
+    
     def __init__(self, output_dir: str = "output"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
+        # 直近の全映画館実行の情報（期限・打ち切り映画館）
+        self.last_run_info: Dict[str, Any] = {}
+        
+        # キャンセル後も終わっていない映画館のスレッド（次の実行の前に待つ）
+        self._stragglers: Set[Future] = set()
+        
+        # レコード到着時の通知先 (theater_key, 種別, レコード辞書)
+        self._record_listeners: List[Callable[[str, str, Dict[str, Any]], None]] = []
+        
         # ログ設定
         self.setup_logging()
         
-        # スクレイパーの初期化
-        self.scrapers = {
-            "ks_cinema": KsCinemaScraper(),
-            "pole_pole": PolePoleHigashinakanoScraper(),
-            "eurospace": EurospaceScraper(),
-            "shimotakaido": ShimotakaidoCinemaScraper(),
-            "waseda_shochiku": WasedaShochikuScraper(),
-            "shinjuku_musashino": ShinjukuMusashinoScraper()
-        }
+        # スクレイパー（初めて使う時点で読み込み・生成する）
+        self.scrapers = ScraperRegistry()
+        
+        # 保存した結果ファイルの目録（output/catalog.json）
+        self.catalog = get_snapshot_catalog(str(self.output_dir))
+        
+        # 既知タイトル辞書もこの出力先の結果から作る
+        set_snapshot_dir(str(self.output_dir))
         
     def setup_logging(self):
         """ログ設定"""
@@ -53,116 +75,296 @@ class TheaterScrapingOrchestrator:
         
         self.logger = logging.getLogger(__name__)
         
-    def scrape_theater(self, theater_key: str) -> Dict[str, Any]:
-        """個別映画館のスクレイピング実行"""
+    def scrape_theater(self, theater_key: str, deadline: Optional[Deadline] = None,
+                       pipeline: Optional[ParsePipeline] = None) -> Dict[str, Any]:
+        """個別映画館のスクレイピング実行
+        
+        映画は見つかった順に、スケジュールは映画ごとに統合してから一時ファイルへ書き出し、
+        結果ファイルの保存が確定した後で登録済みの通知先へ渡す。レコードはメモリに溜めない
+        （例外として、統合待ちのスケジュールは全ページを読み終えるまで merge_schedule_records が
+        重複を除いた上映回を保持する。上限は SCHEDULE_MERGE_MAX_GROUPS）。
+        戻り値は保存先（file）・件数（counts）・内容ハッシュ・取得日時・状態のみ
+        （映画・スケジュールは snapshot_files.load_result で結果ファイルから読む）。
+        期限に達した場合はそれまでに取得できたデータを status="partial" として保存する。
+        期限がキャンセルされた場合・失敗した場合は何も保存・通知せずに空の結果を返す。
+        pipelineを指定すると、ページの解析をパイプラインの解析プロセスで行う。
+        """
         if theater_key not in self.scrapers:
             self.logger.error(f"Unknown theater: {theater_key}")
             return {}
             
         scraper = self.scrapers[theater_key]
         self.logger.info(f"Starting scrape for {scraper.theater_name}")
+        scraper.set_deadline(deadline)
         
+        writer = TheaterResultWriter(self._theater_data_path(theater_key))
         try:
-            # 全データ取得
-            theater_data = scraper.scrape_all()
+            theater_info = scraper.get_theater_info()
+            records = pipeline.iter_records(scraper) if pipeline else scraper.iter_records()
             
-            # データをJSON形式に変換
-            result = self._theater_data_to_dict(theater_data)
+            # 届いたレコードから順に一時ファイルへ書き出す（スケジュールは統合後）
+            records = merge_schedule_records(records)
+            result = {"theater_info": self._theater_info_to_dict(theater_info)}
+            for kind, record in records:
+                if deadline is not None and deadline.cancelled:
+                    break
+                record_dict = self._movie_to_dict(record) if kind == MOVIES else self._schedule_to_dict(record)
+                writer.write(kind, record_dict)
+                
+            # 実行全体がキャンセルされた後は保存・目録への追加をしない（結果は呼び出し元で破棄済み）
+            if deadline is not None and deadline.cancelled:
+                writer.abort()
+                self.logger.warning(f"Discarded {theater_key}: run was cancelled")
+                return {}
+                
+            result["scraped_at"] = datetime.now().isoformat()
+            result["status"] = "partial" if scraper.cut_off else "complete"
             
-            # ファイルに保存
-            self._save_theater_data(theater_key, result)
+            # ファイルに保存し、確定後に通知
+            filepath = writer.finish(
+                {"theater_info": result["theater_info"]},
+                {"scraped_at": result["scraped_at"], "status": result["status"]},
+                on_record=lambda kind, record: self._notify_record(theater_key, kind, record)
+            )
+            self.logger.info(f"Saved {theater_key} data to {filepath}")
+            result.update(file=str(filepath), counts=dict(writer.counts), content_hash=writer.content_hash)
+            self.catalog.add(filepath, result, key=theater_key)
             
-            self.logger.info(f"Successfully scraped {scraper.theater_name}")
+            if scraper.cut_off:
+                self.logger.warning(f"Scrape of {scraper.theater_name} was cut off by deadline (partial result saved)")
+            else:
+                self.logger.info(f"Successfully scraped {scraper.theater_name}")
             return result
             
         except Exception as e:
+            writer.abort()
             self.logger.error(f"Error scraping {scraper.theater_name}: {e}")
             return {}
+        finally:
+            scraper.set_deadline(None)
+            from .selector_memo import get_selector_memo_registry
+            get_selector_memo_registry().save()
+            from .readiness import get_load_time_tracker
+            get_load_time_tracker().save()
+            from .health import get_health_registry
+            get_health_registry().save()
             
-    def scrape_all_theaters(self) -> Dict[str, Dict[str, Any]]:
-        """全映画館のスクレイピング実行"""
-        all_results = {}
+    def reprocess_theater(self, theater_key: str, at: Optional[datetime] = None) -> Dict[str, Any]:
+        """保存済みのページ本文から抽出をやり直す（通信・保存・通知はしない）
+        
+        at指定時はその時点までに取得したページを使う。保存済みの本文がないページがあれば
+        status="partial" とする。取得日時は使ったページのうち最新の取得日時。
+        """
+        archive = get_page_archive()
+        if archive is None:
+            self.logger.error("Page archive is disabled")
+            return {}
+        if theater_key not in self.scrapers:
+            self.logger.error(f"Unknown theater: {theater_key}")
+            return {}
+            
+        scraper = self.scrapers[theater_key]
+        scraper.set_replay(archive, at)
+        try:
+            theater_info = scraper.get_theater_info()
+            result = {"theater_info": self._theater_info_to_dict(theater_info), "movies": [], "schedules": []}
+            for kind, record in merge_schedule_records(scraper.iter_records()):
+                record_dict = self._movie_to_dict(record) if kind == MOVIES else self._schedule_to_dict(record)
+                result[kind].append(record_dict)
+                
+            pages = archive.snapshot(scraper.archive_key, at)
+            fetched = [pages[url].fetched_at for url in pages]
+            result["scraped_at"] = max(fetched) if fetched else None
+            result["status"] = "partial" if scraper.replay_missing else "complete"
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"Error reprocessing {theater_key}: {e}")
+            return {}
+        finally:
+            scraper.set_replay(None)
+            
+    def add_record_listener(self, listener: Callable[[str, str, Dict[str, Any]], None]):
+        """映画・スケジュール1件ごとに呼ばれる通知先を登録
+        
+        listener(theater_key, 種別("movies"/"schedules"), レコード辞書) の形で、
+        映画館1館分の結果ファイルの保存が確定した後に、スクレイピングのスレッドから呼ばれる
+        （キャンセル・失敗した映画館のレコードは渡さない）。
+        """
+        self._record_listeners.append(listener)
+        
+    def _notify_record(self, theater_key: str, kind: str, record: Dict[str, Any]):
+        """レコード到着を通知（通知先の例外はスクレイピングに影響させない）"""
+        for listener in self._record_listeners:
+            try:
+                listener(theater_key, kind, record)
+            except Exception as e:
+                self.logger.warning(f"Record listener failed: {e}")
+            
+    def scrape_all_theaters(self, max_workers: int = 4,
+                            deadline_seconds: Optional[float] = None,
+                            parse_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """全映画館のスクレイピング実行
         
+        映画館ごとのスレッドでページを取得し、解析はプロセスプールで並列に行う
+        （parse_workers=0 の場合は取得スレッド内で解析。None はCPUコア数）。
+        同一サイトへのアクセス間隔はホスト別のレート制御で保つ。
+        deadline_secondsを指定すると、残り時間を未着手の映画館に均等に割り当て、
+        割り当てを超えた映画館は打ち切る（取得済み分は保存する）。
+        """
         self.logger.info("Starting scraping for all theaters")
+        self._join_stragglers()
+        started = time.monotonic()
         
-        for theater_key in self.scrapers.keys():
-            self.logger.info(f"Processing {theater_key}...")
-            result = self.scrape_theater(theater_key)
-            all_results[theater_key] = result
+        run_deadline = Deadline(deadline_seconds)
+        theater_keys = list(self.scrapers.keys())
+        pending = [len(theater_keys)]
+        pending_lock = threading.Lock()
+        
+        def run(theater_key: str) -> Dict[str, Any]:
+            # 残り時間 / 残りの実行ラウンド数 をこの映画館の持ち時間とする
+            with pending_lock:
+                rounds = math.ceil(pending[0] / max_workers)
+                pending[0] -= 1
+            slice_seconds = run_deadline.remaining() / rounds if deadline_seconds is not None else None
+            return self._scrape_theater_logged(theater_key, run_deadline.child(slice_seconds), pipeline)
             
-            # 各映画館の処理後に少し待機
-            import time
-            time.sleep(2)
+        pipeline = ParsePipeline(parse_workers, scrapers=self.scrapers).start() if parse_workers != 0 else None
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape")
+        futures = {executor.submit(run, theater_key): theater_key for theater_key in theater_keys}
+        wait_timeout = None if deadline_seconds is None else run_deadline.remaining() + self.CANCEL_GRACE_SECONDS
+        done, not_done = wait(futures, timeout=wait_timeout)
+        
+        # 期限後も終わらない映画館は結果を待たずに打ち切る
+        run_deadline.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        # 打ち切った映画館のスレッドが抜けてから解析プロセスを止める
+        # （待ちきれない場合は、抜けた時点で止める）
+        _, self._stragglers = wait(not_done, timeout=self.CANCEL_JOIN_SECONDS)
+        if self._stragglers:
+            self.logger.warning(f"{len(self._stragglers)} theater threads still running after cancel")
+        if pipeline is not None:
+            self._close_pipeline_after(pipeline, self._stragglers)
+        
+        all_results = {}
+        cancelled = []
+        for future, theater_key in futures.items():
+            if future in done:
+                all_results[theater_key] = future.result()
+            else:
+                self.logger.warning(f"Cancelled {theater_key}: no result within run deadline")
+                all_results[theater_key] = {}
+                cancelled.append(theater_key)
+                
+        self.last_run_info = {
+            "deadline_seconds": deadline_seconds,
+            "elapsed_seconds": round(time.monotonic() - started, 1),
+            "cut_off": [key for key, result in all_results.items() if result.get("status") == "partial"] + cancelled,
+            "cancelled": cancelled
+        }
+        
+        return self._finish_run(all_results)
+        
+    def _join_stragglers(self):
+        """前回の実行で打ち切った映画館のスレッドが抜けるのを待つ（保存処理が次の実行と重ならないように）"""
+        if not self._stragglers:
+            return
+        _, self._stragglers = wait(self._stragglers, timeout=self.CANCEL_JOIN_SECONDS)
+        if self._stragglers:
+            self.logger.warning(f"{len(self._stragglers)} theater threads from the previous run are still running")
+            
+    def _close_pipeline_after(self, pipeline: ParsePipeline, stragglers: Set[Future]):
+        """stragglersが終わってから解析パイプラインを停止"""
+        if not stragglers:
+            pipeline.close()
+            return
             
+        def close():
+            wait(stragglers)
+            pipeline.close()
+            
+        threading.Thread(target=close, name="parse-close", daemon=True).start()
+        
+    async def scrape_all_theaters_async(self, max_workers: int = 4,
+                                        deadline_seconds: Optional[float] = None,
+                                        parse_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """全映画館のスクレイピング実行（イベントループをブロックしない）"""
+        return await asyncio.to_thread(self.scrape_all_theaters, max_workers, deadline_seconds, parse_workers)
+        
+    def _scrape_theater_logged(self, theater_key: str, deadline: Optional[Deadline] = None,
+                               pipeline: Optional[ParsePipeline] = None) -> Dict[str, Any]:
+        """並列実行用の個別スクレイピング"""
+        self.logger.info(f"Processing {theater_key}...")
+        return self.scrape_theater(theater_key, deadline, pipeline)
+        
+    def _finish_run(self, all_results: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """全映画館スクレイピングの後処理"""
         # 統合結果を保存
         self._save_combined_results(all_results)
         
+        # ブラウザプロセスの状況を記録
+        from .browser_supervisor import get_browser_supervisor
+        self.logger.info(f"Browser stats: {get_browser_supervisor().stats()}")
+        
+        if self.last_run_info.get("cut_off"):
+            self.logger.warning(f"Theaters cut off by deadline: {self.last_run_info['cut_off']}")
         self.logger.info("Completed scraping for all theaters")
         return all_results
         
     def _theater_data_to_dict(self, theater_data: TheaterData) -> Dict[str, Any]:
         """TheaterDataオブジェクトを辞書に変換"""
         return {
-            "theater_info": {
-                "name": theater_data.theater_info.name,
-                "url": theater_data.theater_info.url,
-                "address": theater_data.theater_info.address,
-                "phone": theater_data.theater_info.phone,
-                "access": theater_data.theater_info.access,
-                "screens": theater_data.theater_info.screens
-            },
-            "movies": [
-                {
-                    "title": movie.title,
-                    "title_en": movie.title_en,
-                    "director": movie.director,
-                    "cast": movie.cast,
-                    "genre": movie.genre,
-                    "duration": movie.duration,
-                    "rating": movie.rating,
-                    "synopsis": movie.synopsis,
-                    "poster_url": movie.poster_url
-                }
-                for movie in theater_data.movies
-            ],
-            "schedules": [
-                {
-                    "theater_name": schedule.theater_name,
-                    "movie_title": schedule.movie_title,
-                    "showtimes": [
-                        {
-                            "date": showtime.date,
-                            "times": showtime.times,
-                            "screen": showtime.screen,
-                            "ticket_url": showtime.ticket_url
-                        }
-                        for showtime in schedule.showtimes
-                    ]
-                }
-                for schedule in theater_data.schedules
-            ],
+            "theater_info": self._theater_info_to_dict(theater_data.theater_info),
+            "movies": [self._movie_to_dict(movie) for movie in theater_data.movies],
+            "schedules": [self._schedule_to_dict(schedule) for schedule in theater_data.schedules],
             "scraped_at": datetime.now().isoformat()
         }
         
-    def _save_theater_data(self, theater_key: str, data: Dict[str, Any]):
-        """個別映画館データの保存"""
-        filename = f"{theater_key}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = self.output_dir / filename
+    def _theater_info_to_dict(self, theater_info: TheaterInfo) -> Dict[str, Any]:
+        """TheaterInfoを辞書に変換"""
+        return {
+            "name": theater_info.name,
+            "url": theater_info.url,
+            "address": theater_info.address,
+            "phone": theater_info.phone,
+            "access": theater_info.access,
+            "screens": theater_info.screens
+        }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            
-        self.logger.info(f"Saved {theater_key} data to {filepath}")
+    def _movie_to_dict(self, movie: MovieInfo) -> Dict[str, Any]:
+        """MovieInfoを辞書に変換"""
+        return {
+            "title": movie.title,
+            "title_en": movie.title_en,
+            "director": movie.director,
+            "cast": movie.cast,
+            "genre": movie.genre,
+            "duration": movie.duration,
+            "rating": movie.rating,
+            "synopsis": movie.synopsis,
+            "poster_url": movie.poster_url
+        }
+        
+    def _schedule_to_dict(self, schedule: MovieSchedule) -> Dict[str, Any]:
+        """MovieScheduleを辞書に変換（同じ時刻割りが続く上映回は期間にまとめる）"""
+        return {
+            "theater_name": schedule.theater_name,
+            "movie_title": schedule.movie_title,
+            "showtimes": encode_showtime_dicts(schedule.showtimes)
+        }
+        
+    def _theater_data_path(self, theater_key: str) -> Path:
+        """個別映画館データの保存先"""
+        return self.output_dir / f"{theater_key}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
     def _save_combined_results(self, all_results: Dict[str, Dict[str, Any]]):
-        """統合結果の保存"""
+        """統合結果の保存（映画館ごとの結果ファイルを1館ずつ読んでまとめる）"""
         filename = f"all_theaters_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = self.output_dir / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(all_results, f, ensure_ascii=False, indent=2)
+        filepath = write_combined(self.output_dir / filename, all_results)
             
         self.logger.info(f"Saved combined results to {filepath}")
+        self.catalog.add(filepath, all_results, key=COMBINED_KEY)
         
     def generate_summary_report(self, results: Dict[str, Dict[str, Any]]):
         """サマリーレポート生成"""
@@ -174,24 +376,38 @@ class TheaterScrapingOrchestrator:
             }
         }
         
+        cancelled = self.last_run_info.get("cancelled", [])
         for theater_key, data in results.items():
             if data:
                 theater_summary = {
                     "theater_name": data.get("theater_info", {}).get("name", "Unknown"),
-                    "total_movies": len(data.get("movies", [])),
-                    "total_schedules": len(data.get("schedules", [])),
-                    "success": True
+                    "total_movies": data.get("counts", {}).get(MOVIES, 0),
+                    "total_schedules": data.get("counts", {}).get(SCHEDULES, 0),
+                    "success": True,
+                    "status": data.get("status", "complete")
                 }
             else:
                 theater_summary = {
                     "theater_name": theater_key,
                     "total_movies": 0,
                     "total_schedules": 0,
-                    "success": False
+                    "success": False,
+                    "status": "cancelled" if theater_key in cancelled else "failed"
                 }
                 
             report["scraping_summary"]["theaters"][theater_key] = theater_summary
             
+        # 実行期限と打ち切られた映画館
+        report["scraping_summary"]["run"] = self.last_run_info
+        
+        # 映画館別のヘルス状態（遮断状況・タイムアウト）
+        from .health import get_health_registry
+        report["scraping_summary"]["health"] = get_health_registry().snapshot()
+        
+        # サイト別のセレクタ採用状況（前回一致した候補の的中数）
+        from .selector_memo import get_selector_memo_registry
+        report["scraping_summary"]["selector_memo"] = get_selector_memo_registry().snapshot()
+            
         # レポート保存
         filename = f"summary_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         filepath = self.output_dir / filename
@@ -210,6 +426,8 @@ def main():
     parser.add_argument("--theater", type=str, help="特定の映画館のみスクレイピング")
     parser.add_argument("--output", type=str, default="output", help="出力ディレクトリ")
     parser.add_argument("--summary", action="store_true", help="サマリーレポートのみ生成")
+    parser.add_argument("--deadline", type=float, default=None, help="全映画館実行の制限時間（秒）")
+    parser.add_argument("--parse-workers", type=int, default=None, help="解析プロセス数（0で取得スレッド内で解析）")
     
     args = parser.parse_args()
     
@@ -236,7 +454,7 @@ def main():
             print(f"Failed to scrape {args.theater}")
     else:
         # 全映画館
-        results = orchestrator.scrape_all_theaters()
+        results = orchestrator.scrape_all_theaters(deadline_seconds=args.deadline, parse_workers=args.parse_workers)
         summary = orchestrator.generate_summary_report(results)
         
         # 結果表示
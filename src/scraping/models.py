@@ -1,6 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, date as calendar_date
+
+from .date_normalizer import parse_iso_date, time_to_minutes
 
 @dataclass
 class MovieInfo:
@@ -21,15 +23,25 @@ class MovieInfo:
 
 @dataclass
 class ShowtimeInfo:
-    """上映時間情報"""
+    """上映時間情報
+    
+    date_value / minutes は date / times から生成する型付きの値
+    （変換できない日付はNone、変換できない時刻は含めない）。
+    """
     date: str
     times: List[str]
     screen: Optional[str] = None
     ticket_url: Optional[str] = None
+    date_value: Optional[calendar_date] = field(default=None, compare=False)
+    minutes: List[int] = field(default=None, compare=False)
     
     def __post_init__(self):
         if self.times is None:
             self.times = []
+        if self.date_value is None:
+            self.date_value = parse_iso_date(self.date)
+        if self.minutes is None:
+            self.minutes = [m for m in (time_to_minutes(t) for t in self.times) if m is not None]
 
 @dataclass
 class MovieSchedule:
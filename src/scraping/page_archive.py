@@ -0,0 +1,304 @@
+"""
+取得したページ本文の保存（output/pages/）
+
+本文はSHA-256で名前を付けてgzipで1件ずつ保存し、同じ本文は何回取得しても1つだけ持つ。
+取得の記録（映画館キー・URL・取得日時・ハッシュ・取得方法）は index.jsonl に1行ずつ追記し、
+読み込み時に映画館 -> URL -> 取得日時順 の索引にする。
+
+保存したページは、抽出処理を変えた後の再処理（通信なし）や、
+html/ を読むオフラインのユーティリティ向けの書き出しに使う。
+保持日数より古い取得記録と、どの記録からも参照されなくなった本文は
+結果ファイルの圧縮・整理（snapshot_compaction）で削除する（URLごとの最新の記録は残す）。
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from bisect import bisect_right
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+DEFAULT_ARCHIVE_DIR = "output/pages"
+INDEX_FILE = "index.jsonl"
+
+
+@dataclass
+class PageRecord:
+    """ページ取得1回分の記録"""
+    theater: str
+    url: str
+    fetched_at: str  # ISO形式
+    sha256: str
+    size: int  # 圧縮前のバイト数
+    method: str = "http"  # http / render
+
+    @property
+    def time(self) -> datetime:
+        return datetime.fromisoformat(self.fetched_at)
+
+
+def _export_name(theater: str, url: str) -> str:
+    """書き出し時のファイル名（映画館キー_URLのパス.html）"""
+    parsed = urlparse(url)
+    slug = re.sub(r"[^0-9A-Za-z]+", "_", f"{parsed.path}_{parsed.query}").strip("_") or "index"
+    return f"{theater}_{slug[:80]}.html"
+
+
+class PageArchive:
+    """内容で名前を付けたページ本文の保存先"""
+
+    def __init__(self, root: str = DEFAULT_ARCHIVE_DIR):
+        self.root = Path(root)
+        self.index_path = self.root / INDEX_FILE
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._index: Dict[str, Dict[str, List[PageRecord]]] = {}
+        self._index_offset = 0
+        self._lock = threading.RLock()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.html.gz"
+
+    # ---- 索引 ----
+
+    def _refresh_index(self):
+        """index.jsonl の未読分を読み込む（別のプロセスが追記した分も含む）"""
+        try:
+            size = self.index_path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size < self._index_offset:
+            # 作り直された場合は最初から読む
+            self._index, self._index_offset = {}, 0
+        if size == self._index_offset:
+            return
+        with open(self.index_path, 'rb') as f:
+            f.seek(self._index_offset)
+            data = f.read()
+        # 書きかけの行は次回に読む
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                self._add_record(PageRecord(**json.loads(line)))
+            except Exception as e:
+                self.logger.warning(f"Skipping broken page index line: {e}")
+        self._index_offset += end
+
+    def _add_record(self, record: PageRecord):
+        records = self._index.setdefault(record.theater, {}).setdefault(record.url, [])
+        records.append(record)
+        if len(records) > 1 and records[-2].fetched_at > record.fetched_at:
+            records.sort(key=lambda item: item.fetched_at)
+
+    # ---- 保存 ----
+
+    def store(self, theater: str, url: str, body: bytes, method: str = "http",
+              fetched_at: Optional[datetime] = None) -> PageRecord:
+        """本文を保存し、取得の記録を追記"""
+        digest = hashlib.sha256(body).hexdigest()
+        record = PageRecord(
+            theater=theater,
+            url=url,
+            fetched_at=(fetched_at or datetime.now()).isoformat(),
+            sha256=digest,
+            size=len(body),
+            method=method
+        )
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(body, mtime=0))
+            os.replace(tmp_name, path)
+
+        line = json.dumps(asdict(record), ensure_ascii=False) + "\n"
+        with self._lock:
+            self._refresh_index()
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+            self._refresh_index()
+        return record
+
+    # ---- 参照 ----
+
+    def read(self, record: PageRecord) -> bytes:
+        """記録の本文"""
+        with open(self._object_path(record.sha256), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def theaters(self) -> List[str]:
+        with self._lock:
+            self._refresh_index()
+            return sorted(self._index)
+
+    def urls(self, theater: str) -> List[str]:
+        with self._lock:
+            self._refresh_index()
+            return sorted(self._index.get(theater, {}))
+
+    def history(self, theater: str, url: str, start: Optional[datetime] = None,
+                end: Optional[datetime] = None) -> List[PageRecord]:
+        """URLの取得記録（start以上end以下、取得日時順）"""
+        with self._lock:
+            self._refresh_index()
+            records = self._index.get(theater, {}).get(url, [])
+            return [
+                record for record in records
+                if (start is None or record.time >= start) and (end is None or record.time <= end)
+            ]
+
+    def latest(self, theater: str, url: str, at: Optional[datetime] = None) -> Optional[PageRecord]:
+        """at時点（省略時は現在）で最新の取得記録"""
+        with self._lock:
+            self._refresh_index()
+            records = self._index.get(theater, {}).get(url, [])
+            if at is not None:
+                records = records[:bisect_right([record.fetched_at for record in records], at.isoformat())]
+            return records[-1] if records else None
+
+    def body(self, theater: str, url: str, at: Optional[datetime] = None) -> Optional[bytes]:
+        """at時点で最新の本文（なければNone）"""
+        record = self.latest(theater, url, at)
+        if record is None:
+            return None
+        try:
+            return self.read(record)
+        except Exception as e:
+            self.logger.error(f"Failed to read archived page {url}: {e}")
+            return None
+
+    def snapshot(self, theater: str, at: Optional[datetime] = None) -> Dict[str, PageRecord]:
+        """映画館のURLごとの、at時点で最新の取得記録"""
+        snapshot = {}
+        for url in self.urls(theater):
+            record = self.latest(theater, url, at)
+            if record is not None:
+                snapshot[url] = record
+        return snapshot
+
+    def export(self, dest_dir: str, theater: Optional[str] = None,
+               at: Optional[datetime] = None) -> List[Path]:
+        """at時点で最新のページをUTF-8のHTMLファイルとして書き出す（オフラインのユーティリティ用）"""
+        from bs4 import UnicodeDammit
+
+        dest = Path(dest_dir)
+        dest.mkdir(parents=True, exist_ok=True)
+        written = []
+        for theater_key in ([theater] if theater else self.theaters()):
+            for url, record in self.snapshot(theater_key, at).items():
+                try:
+                    html = UnicodeDammit(self.read(record), ["utf-8", "cp932", "euc-jp"]).unicode_markup
+                except Exception as e:
+                    self.logger.error(f"Failed to export archived page {url}: {e}")
+                    continue
+                path = dest / _export_name(theater_key, url)
+                path.write_text(html, encoding='utf-8')
+                written.append(path)
+        return written
+
+    # ---- 保持期限 ----
+
+    def prune(self, cutoff: datetime, dry_run: bool = False) -> Tuple[int, int]:
+        """cutoffより古い取得記録と、参照されなくなった本文を削除
+
+        URLごとの最新の記録は古くても残す（最新のページは常に再処理できる）。
+        削除した（dry_run時は削除対象の）記録数・本文数を返す。
+        """
+        started = datetime.now().timestamp()
+        with self._lock:
+            self._refresh_index()
+            kept: List[PageRecord] = []
+            expired = 0
+            for urls in self._index.values():
+                for records in urls.values():
+                    keep = [record for record in records[:-1] if record.time >= cutoff] + records[-1:]
+                    expired += len(records) - len(keep)
+                    kept.extend(keep)
+            if expired and not dry_run:
+                self._rewrite_index(kept)
+
+            referenced = {record.sha256 for record in kept}
+            orphans = []
+            for path in (self.root / "objects").glob("*/*.html.gz"):
+                # 保存中（索引への追記前）の本文は消さない
+                if path.name[:-len(".html.gz")] not in referenced and path.stat().st_mtime < started:
+                    orphans.append(path)
+            if not dry_run:
+                for path in orphans:
+                    try:
+                        path.unlink()
+                    except OSError as e:
+                        self.logger.warning(f"Failed to delete archived page {path.name}: {e}")
+        if expired or orphans:
+            self.logger.info(f"Pruned page archive: {expired} records, {len(orphans)} pages"
+                             + (" (dry run)" if dry_run else ""))
+        return expired, len(orphans)
+
+    def _rewrite_index(self, records: List[PageRecord]):
+        """index.jsonl を records で書き直す（読み込み後に別のプロセスが追記した分は引き継ぐ）"""
+        records = sorted(records, key=lambda record: record.fetched_at)
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            for record in records:
+                f.write((json.dumps(asdict(record), ensure_ascii=False) + "\n").encode("utf-8"))
+            with open(self.index_path, 'rb') as index:
+                index.seek(self._index_offset)
+                tail = index.read()
+            f.write(tail[:tail.rfind(b"\n") + 1])
+        os.replace(tmp_name, self.index_path)
+        self._index, self._index_offset = {}, 0
+        self._refresh_index()
+
+    def disk_usage(self) -> int:
+        """保存先の容量（本文・索引）"""
+        if not self.root.is_dir():
+            return 0
+        return sum(path.stat().st_size for path in self.root.rglob("*") if path.is_file())
+
+    def stats(self) -> Dict[str, int]:
+        """取得記録数・保存している本文の数と容量"""
+        with self._lock:
+            self._refresh_index()
+            records = [record for urls in self._index.values() for items in urls.values() for record in items]
+        digests = {record.sha256 for record in records}
+        stored = sum(self._object_path(digest).stat().st_size for digest in digests
+                     if self._object_path(digest).exists())
+        return {
+            "records": len(records),
+            "pages": len(digests),
+            "raw_bytes": sum(record.size for record in records),
+            "stored_bytes": stored
+        }
+
+
+def load_page_archive() -> Optional[PageArchive]:
+    """保存先を環境変数から読み込み
+
+    PAGE_ARCHIVE_ENABLED: ページ本文を保存するか（既定 true）
+    PAGE_ARCHIVE_DIR: 保存先（既定 output/pages）
+    """
+    if os.getenv("PAGE_ARCHIVE_ENABLED", "true").lower() != "true":
+        return None
+    return PageArchive(os.getenv("PAGE_ARCHIVE_DIR", DEFAULT_ARCHIVE_DIR))
+
+
+_archive: Optional[PageArchive] = None
+_archive_loaded = False
+_archive_lock = threading.Lock()
+
+
+def get_page_archive() -> Optional[PageArchive]:
+    """プロセス共有のページ保存先を取得（無効ならNone）"""
+    global _archive, _archive_loaded
+    with _archive_lock:
+        if not _archive_loaded:
+            _archive = load_page_archive()
+            _archive_loaded = True
+        return _archive
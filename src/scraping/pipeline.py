@@ -0,0 +1,212 @@
+"""
+取得・解析を分離したスクレイピングパイプライン
+
+ページ取得（I/O待ち）は映画館ごとのスレッドで行い、取得したバイト列を上限付きキュー経由で
+解析プロセスプールへ渡す。BeautifulSoupによる解析はGILの影響を受けない別プロセスで実行する。
+スクレイパーは起動時に各解析プロセスへ1回だけ渡し、ページごとには映画館キーだけを送る。
+"""
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup
+
+from .base_scraper import BaseScraper, PageRequest, MOVIES, SCHEDULES, merge_schedule_records
+from .models import TheaterData
+
+
+# 解析プロセスが起動時に受け取ったスクレイパー（映画館キー → 解析専用のインスタンス）
+_worker_scrapers: Dict[str, BaseScraper] = {}
+
+
+def _init_worker(payload: Dict[str, bytes]):
+    """解析プロセスの初期化（スクレイパーを1回だけ受け取る）"""
+    global _worker_scrapers
+    _worker_scrapers = {key: pickle.loads(data) for key, data in payload.items()}
+
+
+def parse_page(scraper: Union[str, BaseScraper], targets: List[Tuple[str, PageRequest]],
+               content: bytes) -> Tuple[List[list], Dict[str, Dict[str, Any]]]:
+    """解析プロセスで実行する抽出処理（1ページを1回だけ解析し、全抽出種別に使う）
+
+    scraperは起動時に受け取った映画館キー、または登録外のスクレイパーそのもの。
+
+    Returns:
+        (抽出種別ごとのレコード, セレクタ採用記録の変更分)
+    """
+    if isinstance(scraper, str):
+        scraper = _worker_scrapers[scraper]
+    soup = BeautifulSoup(content, 'html.parser')
+    results = [list(scraper.extract(kind, page, soup)) for kind, page in targets]
+    return results, scraper.selector_memo.drain_delta()
+
+
+@dataclass
+class _ParseTask:
+    """解析待ちのページ"""
+    scraper: Union[str, BaseScraper]  # 映画館キー（登録外のスクレイパーはそのもの）
+    targets: List[Tuple[str, PageRequest]]
+    content: bytes
+    result: Future
+
+
+class ParsePipeline:
+    """取得スレッドと解析プロセスプールをつなぐパイプライン
+
+    キューが満杯の間は取得側が待機し、プロセスプールへの投入数も
+    workers * 2 件までに制限する（解析が追いつかない場合に取得を抑える）。
+    scrapersに渡したスクレイパーは起動時に（タイトル辞書を読み込み済みの状態で）各解析プロセスへ
+    1回だけ送り、以降はページごとに映画館キーだけを送る。解析プロセス側のセレクタ採用記録は
+    そのプロセスで解析したページの分だけが積み上がる（変更分はページごとに取得スレッドへ返す）。
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_size: int = 8,
+                 scrapers: Optional[Dict[str, BaseScraper]] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.scrapers = dict(scrapers or {})
+        self._keys: Dict[int, str] = {}
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._queue: "queue.Queue[Optional[_ParseTask]]" = queue.Queue(maxsize=queue_size)
+        self._in_flight = threading.BoundedSemaphore(self.workers * 2)
+        self._closed = threading.Event()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+
+    def start(self) -> "ParsePipeline":
+        """解析プロセスプールを起動"""
+        # 取得スレッドが動いている状態でforkしないようspawnで起動する
+        # （スクレイパーは親プロセスで1回だけpickleし、各解析プロセスの初期化で復元する）
+        payload = {}
+        for key, scraper in self.scrapers.items():
+            try:
+                payload[key] = pickle.dumps(scraper)
+            except Exception as e:
+                # 送れないスクレイパーはページごとに送る（失敗すればその映画館だけが失敗する）
+                self.logger.warning(f"Failed to preload scraper {key} into parse workers: {e}")
+                continue
+            self._keys[id(scraper)] = key
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(payload,)
+        )
+        self._dispatcher = threading.Thread(target=self._dispatch, name="parse-dispatch", daemon=True)
+        self._dispatcher.start()
+        self.logger.info(f"Started parse pipeline with {self.workers} workers")
+        return self
+
+    def _dispatch(self):
+        """キューから取り出したページをプロセスプールへ投入"""
+        while True:
+            task = self._queue.get()
+            if task is None:
+                break
+            self._in_flight.acquire()
+            try:
+                future = self._pool.submit(parse_page, task.scraper, task.targets, task.content)
+            except Exception as e:
+                self._in_flight.release()
+                task.result.set_exception(e)
+                continue
+            future.add_done_callback(partial(self._done, task))
+
+        # 終了後に残ったページは破棄
+        while True:
+            try:
+                task = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if task is not None:
+                task.result.set_exception(RuntimeError("parse pipeline closed"))
+
+    def _done(self, task: _ParseTask, future: Future):
+        """解析完了"""
+        self._in_flight.release()
+        if future.cancelled():
+            task.result.set_exception(RuntimeError("parse cancelled"))
+        elif future.exception() is not None:
+            task.result.set_exception(future.exception())
+        else:
+            task.result.set_result(future.result())
+
+    def submit(self, scraper: BaseScraper, targets: List[Tuple[str, PageRequest]], content: bytes) -> Future:
+        """取得済みページを解析キューへ投入（キュー満杯の間は待機）"""
+        result: Future = Future()
+        task = _ParseTask(self._keys.get(id(scraper), scraper), targets, content, result)
+        while not self._closed.is_set():
+            try:
+                self._queue.put(task, timeout=0.5)
+                return result
+            except queue.Full:
+                continue
+        result.set_exception(RuntimeError("parse pipeline closed"))
+        return result
+
+    def iter_records(self, scraper: BaseScraper) -> Iterator[Tuple[str, Any]]:
+        """映画館1館分を取得し、解析済みのレコードを (種別, レコード) として逐次返す
+
+        取得を続けながら、解析が終わったページの分から取得順に返す。
+        """
+        pending: Deque[Tuple[List[Tuple[str, PageRequest]], Future]] = deque()
+        for fetch_page, targets in scraper.page_plan():
+            content = scraper.fetch(fetch_page)
+            if content:
+                pending.append((targets, self.submit(scraper, targets, content)))
+            while pending and pending[0][1].done():
+                yield from self._records(scraper, *pending.popleft())
+        while pending:
+            yield from self._records(scraper, *pending.popleft())
+
+    def _records(self, scraper: BaseScraper, targets: List[Tuple[str, PageRequest]],
+                 future: Future) -> Iterator[Tuple[str, Any]]:
+        """解析結果をレコード単位に展開"""
+        try:
+            extracted, memo_delta = future.result()
+        except Exception as e:
+            self.logger.error(f"Failed to parse {targets[0][1].url}: {e}")
+            return
+        scraper.selector_memo.merge(memo_delta)
+        for (kind, _), items in zip(targets, extracted):
+            for item in items:
+                yield kind, item
+
+    def scrape(self, scraper: BaseScraper) -> TheaterData:
+        """映画館1館分を取得し、解析をプロセスプールで実行"""
+        scraper.logger.info(f"Starting scrape for {scraper.theater_name}")
+
+        theater_info = scraper.get_theater_info()
+        results = {MOVIES: [], SCHEDULES: []}
+        for kind, record in merge_schedule_records(self.iter_records(scraper)):
+            results[kind].append(record)
+
+        return TheaterData(
+            theater_info=theater_info,
+            movies=results[MOVIES],
+            schedules=results[SCHEDULES]
+        )
+
+    def close(self):
+        """パイプラインを停止"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._dispatcher is not None:
+            self._queue.put(None)
+            self._dispatcher.join()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "ParsePipeline":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,116 @@
+"""
+ホスト別トークンバケット方式のリクエスト間隔制御
+"""
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+@dataclass
+class RateLimit:
+    """レート設定"""
+    rate: float = 1.0  # 1秒あたりのリクエスト数
+    burst: int = 1  # 連続で許可するリクエスト数
+
+
+class TokenBucket:
+    """トークンバケット
+
+    トークン不足時は残量を負にして予約するため、同時に待つ呼び出し元同士も
+    1/rate 秒ずつ間隔が空く。
+    """
+
+    def __init__(self, limit: RateLimit):
+        self.rate = limit.rate
+        self.burst = max(1, limit.burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """トークンを1つ予約し、使用可能になるまでの待ち秒数を返す"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """トークン取得（同期）"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """トークン取得（非同期）"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class HostRateLimiter:
+    """ホスト単位のレート制御（requests・Selenium共通）"""
+
+    def __init__(self, default: Optional[RateLimit] = None,
+                 overrides: Optional[Dict[str, RateLimit]] = None):
+        self.default = default or RateLimit()
+        self.overrides = overrides or {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        """URLのホストに対応するバケットを取得"""
+        host = urlparse(url).netloc or url
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.overrides.get(host, self.default))
+            return self._buckets[host]
+
+    def acquire(self, url: str):
+        """リクエスト前の待機（取得スレッドから呼ぶ）"""
+        self.bucket(url).acquire()
+
+
+def load_rate_limits() -> HostRateLimiter:
+    """レート設定を環境変数から読み込み
+
+    SCRAPING_RATE_LIMIT / SCRAPING_RATE_BURST: 全ホスト共通の既定値
+    SCRAPING_HOST_RATE_LIMITS: "host=rate:burst,..." 形式のホスト別設定
+    """
+    default = RateLimit(
+        rate=float(os.getenv("SCRAPING_RATE_LIMIT", "1.0")),
+        burst=int(os.getenv("SCRAPING_RATE_BURST", "1"))
+    )
+
+    overrides = {}
+    for entry in os.getenv("SCRAPING_HOST_RATE_LIMITS", "").split(","):
+        if "=" not in entry:
+            continue
+        host, setting = entry.split("=", 1)
+        rate, _, burst = setting.partition(":")
+        overrides[host.strip()] = RateLimit(
+            rate=float(rate),
+            burst=int(burst) if burst else default.burst
+        )
+
+    return HostRateLimiter(default, overrides)
+
+
+_limiter: Optional[HostRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """プロセス共有のレートリミッターを取得"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = load_rate_limits()
+        return _limiter
@@ -0,0 +1,158 @@
+"""
+Seleniumページ取得の準備完了条件と適応タイムアウト
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+# ネットワークアイドル判定用スクリプト
+# 完了済みリソースの最終responseEndからの経過msを返す（読み込み未完了なら-1）
+_NETWORK_IDLE_SCRIPT = """
+if (document.readyState !== 'complete') { return -1; }
+var entries = performance.getEntriesByType('resource');
+var last = 0;
+for (var i = 0; i < entries.length; i++) {
+    if (entries[i].responseEnd > last) { last = entries[i].responseEnd; }
+}
+return performance.now() - last;
+"""
+
+_COUNT_SCRIPT = "return document.querySelectorAll(arguments[0]).length;"
+_TEXT_SCRIPT = "return document.body ? document.body.innerText.indexOf(arguments[0]) >= 0 : false;"
+
+
+@dataclass
+class ReadinessCondition:
+    """レンダリング完了判定条件（指定した項目を全て満たしたとき準備完了）"""
+    selector: Optional[str] = None  # CSSセレクタ
+    min_count: int = 1  # selectorに一致すべき最小要素数
+    text: Optional[str] = None  # 本文に含まれるべき文字列
+    network_idle: bool = False  # リソース読み込みの停止を待つか
+    idle_ms: int = 500  # ネットワークアイドルとみなす経過時間
+
+    def is_satisfied(self, driver) -> bool:
+        """条件を満たしているかチェック"""
+        if self.selector:
+            count = driver.execute_script(_COUNT_SCRIPT, self.selector) or 0
+            if count < self.min_count:
+                return False
+
+        if self.text:
+            if not driver.execute_script(_TEXT_SCRIPT, self.text):
+                return False
+
+        if self.network_idle:
+            idle_for = driver.execute_script(_NETWORK_IDLE_SCRIPT)
+            if idle_for is None or idle_for < self.idle_ms:
+                return False
+
+        return True
+
+
+# 条件未指定時のデフォルト（従来の<body>出現待ちに相当）
+DEFAULT_READINESS = [ReadinessCondition(selector="body")]
+
+
+def all_conditions_met(conditions: List[ReadinessCondition]):
+    """WebDriverWait用の判定関数を生成"""
+    def _predicate(driver) -> bool:
+        return all(condition.is_satisfied(driver) for condition in conditions)
+    return _predicate
+
+
+class LoadTimeTracker:
+    """ホスト別のレンダリング所要時間を記録し、適応タイムアウトを算出
+
+    記録はsave_every件ごと・save_interval秒ごと、または save() の呼び出し時（実行の終わり）にまとめて保存する。
+    """
+
+    def __init__(self, state_path: Optional[str] = "logs/render_load_times.json",
+                 max_samples: int = 20, min_timeout: float = 3.0,
+                 max_timeout: float = 30.0, multiplier: float = 2.0,
+                 save_every: int = 10, save_interval: float = 60.0):
+        self.state_path = Path(state_path) if state_path else None
+        self.max_samples = max_samples
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.multiplier = multiplier
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+        self._load()
+
+    def _load(self):
+        """過去の計測結果を読み込み"""
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for host, samples in data.items():
+                self._samples[host] = deque(samples[-self.max_samples:], maxlen=self.max_samples)
+        except Exception as e:
+            self.logger.warning(f"Failed to load render timings: {e}")
+
+    def _save(self):
+        """計測結果を保存（一時ファイルに書いてから置き換える、ロック内で呼ぶ）"""
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+        if not self.state_path:
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({host: list(samples) for host, samples in self._samples.items()}, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to save render timings: {e}")
+
+    def save(self):
+        """未保存の記録があれば保存"""
+        with self._lock:
+            if self._unsaved:
+                self._save()
+
+    def record(self, url: str, seconds: float):
+        """所要時間を記録"""
+        host = urlparse(url).netloc
+        with self._lock:
+            samples = self._samples.setdefault(host, deque(maxlen=self.max_samples))
+            samples.append(round(seconds, 3))
+            self._unsaved += 1
+            if self._unsaved >= self.save_every or time.monotonic() - self._last_save >= self.save_interval:
+                self._save()
+
+    def timeout_for(self, url: str, default: float) -> float:
+        """過去の所要時間のp90から待機上限を算出（計測がなければdefault）"""
+        host = urlparse(url).netloc
+        with self._lock:
+            samples = sorted(self._samples.get(host, ()))
+        if len(samples) < 3:
+            return default
+        p90 = samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+        return max(self.min_timeout, min(self.max_timeout, p90 * self.multiplier))
+
+
+_tracker: Optional[LoadTimeTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_load_time_tracker() -> LoadTimeTracker:
+    """プロセス共有のトラッカーを取得"""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = LoadTimeTracker()
+        return _tracker
@@ -0,0 +1,157 @@
+"""
+映画館ごとの更新頻度の学習と再取得間隔の決定（logs/に永続化）
+
+取得結果の内容ハッシュを時系列で記録し、観測期間内に内容が変わった回数から
+「何時間ごとに変わるサイトか」を見積もる。再取得間隔はその半分
+（変化1回につき2回は取得する）を上限・下限の範囲に収めたもの。
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .snapshot_catalog import get_snapshot_catalog
+from .snapshot_files import result_hash
+
+# 映画館ごとに保持する観測数
+MAX_OBSERVATIONS = 30
+
+
+class ChangeHistory:
+    """映画館1館分の（取得時刻, 内容ハッシュ）の記録"""
+
+    def __init__(self, observations: Optional[List[Tuple[float, str]]] = None):
+        self.observations: Deque[Tuple[float, str]] = deque(sorted(observations or []), maxlen=MAX_OBSERVATIONS)
+
+    def record(self, at: float, digest: str) -> bool:
+        """観測を追加し、前回から内容が変わったかを返す"""
+        changed = bool(self.observations) and self.observations[-1][1] != digest
+        self.observations.append((at, digest))
+        return changed
+
+    def change_count(self) -> int:
+        items = list(self.observations)
+        return sum(1 for (_, before), (_, after) in zip(items, items[1:]) if before != after)
+
+    def span(self) -> float:
+        """観測期間（秒）"""
+        if len(self.observations) < 2:
+            return 0.0
+        return self.observations[-1][0] - self.observations[0][0]
+
+    def change_period(self) -> Optional[float]:
+        """内容が変わる平均間隔の見積もり（秒、観測不足ならNone）
+
+        観測期間中に一度も変わっていなければ、少なくとも観測期間の2倍とみなす。
+        """
+        span = self.span()
+        if span <= 0:
+            return None
+        changes = self.change_count()
+        return span / changes if changes else span * 2
+
+
+class RefreshCadence:
+    """映画館ごとの再取得間隔
+
+    Args:
+        default_interval: 観測が足りない映画館の間隔
+        min_interval / max_interval: 間隔の下限・上限
+    """
+
+    def __init__(self, default_interval: timedelta, min_interval: timedelta, max_interval: timedelta,
+                 state_path: Optional[str] = "logs/refresh_cadence.json"):
+        self.min_interval = min(min_interval, max_interval)
+        self.max_interval = max(min_interval, max_interval)
+        self.default_interval = default_interval
+        self.state_path = Path(state_path) if state_path else None
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._histories: Dict[str, ChangeHistory] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """保存済みの記録を読み込み"""
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for theater_key, observations in data.items():
+                self._histories[theater_key] = ChangeHistory([tuple(item) for item in observations])
+        except Exception as e:
+            self.logger.warning(f"Failed to load refresh cadence: {e}")
+
+    def save(self):
+        """記録を保存"""
+        if not self.state_path:
+            return
+        with self._lock:
+            data = {key: [list(item) for item in history.observations] for key, history in self._histories.items()}
+            try:
+                self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.state_path.with_suffix(".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                tmp_path.replace(self.state_path)
+            except Exception as e:
+                self.logger.warning(f"Failed to save refresh cadence: {e}")
+
+    def bootstrap(self, output_dir: str = "output"):
+        """記録のない映画館について、結果ファイルの目録から変化の履歴を作る"""
+        catalog = get_snapshot_catalog(output_dir)
+        with self._lock:
+            for theater_key in catalog.latest_per_theater():
+                if theater_key in self._histories:
+                    continue
+                history = ChangeHistory()
+                entries = [entry for entry in catalog.entries(theater_key) if entry.status != "partial"]
+                for entry in entries[-MAX_OBSERVATIONS:]:
+                    history.record(entry.time.timestamp(), entry.content_hash)
+                self._histories[theater_key] = history
+                self.logger.info(
+                    f"Refresh cadence for {theater_key}: {len(history.observations)} snapshots, "
+                    f"{history.change_count()} changes"
+                )
+
+    def observe(self, theater_key: str, result: Dict[str, Any], at: Optional[float] = None) -> bool:
+        """取得結果を記録し、前回から内容が変わったかを返す
+
+        取得に失敗した結果・期限で打ち切られた結果は内容が揃っていないため記録しない。
+        """
+        if not result or result.get("status") == "partial":
+            return False
+        with self._lock:
+            history = self._histories.setdefault(theater_key, ChangeHistory())
+            changed = history.record(at if at is not None else time.time(), result_hash(result))
+        if changed:
+            self.logger.info(f"{theater_key} changed; next refresh in {self.interval(theater_key)}")
+        return changed
+
+    def interval(self, theater_key: str) -> timedelta:
+        """次の再取得までの間隔"""
+        with self._lock:
+            history = self._histories.get(theater_key)
+            period = history.change_period() if history else None
+        if period is None:
+            interval = self.default_interval
+        else:
+            interval = timedelta(seconds=period / 2)
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """映画館ごとの観測数・変化回数・間隔"""
+        with self._lock:
+            keys = list(self._histories)
+            stats = {
+                key: {"observations": len(self._histories[key].observations),
+                      "changes": self._histories[key].change_count()}
+                for key in keys
+            }
+        for key in keys:
+            stats[key]["interval_hours"] = round(self.interval(key).total_seconds() / 3600, 1)
+        return stats
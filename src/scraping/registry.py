@@ -0,0 +1,160 @@
+"""
+映画館スクレイパーの登録情報と遅延読み込み
+
+映画館は config/theaters.json（環境変数 THEATERS_CONFIG で変更可）と、
+エントリーポイント "scraping_theatre.theaters" の両方から登録できる。
+エントリーポイントは TheaterEntry もしくは同じ項目を持つ辞書を返すこと。
+スクレイパークラスは登録情報の name・url を theater_name・base_url として受け取る。
+"""
+import importlib
+import json
+import logging
+import os
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Type
+
+if TYPE_CHECKING:
+    from .base_scraper import BaseScraper
+
+ENTRY_POINT_GROUP = "scraping_theatre.theaters"
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[2] / "config" / "theaters.json"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TheaterEntry:
+    """映画館の登録情報"""
+    key: str
+    name: str
+    url: str
+    # "モジュール:クラス名"。モジュール名に"."を含まない場合は src.scraping.scrapers 配下を参照
+    scraper: Optional[str] = None
+    # 抽出定義ファイル（config/extractors/ 基準）。指定時はDeclarativeScraperを使う
+    spec: Optional[str] = None
+    enabled: bool = True
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TheaterEntry":
+        """設定ファイルの1項目から生成"""
+        return cls(
+            key=data["key"],
+            name=data["name"],
+            url=data["url"],
+            scraper=data.get("scraper"),
+            spec=data.get("spec"),
+            enabled=data.get("enabled", True)
+        )
+
+
+def _load_config_entries(path: Path) -> List[TheaterEntry]:
+    """設定ファイルから読み込み"""
+    if not path.exists():
+        logger.error(f"Theater config not found: {path}")
+        return []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return [TheaterEntry.from_dict(item) for item in data.get("theaters", [])]
+    except Exception as e:
+        logger.error(f"Failed to load theater config {path}: {e}")
+        return []
+
+
+def _load_entry_point_entries() -> List[TheaterEntry]:
+    """インストール済みパッケージのエントリーポイントから読み込み"""
+    entries = []
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            value = entry_point.load()
+            entries.append(value if isinstance(value, TheaterEntry) else TheaterEntry.from_dict(value))
+        except Exception as e:
+            logger.error(f"Failed to load theater plugin {entry_point.name}: {e}")
+    return entries
+
+
+_entries: Optional[List[TheaterEntry]] = None
+_entries_lock = threading.Lock()
+
+
+def get_theater_entries() -> List[TheaterEntry]:
+    """有効な映画館の一覧（スクレイパーは読み込まない）
+
+    設定ファイルとエントリーポイントでキーが重複した場合は設定ファイルを優先する。
+    """
+    global _entries
+    with _entries_lock:
+        if _entries is None:
+            config_path = Path(os.getenv("THEATERS_CONFIG", DEFAULT_CONFIG_PATH))
+            merged: Dict[str, TheaterEntry] = {}
+            for entry in _load_entry_point_entries() + _load_config_entries(config_path):
+                merged[entry.key] = entry
+            _entries = [entry for entry in merged.values() if entry.enabled]
+        return list(_entries)
+
+
+def get_theater_entry(key: str) -> Optional[TheaterEntry]:
+    """キーから映画館の登録情報を取得"""
+    for entry in get_theater_entries():
+        if entry.key == key:
+            return entry
+    return None
+
+
+def load_scraper_class(entry: TheaterEntry) -> Type["BaseScraper"]:
+    """スクレイパークラスを読み込み"""
+    module_name, class_name = entry.scraper.split(":")
+    if "." in module_name:
+        module = importlib.import_module(module_name)
+    else:
+        module = importlib.import_module(f".scrapers.{module_name}", __package__)
+    return getattr(module, class_name)
+
+
+def create_scraper(entry: TheaterEntry) -> "BaseScraper":
+    """登録情報からスクレイパーを生成"""
+    if entry.spec:
+        from .declarative import DeclarativeScraper
+        return DeclarativeScraper.from_file(entry.name, entry.url, entry.spec)
+    return load_scraper_class(entry)(theater_name=entry.name, base_url=entry.url)
+
+
+class ScraperRegistry(Mapping):
+    """映画館キー -> スクレイパーの遅延生成マッピング
+
+    キーの列挙や存在確認ではスクレイパーを読み込まず、
+    初めて参照された時点でモジュールを読み込んでインスタンスを生成する。
+    """
+
+    def __init__(self, entries: Optional[List[TheaterEntry]] = None):
+        if entries is None:
+            entries = get_theater_entries()
+        self._entries: Dict[str, TheaterEntry] = {entry.key: entry for entry in entries}
+        self._instances: Dict[str, "BaseScraper"] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> "BaseScraper":
+        with self._lock:
+            if key not in self._instances:
+                entry = self._entries[key]
+                scraper = create_scraper(entry)
+                scraper.theater_key = key
+                self._instances[key] = scraper
+            return self._instances[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def entry(self, key: str) -> TheaterEntry:
+        """映画館の登録情報"""
+        return self._entries[key]
@@ -0,0 +1,140 @@
+"""
+スクレイピング結果の逐次書き出し
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, Optional
+
+from .base_scraper import MOVIES, SCHEDULES
+from .snapshot_files import ContentHasher
+
+
+class TheaterResultWriter:
+    """映画館1館分の結果を届いた順に一時ファイルへ書き出し、最後に1つのJSONへまとめる
+
+    レコードは種別ごとのJSON Lines一時ファイルに1行ずつ追記するため、
+    結果全体をメモリに保持せずに保存できる。完成したファイルの形式は
+    json.dump(..., indent=2) で一括保存した場合と同じ。結合しながら内容ハッシュ
+    （snapshot_files.content_hash と同じ値）も計算する。
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.counts = {MOVIES: 0, SCHEDULES: 0}
+        self.content_hash: Optional[str] = None
+        self._parts: Dict[str, Path] = {
+            kind: self.path.with_name(f".{self.path.stem}.{kind}.jsonl") for kind in self.counts
+        }
+        self._files: Dict[str, IO[str]] = {
+            kind: open(part, 'w', encoding='utf-8') for kind, part in self._parts.items()
+        }
+
+    def write(self, kind: str, record: Dict[str, Any]):
+        """レコードを1件追記"""
+        self._files[kind].write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.counts[kind] += 1
+
+    def finish(self, header: Dict[str, Any], footer: Optional[Dict[str, Any]] = None,
+               on_record: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Path:
+        """一時ファイルを結合して保存
+
+        Args:
+            header: movies/schedulesより前に置く項目（theater_info）
+            footer: movies/schedulesより後に置く項目（scraped_at, status）
+            on_record: 保存の確定後に、レコードを1件ずつ (種別, レコード) で渡す先
+        """
+        for f in self._files.values():
+            f.close()
+
+        hasher = ContentHasher()
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            out.write("{")
+            first = True
+            for key, value in header.items():
+                out.write(("\n" if first else ",\n") + _member(key, value))
+                first = False
+            for kind in (MOVIES, SCHEDULES):
+                out.write(("\n" if first else ",\n") + f'  "{kind}": ')
+                first = False
+                self._write_array(out, kind, hasher)
+            for key, value in (footer or {}).items():
+                out.write(",\n" + _member(key, value))
+            out.write("\n}")
+        os.replace(tmp_path, self.path)
+        self.content_hash = hasher.hexdigest(header.get("theater_info"))
+        if on_record is not None:
+            self._replay(on_record)
+        self._remove_parts()
+        return self.path
+
+    def abort(self):
+        """書き出しを中止して一時ファイルを削除"""
+        for f in self._files.values():
+            f.close()
+        self._remove_parts()
+
+    def _replay(self, on_record: Callable[[str, Dict[str, Any]], None]):
+        """一時ファイルのレコードを届いた順（種別ごと）に渡す"""
+        for kind in (MOVIES, SCHEDULES):
+            if not self.counts[kind]:
+                continue
+            with open(self._parts[kind], 'r', encoding='utf-8') as part:
+                for line in part:
+                    on_record(kind, json.loads(line))
+
+    def _write_array(self, out: IO[str], kind: str, hasher: ContentHasher):
+        """一時ファイルのレコードを配列として書き出し"""
+        if not self.counts[kind]:
+            out.write("[]")
+            return
+        out.write("[")
+        with open(self._parts[kind], 'r', encoding='utf-8') as part:
+            for index, line in enumerate(part):
+                record = json.loads(line)
+                hasher.add(kind, record)
+                text = json.dumps(record, ensure_ascii=False, indent=2)
+                out.write(("\n" if index == 0 else ",\n") + _indent(text, 4))
+        out.write("\n  ]")
+
+    def _remove_parts(self):
+        for part in self._parts.values():
+            try:
+                part.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _member(key: str, value: Any) -> str:
+    """トップレベルの1項目"""
+    text = json.dumps(value, ensure_ascii=False, indent=2)
+    return f"  {json.dumps(key, ensure_ascii=False)}: " + _indent(text, 2)[2:]
+
+
+def _indent(text: str, width: int) -> str:
+    prefix = " " * width
+    return "\n".join(prefix + line for line in text.split("\n"))
+
+
+def write_combined(path: Path, results: Dict[str, Dict[str, Any]]) -> Path:
+    """映画館ごとの結果ファイルを1つのJSON（all_theaters_*.json）にまとめて保存
+
+    resultsは scrape_theater の戻り値（保存先と件数）で、結果ファイルは1館ずつ読み込む。
+    結果のない映画館は空の辞書にする。
+    """
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        out.write("{")
+        for index, (theater_key, result) in enumerate(results.items()):
+            data = {}
+            if result and result.get("file"):
+                with open(result["file"], 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            out.write(("\n" if index == 0 else ",\n") + _member(theater_key, data))
+        out.write("\n}" if results else "}")
+    os.replace(tmp_path, path)
+    return path
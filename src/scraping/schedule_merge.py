@@ -0,0 +1,97 @@
+"""
+スケジュールの正規化（映画ごとの統合・上映回の重複除去・日時順の並べ替え）
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .date_normalizer import time_to_minutes
+from .models import MovieSchedule, ShowtimeInfo
+
+
+class _ShowtimeGroup:
+    """同じ日付・スクリーンの上映回"""
+
+    def __init__(self, showtime: ShowtimeInfo):
+        self.date = showtime.date
+        self.date_value = showtime.date_value
+        self.screen = showtime.screen
+        self.ticket_url = showtime.ticket_url
+        self.times: List[str] = []
+        self._seen = set()
+        self.add(showtime)
+
+    def add(self, showtime: ShowtimeInfo):
+        if self.ticket_url is None:
+            self.ticket_url = showtime.ticket_url
+        for time_text in showtime.times:
+            time_text = time_text.strip() if time_text else ""
+            if not time_text:
+                continue
+            # 表記が違っても同じ時刻なら1回とする（"10:00" と "10：00"）
+            minutes = time_to_minutes(time_text)
+            key = minutes if minutes is not None else time_text
+            if key not in self._seen:
+                self._seen.add(key)
+                self.times.append(time_text)
+
+    def sort_key(self) -> Tuple:
+        return (self.date_value is None, self.date_value or date.min, self.date or "", self.screen or "")
+
+    def to_showtime(self) -> ShowtimeInfo:
+        # 時刻順（解釈できない表記は元の順で末尾）
+        order = {text: index for index, text in enumerate(self.times)}
+        times = sorted(self.times, key=lambda text: (time_to_minutes(text) is None, time_to_minutes(text) or 0, order[text]))
+        return ShowtimeInfo(date=self.date, times=times, screen=self.screen, ticket_url=self.ticket_url)
+
+
+class ScheduleMerger:
+    """スケジュールを映画ごとにまとめる
+
+    同じ映画館・作品名のスケジュールを1件にし、同じ日付・スクリーンの上映回は
+    時刻の重複を除いて統合する。映画は最初に現れた順、上映回は日付・時刻順に並べる。
+    """
+
+    def __init__(self):
+        self._movies: Dict[Tuple[str, str], Dict[Tuple[str, Optional[str]], _ShowtimeGroup]] = {}
+        self.group_count = 0  # 保持している日付・スクリーン単位の上映回のまとまりの数
+
+    def add(self, schedule: MovieSchedule):
+        """スケジュールを1件追加"""
+        title = (schedule.movie_title or "").strip()
+        if not title:
+            return
+        groups = self._movies.setdefault((schedule.theater_name, title), {})
+        for showtime in schedule.showtimes:
+            key = (showtime.date, showtime.screen)
+            if key in groups:
+                groups[key].add(showtime)
+            else:
+                groups[key] = _ShowtimeGroup(showtime)
+                self.group_count += 1
+
+    def extend(self, schedules: Iterable[MovieSchedule]) -> "ScheduleMerger":
+        for schedule in schedules:
+            self.add(schedule)
+        return self
+
+    def results(self) -> List[MovieSchedule]:
+        """統合済みのスケジュール
+
+        日付だけで時刻のない上映回は times を空にして残す（上映日の情報として使う）。
+        日付も時刻もない上映回は除き、上映回が残らない映画も除く。
+        """
+        merged = []
+        for (theater_name, title), groups in self._movies.items():
+            showtimes = [
+                group.to_showtime()
+                for group in sorted(groups.values(), key=_ShowtimeGroup.sort_key)
+                if group.times or (group.date or "").strip()
+            ]
+            if showtimes:
+                merged.append(MovieSchedule(theater_name=theater_name, movie_title=title, showtimes=showtimes))
+        return merged
+
+
+def merge_schedules(schedules: Iterable[MovieSchedule]) -> List[MovieSchedule]:
+    """スケジュールを映画ごとに統合（重複除去・日付時刻順）"""
+    return ScheduleMerger().extend(schedules).results()
@@ -6,16 +6,16 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ..base_scraper import BaseScraper
+from ..base_scraper import BaseScraper, PageRequest
 from ..models import MovieInfo, ShowtimeInfo, MovieSchedule, TheaterInfo
 
 class KsCinemaScraper(BaseScraper):
     """ケイズシネマ スクレイパー"""
     
-    def __init__(self):
+    def __init__(self, theater_name: str = "ケイズシネマ", base_url: str = "https://www.ks-cinema.com"):
         super().__init__(
-            theater_name="ケイズシネマ",
-            base_url="https://www.ks-cinema.com"
+            theater_name=theater_name,
+            base_url=base_url
         )
         self.schedule_url = f"{self.base_url}/schedule/"
         
@@ -57,21 +57,16 @@ class KsCinemaScraper(BaseScraper):
             screens=1  # 基本的に1スクリーン
         )
         
-    def get_movies(self) -> List[MovieInfo]:
-        """映画情報取得"""
-        movies = []
+    def movie_pages(self) -> List[PageRequest]:
+        """映画情報の取得対象ページ（上映中・近日公開）"""
+        return [
+            PageRequest(self.base_url),
+            PageRequest(f"{self.base_url}/coming/", label="coming"),
+        ]
         
-        # 現在上映中の映画
-        soup = self.get_page(self.base_url)
-        if soup:
-            movies.extend(self._extract_movies_from_page(soup))
-            
-        # 近日公開の映画
-        coming_soup = self.get_page(f"{self.base_url}/coming/")
-        if coming_soup:
-            movies.extend(self._extract_movies_from_page(coming_soup))
-            
-        return movies
+    def extract_movies(self, page: PageRequest, soup: BeautifulSoup) -> List[MovieInfo]:
+        """映画情報抽出"""
+        return self._extract_movies_from_page(soup)
         
     def _extract_movies_from_page(self, soup: BeautifulSoup) -> List[MovieInfo]:
         """ページから映画情報抽出"""
@@ -145,19 +140,21 @@ class KsCinemaScraper(BaseScraper):
                 
         return movies
         
-    def get_schedules(self) -> List[MovieSchedule]:
-        """スケジュール情報取得"""
-        schedules = []
+    def schedule_pages(self) -> List[PageRequest]:
+        """スケジュール情報の取得対象ページ（ケイズシネマはメインページにスケジュールがある）"""
+        return [PageRequest(self.base_url)]
         
-        # メインページから情報を取得（ケイズシネマはメインページにスケジュールがある）
-        soup = self.get_page(self.base_url)
-        if not soup:
-            return schedules
+    def extract_schedules(self, page: PageRequest, soup: BeautifulSoup) -> List[MovieSchedule]:
+        """スケジュール情報抽出"""
+        schedules = []
         
         movielist = soup.find("div", class_="movielist")
         if not movielist:
             return schedules
             
+        # 一覧に書かれた日付（作品ごとの日付がない場合に使う）
+        list_date = self._find_date(movielist.get_text(" ", strip=True))
+        
         # div.box clearfix からスケジュール情報を抽出
         movie_boxes = movielist.find_all("div", class_="box")
         
@@ -187,13 +184,11 @@ class KsCinemaScraper(BaseScraper):
                 # 上映時間を抽出
                 times = re.findall(r'\d{1,2}:\d{2}', full_text)
                 
-                if times:
-                    # 今日の日付でスケジュール作成（実際のサイトでは日付情報が限定的）
-                    from datetime import datetime
-                    today = datetime.now().strftime("%Y-%m-%d")
-                    
+                # 日付のわからない上映回は取得日とみなさず除外する
+                date = self._find_date(full_text) or list_date
+                if times and date:
                     showtimes = [ShowtimeInfo(
-                        date=today,
+                        date=date,
                         times=times,
                         screen="スクリーン1"
                     )]
@@ -210,27 +205,7 @@ class KsCinemaScraper(BaseScraper):
                 
         return schedules
         
-    def _format_date(self, date_text: str) -> str:
-        """日付フォーマット変換"""
-        try:
-            # 様々な日付形式に対応
-            date_patterns = [
-                r"(\d{1,2})/(\d{1,2})",  # MM/DD
-                r"(\d{1,2})月(\d{1,2})日",  # MM月DD日
-                r"(\d{4})-(\d{1,2})-(\d{1,2})",  # YYYY-MM-DD
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, date_text)
-                if match:
-                    if len(match.groups()) == 2:
-                        month, day = match.groups()
-                        return f"2024-{int(month):02d}-{int(day):02d}"
-                    elif len(match.groups()) == 3:
-                        year, month, day = match.groups()
-                        return f"{year}-{int(month):02d}-{int(day):02d}"
-                        
-            return date_text
-            
-        except Exception:
-            return date_text
\ No newline at end of file
+    def _find_date(self, text: str) -> Optional[str]:
+        """テキスト中の最初の日付（10/19・10月19日）をYYYY-MM-DDで返す"""
+        match = re.search(r'(\d{1,2})(?:/|月)(\d{1,2})', text)
+        return self.format_month_day(*match.groups()) if match else None
\ No newline at end of file
@@ -7,16 +7,49 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ..base_scraper import BaseScraper
+from ..base_scraper import BaseScraper, PageRequest
 from ..models import MovieInfo, ShowtimeInfo, MovieSchedule, TheaterInfo
+from ..readiness import ReadinessCondition
+from ..line_classifier import LineClassifier, DATE, TIME, TITLE
+
+_SKIP_WORDS = [
+    '月', '火', '水', '木', '金', '土', '日',
+    'ポレポレ東中野', '座席表', '購入', '2D', '字幕',
+    'もっとみる', ':', '〜'
+]
+
+# メインページの作品タイトル行
+_MAIN_TITLE_LINES = LineClassifier(skip_words=_SKIP_WORDS, min_length=3)
+
+# スケジュール行（MM/DDの日付 → 作品タイトル → HH:MMの時刻）
+_SCHEDULE_LINES = LineClassifier(
+    skip_words=_SKIP_WORDS + ['バリアフリー'],
+    reject_patterns=[r'\d{1,2}:\d{2}'],
+    min_length=3,
+    date_pattern=r'(?P<month>\d{2})/(?P<day>\d{2})',
+    time_pattern=r'\d{1,2}:\d{2}$'
+)
+
+_RATING_SUFFIX = re.compile(r'\s*[GR12+]\s*$')
+_BRACKETED = re.compile(r'【.*?】')
 
 class PolePoleHigashinakanoScraper(BaseScraper):
     """ポレポレ東中野 スクレイパー"""
     
-    def __init__(self):
+    # 既知の作品名は持たず、過去の結果から作った辞書のみで照合する
+    KNOWN_TITLES = ()
+    
+    # Nuxt.jsの描画完了を待つ（トップはスケジュール見出しの出現まで）
+    readiness_conditions = {
+        "/": [ReadinessCondition(text="上映スケジュール", network_idle=True)],
+        "/works": [ReadinessCondition(selector="#__nuxt *", min_count=10, network_idle=True)],
+        "/access": [ReadinessCondition(selector="#__nuxt *", min_count=10, network_idle=True)],
+    }
+    
+    def __init__(self, theater_name: str = "ポレポレ東中野", base_url: str = "https://pole2.co.jp"):
         super().__init__(
-            theater_name="ポレポレ東中野",
-            base_url="https://pole2.co.jp"
+            theater_name=theater_name,
+            base_url=base_url
         )
         
     def get_theater_info(self) -> TheaterInfo:
@@ -48,21 +81,18 @@ class PolePoleHigashinakanoScraper(BaseScraper):
             screens=2
         )
         
-    def get_movies(self) -> List[MovieInfo]:
-        """映画情報取得"""
-        movies = []
+    def movie_pages(self) -> List[PageRequest]:
+        """映画情報の取得対象ページ（メインページと作品一覧ページ）"""
+        return [
+            PageRequest(self.base_url, render=True),
+            PageRequest(f"{self.base_url}/works", label="works", render=True),
+        ]
         
-        # メインページから映画情報取得
-        soup = self.get_page_with_selenium(self.base_url)
-        if soup:
-            movies.extend(self._extract_movies_from_main_page(soup))
-            
-        # 作品一覧ページも確認
-        works_soup = self.get_page_with_selenium(f"{self.base_url}/works")
-        if works_soup:
-            movies.extend(self._extract_movies_from_works_page(works_soup))
-            
-        return movies
+    def extract_movies(self, page: PageRequest, soup: BeautifulSoup) -> List[MovieInfo]:
+        """映画情報抽出"""
+        if page.label == "works":
+            return self._extract_movies_from_works_page(soup)
+        return self._extract_movies_from_main_page(soup)
         
     def _extract_movies_from_main_page(self, soup: BeautifulSoup) -> List[MovieInfo]:
         """メインページから映画情報抽出（Nuxt.jsレンダリング後）"""
@@ -86,19 +116,20 @@ class PolePoleHigashinakanoScraper(BaseScraper):
             
             if in_schedule_section and line:
                 # 日付やその他の情報をスキップして映画タイトルを抽出
-                if not any(keyword in line for keyword in [
-                    '月', '火', '水', '木', '金', '土', '日',
-                    'ポレポレ東中野', '座席表', '購入', '2D', '字幕',
-                    'もっとみる', ':', '〜'
-                ]) and len(line) > 3 and not line.isdigit():
+                if _MAIN_TITLE_LINES.is_title(line):
                     # レーティングや記号を除去
-                    clean_title = re.sub(r'\s*[GR12+]\s*$', '', line)
-                    clean_title = re.sub(r'【.*?】', '', clean_title)
+                    clean_title = _RATING_SUFFIX.sub('', line)
+                    clean_title = _BRACKETED.sub('', clean_title)
                     clean_title = clean_title.strip()
                     
                     if clean_title and clean_title not in movie_titles:
                         movie_titles.append(clean_title)
         
+        # 既知タイトル（過去の結果）を本文から検出
+        for known_title in self.title_dictionary.find(body_text):
+            if known_title not in movie_titles:
+                movie_titles.append(known_title)
+        
         # MovieInfoオブジェクトを作成
         for title in movie_titles:
             movies.append(MovieInfo(
@@ -117,7 +148,7 @@ class PolePoleHigashinakanoScraper(BaseScraper):
         """作品ページから映画情報抽出"""
         movies = []
         
-        movie_cards = soup.find_all("div", class_="work-card") or soup.find_all("div", class_="movie-card")
+        movie_cards = self.selector_memo.select("work_cards", soup, ["div.work-card", "div.movie-card"])
         
         for card in movie_cards:
             movie = self._extract_movie_from_element(card)
@@ -196,14 +227,13 @@ class PolePoleHigashinakanoScraper(BaseScraper):
             self.logger.error(f"Error extracting movie info: {e}")
             return None
             
-    def get_schedules(self) -> List[MovieSchedule]:
-        """スケジュール情報取得（テキスト解析）"""
-        schedules = []
+    def schedule_pages(self) -> List[PageRequest]:
+        """スケジュール情報の取得対象ページ（メインページにスケジュール情報が含まれている）"""
+        return [PageRequest(self.base_url, render=True)]
         
-        # メインページから取得（スケジュール情報が含まれている）
-        soup = self.get_page_with_selenium(self.base_url)
-        if not soup:
-            return schedules
+    def extract_schedules(self, page: PageRequest, soup: BeautifulSoup) -> List[MovieSchedule]:
+        """スケジュール情報抽出（テキスト解析）"""
+        schedules = []
         
         body_text = soup.get_text()
         lines = body_text.split('\n')
@@ -218,9 +248,10 @@ class PolePoleHigashinakanoScraper(BaseScraper):
             if not line:
                 continue
             
+            kind, match = _SCHEDULE_LINES.classify(line)
+            
             # 日付の検出 (MM/DD形式)
-            date_match = re.match(r'(\d{2})/(\d{2})', line)
-            if date_match:
+            if kind == DATE:
                 # 前の映画のスケジュールを保存
                 if current_movie and current_times:
                     schedules.append(MovieSchedule(
@@ -234,21 +265,13 @@ class PolePoleHigashinakanoScraper(BaseScraper):
                     ))
                 
                 # 新しい日付
-                month, day = date_match.groups()
-                current_date = f"2025-{month}-{day}"
+                month, day = match.group('month'), match.group('day')
+                current_date = self.format_month_day(month, day)
                 current_times = []
                 continue
             
             # 映画タイトルの検出（特定の除外条件）
-            if (line and 
-                len(line) > 3 and
-                not any(keyword in line for keyword in [
-                    '月', '火', '水', '木', '金', '土', '日',
-                    'ポレポレ東中野', '座席表', '購入', '2D', '字幕',
-                    'もっとみる', ':', '〜', 'バリアフリー'
-                ]) and 
-                not line.isdigit() and
-                not re.match(r'^\d{1,2}:\d{2}', line)):
+            if kind == TITLE:
                 
                 # 前の映画のスケジュールを保存
                 if current_movie and current_times and current_date:
@@ -263,15 +286,14 @@ class PolePoleHigashinakanoScraper(BaseScraper):
                     ))
                 
                 # 新しい映画
-                current_movie = re.sub(r'\s*[GR12+]\s*$', '', line)
-                current_movie = re.sub(r'【.*?】', '', current_movie).strip()
+                current_movie = _RATING_SUFFIX.sub('', line)
+                current_movie = _BRACKETED.sub('', current_movie).strip()
                 current_times = []
                 continue
             
             # 時刻の検出
-            time_match = re.match(r'^(\d{1,2}:\d{2})$', line)
-            if time_match and current_movie:
-                current_times.append(time_match.group(1))
+            if kind == TIME and current_movie:
+                current_times.append(match.group(TIME))
         
         # 最後の映画のスケジュールを保存
         if current_movie and current_times and current_date:
@@ -286,29 +308,3 @@ class PolePoleHigashinakanoScraper(BaseScraper):
             ))
         
         return schedules
-        
-    def _format_date(self, date_text: str) -> str:
-        """日付フォーマット変換"""
-        try:
-            # 様々な日付形式に対応
-            date_patterns = [
-                r"(\d{1,2})/(\d{1,2})",  # MM/DD
-                r"(\d{1,2})月(\d{1,2})日",  # MM月DD日
-                r"(\d{4})-(\d{1,2})-(\d{1,2})",  # YYYY-MM-DD
-                r"(\d{1,2})\.(\d{1,2})",  # MM.DD
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, date_text)
-                if match:
-                    if len(match.groups()) == 2:
-                        month, day = match.groups()
-                        return f"2024-{int(month):02d}-{int(day):02d}"
-                    elif len(match.groups()) == 3:
-                        year, month, day = match.groups()
-                        return f"{year}-{int(month):02d}-{int(day):02d}"
-                        
-            return date_text
-            
-        except Exception:
-            return date_text
\ No newline at end of file
@@ -6,16 +6,43 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ..base_scraper import BaseScraper
+from ..base_scraper import BaseScraper, PageRequest
 from ..models import MovieInfo, ShowtimeInfo, MovieSchedule, TheaterInfo
+from ..line_classifier import LineClassifier
+
+# 映画タイトルらしい行（日時・告知・URL等を除外し、記号・カタカナ・英字を含む行）
+_TITLE_LINES = LineClassifier(
+    skip_words=[
+        '年', '月', '日', '時', '分', '～', ':',
+        'http', 'www', '.com', '@', 'トップ',
+        'お知らせ', '上映', '開催', 'トーク', '監督',
+        '先着', 'プレゼント', '決定', '追加'
+    ],
+    reject_patterns=[r'\d{1,2}[/:\-]\d{1,2}', r'(終|開)'],
+    title_markers=['！', '？', '♪', '☆'],
+    title_patterns=[r'[ァ-ヴ]+', r'[A-Za-z]{2,}'],
+    min_length=2,
+    max_length=50  # 長すぎる行は除外
+)
+
+# 実際のサイトから観察した映画タイトル（過去の結果がない場合もタイトル辞書で検出する）
+_KNOWN_MOVIES = [
+    "旅するローマ教皇",
+    "ドマーニ！愛のことづて",
+    "シンシン／SING SING",
+    "カップルズ 4Kレストア版",
+    "井口奈己監督特集"
+]
 
 class ShimotakaidoCinemaScraper(BaseScraper):
     """下高井戸シネマ スクレイパー"""
     
-    def __init__(self):
+    KNOWN_TITLES = tuple(_KNOWN_MOVIES)
+    
+    def __init__(self, theater_name: str = "下高井戸シネマ", base_url: str = "http://shimotakaidocinema.com"):
         super().__init__(
-            theater_name="下高井戸シネマ",
-            base_url="http://shimotakaidocinema.com"
+            theater_name=theater_name,
+            base_url=base_url
         )
         
     def get_theater_info(self) -> TheaterInfo:
@@ -30,16 +57,13 @@ class ShimotakaidoCinemaScraper(BaseScraper):
             screens=1
         )
         
-    def get_movies(self) -> List[MovieInfo]:
-        """映画情報取得"""
-        movies = []
+    def movie_pages(self) -> List[PageRequest]:
+        """映画情報の取得対象ページ"""
+        return [PageRequest(self.base_url)]
         
-        # メインページから映画情報取得
-        soup = self.get_page(self.base_url)
-        if soup:
-            movies.extend(self._extract_movies_from_page(soup))
-            
-        return movies
+    def extract_movies(self, page: PageRequest, soup: BeautifulSoup) -> List[MovieInfo]:
+        """映画情報抽出"""
+        return self._extract_movies_from_page(soup)
         
     def _extract_movies_from_page(self, soup: BeautifulSoup) -> List[MovieInfo]:
         """ページから映画情報抽出"""
@@ -56,39 +80,14 @@ class ShimotakaidoCinemaScraper(BaseScraper):
         for line in lines:
             line = line.strip()
             # 映画タイトルらしい行を特定
-            if (line and 
-                len(line) > 2 and 
-                not any(skip in line for skip in [
-                    '年', '月', '日', '時', '分', '～', ':', 
-                    'http', 'www', '.com', '@', 'トップ',
-                    'お知らせ', '上映', '開催', 'トーク', '監督',
-                    '先着', 'プレゼント', '決定', '追加'
-                ]) and
-                not line.isdigit() and
-                not re.match(r'^\d{1,2}[/:\-]\d{1,2}', line) and
-                not re.match(r'^(終|開)', line) and
-                len(line) < 50):  # 長すぎる行は除外
-                
-                # 特定の映画タイトルパターンを検出
-                if any(char in line for char in ['！', '？', '♪', '☆']) or \
-                   re.search(r'[ァ-ヴ]+', line) or \
-                   re.search(r'[A-Za-z]{2,}', line):
-                    
-                    # 重複チェック
-                    if line not in movie_titles:
-                        movie_titles.append(line)
-        
-        # 明示的に映画タイトルを抽出（実際のサイトから観察したもの）
-        known_movies = [
-            "旅するローマ教皇",
-            "ドマーニ！愛のことづて", 
-            "シンシン／SING SING",
-            "カップルズ 4Kレストア版",
-            "井口奈己監督特集"
-        ]
-        
-        for known_movie in known_movies:
-            if known_movie in body_text and known_movie not in movie_titles:
+            if _TITLE_LINES.is_title(line):
+                # 重複チェック
+                if line not in movie_titles:
+                    movie_titles.append(line)
+        
+        # 既知タイトル（過去の結果＋観察したもの）を本文から検出
+        for known_movie in self.title_dictionary.find(body_text):
+            if known_movie not in movie_titles:
                 movie_titles.append(known_movie)
         
         # MovieInfoオブジェクトを作成
@@ -110,7 +109,7 @@ class ShimotakaidoCinemaScraper(BaseScraper):
         movies = []
         
         # Storesサイトの商品一覧
-        item_cards = soup.find_all("div", class_="item-card") or soup.find_all("div", class_="product-card")
+        item_cards = self.selector_memo.select("item_cards", soup, ["div.item-card", "div.product-card"])
         
         for card in item_cards:
             movie = self._extract_movie_from_element(card)
@@ -197,16 +196,13 @@ class ShimotakaidoCinemaScraper(BaseScraper):
             self.logger.error(f"Error extracting movie info: {e}")
             return None
             
-    def get_schedules(self) -> List[MovieSchedule]:
-        """スケジュール情報取得"""
-        schedules = []
+    def schedule_pages(self) -> List[PageRequest]:
+        """スケジュール情報の取得対象ページ（メインページに掲載）"""
+        return [PageRequest(self.base_url)]
         
-        # メインページからスケジュール情報取得
-        soup = self.get_page(self.base_url)
-        if soup:
-            schedules.extend(self._extract_schedules_from_page(soup))
-                
-        return schedules
+    def extract_schedules(self, page: PageRequest, soup: BeautifulSoup) -> List[MovieSchedule]:
+        """スケジュール情報抽出"""
+        return self._extract_schedules_from_page(soup)
         
     def _extract_schedules_from_page(self, soup: BeautifulSoup) -> List[MovieSchedule]:
         """ページからスケジュール情報抽出"""
@@ -235,7 +231,9 @@ class ShimotakaidoCinemaScraper(BaseScraper):
                     date_match = re.search(r'(\d{1,2})/(\d{1,2})', date_range)
                     if date_match:
                         month, day = date_match.groups()
-                        formatted_date = f"2025-{int(month):02d}-{int(day):02d}"
+                        formatted_date = self.format_month_day(month, day)
+                        if not formatted_date:
+                            continue
                         
                         # 時間を正規化
                         time_normalized = showtime.replace('：', ':').replace('～', '').strip()
@@ -275,7 +273,9 @@ class ShimotakaidoCinemaScraper(BaseScraper):
                     
                     if date_match and time_matches:
                         month, day = date_match.groups()
-                        formatted_date = f"2025-{int(month):02d}-{int(day):02d}"
+                        formatted_date = self.format_month_day(month, day)
+                        if not formatted_date:
+                            continue
                         
                         schedules.append(MovieSchedule(
                             theater_name=self.theater_name,
@@ -295,14 +295,16 @@ class ShimotakaidoCinemaScraper(BaseScraper):
         schedules = []
         
         # 映画タイトル
-        title_elem = soup.find("h1") or soup.find("h2", class_="item-title")
+        title_elem = self.selector_memo.select_one("item_title", soup, ["h1", "h2.item-title"])
         movie_title = self.safe_extract_text(title_elem)
         
         if not movie_title:
             return schedules
             
         # 説明文からスケジュール情報を抽出
-        description_elem = soup.find("div", class_="item-description") or soup.find("div", class_="description")
+        description_elem = self.selector_memo.select_one(
+            "item_description", soup, ["div.item-description", "div.description"]
+        )
         description = self.safe_extract_text(description_elem)
         
         if description:
@@ -333,9 +335,8 @@ class ShimotakaidoCinemaScraper(BaseScraper):
             time_elems = pair.find_all("span", class_="time") or pair.find_all("div", class_="time")
             times = [self.safe_extract_text(elem) for elem in time_elems if self.safe_extract_text(elem)]
             
-            if date_text and times:
-                formatted_date = self._format_date(date_text)
-                
+            formatted_date = self.format_date(date_text) if date_text else None
+            if formatted_date and times:
                 showtimes.append(ShowtimeInfo(
                     date=formatted_date,
                     times=times,
@@ -356,7 +357,9 @@ class ShimotakaidoCinemaScraper(BaseScraper):
         current_times = []
         
         for date_str, time_str in matches:
-            formatted_date = self._format_date(date_str)
+            formatted_date = self.format_date(date_str)
+            if not formatted_date:
+                continue
             
             if current_date and current_date != formatted_date:
                 # 前の日付のデータを保存
@@ -379,30 +382,4 @@ class ShimotakaidoCinemaScraper(BaseScraper):
                 screen="スクリーン1"
             ))
             
-        return showtimes
-        
-    def _format_date(self, date_text: str) -> str:
-        """日付フォーマット変換"""
-        try:
-            # 様々な日付形式に対応
-            date_patterns = [
-                r"(\d{1,2})/(\d{1,2})",  # MM/DD
-                r"(\d{1,2})月(\d{1,2})日",  # MM月DD日
-                r"(\d{4})-(\d{1,2})-(\d{1,2})",  # YYYY-MM-DD
-                r"(\d{1,2})\.(\d{1,2})",  # MM.DD
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, date_text)
-                if match:
-                    if len(match.groups()) == 2:
-                        month, day = match.groups()
-                        return f"2024-{int(month):02d}-{int(day):02d}"
-                    elif len(match.groups()) == 3:
-                        year, month, day = match.groups()
-                        return f"{year}-{int(month):02d}-{int(day):02d}"
-                        
-            return date_text
-            
-        except Exception:
-            return date_text
\ No newline at end of file
+        return showtimes
\ No newline at end of file
@@ -6,16 +6,47 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ..base_scraper import BaseScraper
+from ..base_scraper import BaseScraper, PageRequest
 from ..models import MovieInfo, ShowtimeInfo, MovieSchedule, TheaterInfo
+from ..readiness import ReadinessCondition
+from ..labeled_fields import LabeledFieldExtractor
+
+# 作品情報テキスト中のラベル（1回の走査でまとめて抽出）
+_INFO_FIELDS = LabeledFieldExtractor({
+    "director": ["監督", "脚本・監督", "Director"],
+    "cast": ["出演", "キャスト", "Cast"],
+    "genre": ["ジャンル", "カテゴリー"],
+}, value_pattern=r"[^\n/]+")
+
+# 観察されたタイトル（過去の結果がない場合もタイトル辞書で検出する）
+_KNOWN_MOVIES = [
+    "「桐島です」",
+    "恋するリベラーチェ ４Ｋ",
+    "ＹＯＵＮＧ＆ＦＩＮＥ",
+    "となりの宇宙人",
+    "テルマがゆく！９３歳のやさしいリベンジ",
+    "突然、君がいなくなって",
+    "中山教頭の人生テスト",
+    "年少日記",
+    "無名の人生",
+    "ロボット・ドリームズ"
+]
 
 class ShinjukuMusashinoScraper(BaseScraper):
     """新宿武蔵野館 スクレイパー"""
     
-    def __init__(self):
+    KNOWN_TITLES = tuple(_KNOWN_MOVIES)
+    
+    # requests失敗時のSeleniumフォールバック用
+    readiness_conditions = {
+        "": [ReadinessCondition(selector="h4", min_count=3)],
+        "/schedule/": [ReadinessCondition(selector="div.movie-schedule", network_idle=True)],
+    }
+    
+    def __init__(self, theater_name: str = "新宿武蔵野館", base_url: str = "https://shinjuku.musashino-k.jp"):
         super().__init__(
-            theater_name="新宿武蔵野館",
-            base_url="https://shinjuku.musashino-k.jp"
+            theater_name=theater_name,
+            base_url=base_url
         )
         
     def get_theater_info(self) -> TheaterInfo:
@@ -51,16 +82,13 @@ class ShinjukuMusashinoScraper(BaseScraper):
             screens=2
         )
         
-    def get_movies(self) -> List[MovieInfo]:
-        """映画情報取得"""
-        movies = []
+    def movie_pages(self) -> List[PageRequest]:
+        """映画情報の取得対象ページ"""
+        return [PageRequest(self.base_url)]
         
-        # メインページから映画情報取得
-        soup = self.get_page(self.base_url)
-        if soup:
-            movies.extend(self._extract_movies_from_page(soup))
-                
-        return movies
+    def extract_movies(self, page: PageRequest, soup: BeautifulSoup) -> List[MovieInfo]:
+        """映画情報抽出"""
+        return self._extract_movies_from_page(soup)
         
     def _extract_movies_from_page(self, soup: BeautifulSoup) -> List[MovieInfo]:
         """ページから映画情報抽出"""
@@ -98,23 +126,10 @@ class ShinjukuMusashinoScraper(BaseScraper):
                 if title not in movie_titles:
                     movie_titles.append(title)
         
-        # 観察されたタイトルを明示的に追加
-        known_movies = [
-            "「桐島です」",
-            "恋するリベラーチェ ４Ｋ",
-            "ＹＯＵＮＧ＆ＦＩＮＥ", 
-            "となりの宇宙人",
-            "テルマがゆく！９３歳のやさしいリベンジ",
-            "突然、君がいなくなって",
-            "中山教頭の人生テスト",
-            "年少日記",
-            "無名の人生",
-            "ロボット・ドリームズ"
-        ]
-        
+        # 既知タイトル（過去の結果＋観察したもの）を本文から検出
         body_text = soup.get_text()
-        for known_movie in known_movies:
-            if known_movie in body_text and known_movie not in movie_titles:
+        for known_movie in self.title_dictionary.find(body_text):
+            if known_movie not in movie_titles:
                 movie_titles.append(known_movie)
         
         # MovieInfoオブジェクトを作成
@@ -157,50 +172,17 @@ class ShinjukuMusashinoScraper(BaseScraper):
             duration = None
             
             if info_text:
-                # 監督情報
-                director_patterns = [
-                    r"監督[：:]([^\n/]+)",
-                    r"脚本・監督[：:]([^\n/]+)",
-                    r"Director[：:]([^\n/]+)"
-                ]
+                labeled = _INFO_FIELDS.extract(info_text)
+                director = labeled.get("director", "")
+                if "cast" in labeled:
+                    cast = [c.strip() for c in re.split(r"[,、]", labeled["cast"]) if c.strip()]
+                genre = labeled.get("genre", "")
                 
-                for pattern in director_patterns:
-                    match = re.search(pattern, info_text)
-                    if match:
-                        director = match.group(1).strip()
-                        break
-                        
-                # 出演者情報
-                cast_patterns = [
-                    r"出演[：:]([^\n/]+)",
-                    r"キャスト[：:]([^\n/]+)",
-                    r"Cast[：:]([^\n/]+)"
-                ]
-                
-                for pattern in cast_patterns:
-                    match = re.search(pattern, info_text)
-                    if match:
-                        cast_text = match.group(1).strip()
-                        cast = [c.strip() for c in re.split(r"[,、]", cast_text) if c.strip()]
-                        break
-                        
                 # 上映時間
                 duration_match = re.search(r"(\d+)分", info_text)
                 if duration_match:
                     duration = int(duration_match.group(1))
                     
-                # ジャンル情報
-                genre_patterns = [
-                    r"ジャンル[：:]([^\n/]+)",
-                    r"カテゴリー[：:]([^\n/]+)"
-                ]
-                
-                for pattern in genre_patterns:
-                    match = re.search(pattern, info_text)
-                    if match:
-                        genre = match.group(1).strip()
-                        break
-                        
             # あらすじ
             synopsis_elem = element.find("div", class_="synopsis") or element.find("p", class_="description")
             if synopsis_elem:
@@ -234,31 +216,27 @@ class ShinjukuMusashinoScraper(BaseScraper):
             self.logger.error(f"Error extracting movie info: {e}")
             return None
             
-    def get_schedules(self) -> List[MovieSchedule]:
-        """スケジュール情報取得"""
-        schedules = []
+    def schedule_pages(self) -> List[PageRequest]:
+        """スケジュール情報の取得対象ページ（取得できなければSeleniumで再取得）"""
+        return [
+            PageRequest(f"{self.base_url}/schedule/", label="schedule", fallback_render=True),
+            # メインページからもスケジュール情報を確認
+            PageRequest(self.base_url, fallback_render=True),
+        ]
         
-        # スケジュールページを取得
-        schedule_soup = self.get_page(f"{self.base_url}/schedule/") or self.get_page_with_selenium(f"{self.base_url}/schedule/")
-        if schedule_soup:
-            schedules.extend(self._extract_schedules_from_page(schedule_soup))
-            
-        # メインページからもスケジュール情報を確認
-        main_soup = self.get_page(self.base_url) or self.get_page_with_selenium(self.base_url)
-        if main_soup:
-            schedules.extend(self._extract_schedules_from_page(main_soup))
-            
-        return schedules
+    def extract_schedules(self, page: PageRequest, soup: BeautifulSoup) -> List[MovieSchedule]:
+        """スケジュール情報抽出"""
+        return self._extract_schedules_from_page(soup)
         
     def _extract_schedules_from_page(self, soup: BeautifulSoup) -> List[MovieSchedule]:
         """ページからスケジュール情報抽出"""
         schedules = []
         
         # スケジュール情報を含む要素を検索
-        schedule_elements = (soup.find_all("div", class_="schedule") or 
-                           soup.find_all("table", class_="schedule") or
-                           soup.find_all("div", class_="timetable") or
-                           soup.find_all("section", class_="schedule-section"))
+        schedule_elements = self.selector_memo.select(
+            "schedule_elements", soup,
+            ["div.schedule", "table.schedule", "div.timetable", "section.schedule-section"]
+        )
         
         # スケジュールテーブルも確認
         schedule_tables = soup.find_all("table")
@@ -309,7 +287,7 @@ class ShinjukuMusashinoScraper(BaseScraper):
                     times = [self.safe_extract_text(cell) for cell in time_cells if self.safe_extract_text(cell)]
                     
                     if date_text and times:
-                        formatted_date = self._format_date(date_text)
+                        formatted_date = self.format_date(date_text)
                         if formatted_date:
                             showtimes.append(ShowtimeInfo(
                                 date=formatted_date,
@@ -334,7 +312,7 @@ class ShinjukuMusashinoScraper(BaseScraper):
                 screen = self.safe_extract_text(screen_elem) if screen_elem else "スクリーン1"
                 
                 if date_text and times:
-                    formatted_date = self._format_date(date_text)
+                    formatted_date = self.format_date(date_text)
                     if formatted_date:
                         showtimes.append(ShowtimeInfo(
                             date=formatted_date,
@@ -342,30 +320,4 @@ class ShinjukuMusashinoScraper(BaseScraper):
                             screen=screen
                         ))
                         
-        return showtimes
-        
-    def _format_date(self, date_text: str) -> str:
-        """日付フォーマット変換"""
-        try:
-            # 様々な日付形式に対応
-            date_patterns = [
-                r"(\d{1,2})/(\d{1,2})",  # MM/DD
-                r"(\d{1,2})月(\d{1,2})日",  # MM月DD日
-                r"(\d{4})-(\d{1,2})-(\d{1,2})",  # YYYY-MM-DD
-                r"(\d{1,2})\.(\d{1,2})",  # MM.DD
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, date_text)
-                if match:
-                    if len(match.groups()) == 2:
-                        month, day = match.groups()
-                        return f"2024-{int(month):02d}-{int(day):02d}"
-                    elif len(match.groups()) == 3:
-                        year, month, day = match.groups()
-                        return f"{year}-{int(month):02d}-{int(day):02d}"
-                        
-            return ""
-            
-        except Exception:
-            return ""
\ No newline at end of file
+        return showtimes
\ No newline at end of file
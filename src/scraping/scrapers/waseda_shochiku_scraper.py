@@ -6,16 +6,42 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ..base_scraper import BaseScraper
+from ..base_scraper import BaseScraper, PageRequest
 from ..models import MovieInfo, ShowtimeInfo, MovieSchedule, TheaterInfo
+from ..line_classifier import LineClassifier
+
+# 映画タイトルらしい行（名画座特有のパターンを考慮）
+_TITLE_LINES = LineClassifier(
+    skip_words=[
+        'official', 'web', 'site', '名画座', '高田馬場',
+        '年', '月', '日', '時', '分', ':',
+        'http', 'www', '.com', '@'
+    ],
+    reject_patterns=[r'\d{1,2}[/:\-]\d{1,2}'],
+    # 特殊文字や外国語タイトルを検出
+    title_markers=['＋', '＆', '・'],
+    title_patterns=[r'[ァ-ヴ]+', r'[A-Za-z]{3,}'],
+    non_ascii_ratio=0.3,  # 日本語文字が多い
+    min_length=3,
+    max_length=50
+)
+
+# 観察されたタイトル（過去の結果がない場合もタイトル辞書で検出する）
+_KNOWN_MOVIES = [
+    "惑星ソラリス",
+    "ラ・ジュテ",
+    "ジュ・テーム、ジュ・テーム"
+]
 
 class WasedaShochikuScraper(BaseScraper):
     """早稲田松竹 スクレイパー"""
     
-    def __init__(self):
+    KNOWN_TITLES = tuple(_KNOWN_MOVIES)
+    
+    def __init__(self, theater_name: str = "早稲田松竹", base_url: str = "http://wasedashochiku.co.jp"):
         super().__init__(
-            theater_name="早稲田松竹",
-            base_url="http://wasedashochiku.co.jp"
+            theater_name=theater_name,
+            base_url=base_url
         )
         
     def get_theater_info(self) -> TheaterInfo:
@@ -30,16 +56,13 @@ class WasedaShochikuScraper(BaseScraper):
             screens=1
         )
         
-    def get_movies(self) -> List[MovieInfo]:
-        """映画情報取得"""
-        movies = []
+    def movie_pages(self) -> List[PageRequest]:
+        """映画情報の取得対象ページ"""
+        return [PageRequest(self.base_url)]
         
-        # メインページから映画情報取得（requestsを使用）
-        soup = self.get_page(self.base_url)
-        if soup:
-            movies.extend(self._extract_movies_from_page(soup))
-                
-        return movies
+    def extract_movies(self, page: PageRequest, soup: BeautifulSoup) -> List[MovieInfo]:
+        """映画情報抽出"""
+        return self._extract_movies_from_page(soup)
         
     def _extract_movies_from_page(self, soup: BeautifulSoup) -> List[MovieInfo]:
         """ページから映画情報抽出"""
@@ -55,36 +78,15 @@ class WasedaShochikuScraper(BaseScraper):
         for line in lines:
             line = line.strip()
             # 映画タイトルらしい行を特定（名画座特有のパターンを考慮）
-            if (line and 
-                len(line) > 3 and 
-                len(line) < 50 and
-                not any(skip in line for skip in [
-                    'official', 'web', 'site', '名画座', '高田馬場',
-                    '年', '月', '日', '時', '分', ':', 
-                    'http', 'www', '.com', '@'
-                ]) and
-                not line.isdigit() and
-                not re.match(r'^\d{1,2}[/:\-]\d{1,2}', line) and
-                # 特殊文字や外国語タイトルを検出
-                (any(char in line for char in ['＋', '＆', '・']) or
-                 re.search(r'[ァ-ヴ]+', line) or
-                 re.search(r'[A-Za-z]{3,}', line) or
-                 len([c for c in line if ord(c) > 127]) > len(line) * 0.3)):  # 日本語文字が多い
-                
+            if _TITLE_LINES.is_title(line):
                 # 重複チェック
                 if line not in movie_titles:
                     movie_titles.append(line)
         
-        # 観察されたタイトルパターンも明示的に追加
-        known_patterns = [
-            "惑星ソラリス",
-            "ラ・ジュテ",
-            "ジュ・テーム、ジュ・テーム"
-        ]
-        
-        for pattern in known_patterns:
-            if pattern in body_text and pattern not in movie_titles:
-                movie_titles.append(pattern)
+        # 既知タイトル（過去の結果＋観察したもの）を本文から検出
+        for known_movie in self.title_dictionary.find(body_text):
+            if known_movie not in movie_titles:
+                movie_titles.append(known_movie)
         
         # 二本立て映画のパターンを検出
         double_feature_patterns = re.findall(r'([^\n]+)\s*\+\s*([^\n]+)', body_text)
@@ -219,16 +221,13 @@ class WasedaShochikuScraper(BaseScraper):
             self.logger.error(f"Error extracting movie info: {e}")
             return None
             
-    def get_schedules(self) -> List[MovieSchedule]:
-        """スケジュール情報取得"""
-        schedules = []
+    def schedule_pages(self) -> List[PageRequest]:
+        """スケジュール情報の取得対象ページ（メインページに掲載）"""
+        return [PageRequest(self.base_url)]
         
-        # メインページからスケジュール情報取得
-        soup = self.get_page(self.base_url)
-        if soup:
-            schedules.extend(self._extract_schedules_from_page(soup))
-            
-        return schedules
+    def extract_schedules(self, page: PageRequest, soup: BeautifulSoup) -> List[MovieSchedule]:
+        """スケジュール情報抽出"""
+        return self._extract_schedules_from_page(soup)
         
     def _extract_schedules_from_page(self, soup: BeautifulSoup) -> List[MovieSchedule]:
         """ページからスケジュール情報抽出"""
@@ -252,10 +251,8 @@ class WasedaShochikuScraper(BaseScraper):
             
             # 日付から最初の日付を抽出
             date_match = re.search(r'(\d{1,2})/(\d{1,2})', date_info)
-            if date_match:
-                month, day = date_match.groups()
-                formatted_date = f"2025-{int(month):02d}-{int(day):02d}"
-                
+            formatted_date = self.format_month_day(*date_match.groups()) if date_match else None
+            if formatted_date:
                 # 時間を抽出
                 times = re.findall(r'(\d{1,2}:\d{2})', time_info) if time_info else ["14:30", "19:00"]
                 
@@ -306,12 +303,10 @@ class WasedaShochikuScraper(BaseScraper):
                     
                     # 日付パターンを検索
                     dates = re.findall(r'(\d{1,2})/(\d{1,2})', surrounding_text)
-                    if dates:
-                        month, day = dates[0]
-                        formatted_date = f"2025-{int(month):02d}-{int(day):02d}"
-                    else:
-                        # デフォルト日付
-                        formatted_date = "2025-07-05"
+                    formatted_date = self.format_month_day(*dates[0]) if dates else None
+                    if not formatted_date:
+                        # 日付のわからない上映回は取得日とみなさず除外する
+                        continue
                     
                     schedules.append(MovieSchedule(
                         theater_name=self.theater_name,
@@ -359,9 +354,9 @@ class WasedaShochikuScraper(BaseScraper):
             matches = re.findall(pattern, content)
             for match in matches:
                 if len(match) == 2:
-                    month, day = match
-                    formatted_date = f"2024-{int(month):02d}-{int(day):02d}"
-                    dates.append(formatted_date)
+                    formatted_date = self.format_month_day(*match)
+                    if formatted_date:
+                        dates.append(formatted_date)
                 elif len(match) == 3:
                     year, month, day = match
                     formatted_date = f"{year}-{int(month):02d}-{int(day):02d}"
@@ -371,11 +366,6 @@ class WasedaShochikuScraper(BaseScraper):
         if not times:
             times = ["14:30", "19:00"]  # 名画座の一般的な上映時間
             
-        # 日付が見つからない場合は今日の日付を使用
-        if not dates:
-            today = datetime.now()
-            dates = [today.strftime("%Y-%m-%d")]
-            
         # 各日付に対して上映時間を設定
         for date in dates:
             if times:
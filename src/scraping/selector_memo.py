@@ -0,0 +1,177 @@
+"""
+サイト別のセレクタ採用記録（前回一致したフォールバック候補を優先して試す）
+"""
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import soupsieve
+
+_compiled: Dict[str, Any] = {}
+_compiled_lock = threading.Lock()
+
+
+def _compile(selector: str):
+    """コンパイル済みセレクタ（プロセス内で共有）"""
+    with _compiled_lock:
+        if selector not in _compiled:
+            _compiled[selector] = soupsieve.compile(selector)
+        return _compiled[selector]
+
+
+class SelectorMemo:
+    """1サイト分のセレクタ採用記録
+
+    slotごとに前回一致したセレクタを記録し、次回はそれを最初に試す。
+    外れた場合のみ残りの候補を宣言順に試す。
+    hits: 記録済みセレクタで一致 / misses: 他の候補を試す必要があった
+    """
+
+    def __init__(self, site: str):
+        self.site = site
+        self._winners: Dict[str, str] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._delta: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        with self._lock:
+            return {"site": self.site, "_winners": dict(self._winners), "_stats": {}}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._delta = {}
+        self._lock = threading.Lock()
+
+    def select(self, slot: str, root, selectors: List[str]) -> List[Any]:
+        """最初に一致した候補の全要素（どれも一致しなければ空リスト）"""
+        return self._probe(slot, selectors, lambda selector: _compile(selector).select(root)) or []
+
+    def select_one(self, slot: str, root, selectors: List[str]) -> Optional[Any]:
+        """最初に一致した候補の最初の要素"""
+        return self._probe(slot, selectors, lambda selector: _compile(selector).select_one(root))
+
+    def _probe(self, slot: str, selectors: List[str], run):
+        with self._lock:
+            winner = self._winners.get(slot)
+        order = [winner] + [s for s in selectors if s != winner] if winner in selectors else list(selectors)
+
+        for index, selector in enumerate(order):
+            found = run(selector)
+            if found:
+                self._record(slot, selector, hit=index == 0)
+                return found
+        self._record(slot, None, hit=False)
+        return None
+
+    def _record(self, slot: str, selector: Optional[str], hit: bool):
+        with self._lock:
+            stats = self._stats.setdefault(slot, {"hits": 0, "misses": 0})
+            delta = self._delta.setdefault(slot, {"winner": None, "hits": 0, "misses": 0})
+            key = "hits" if hit else "misses"
+            stats[key] += 1
+            delta[key] += 1
+            if selector is not None:
+                self._winners[slot] = selector
+                delta["winner"] = selector
+
+    def drain_delta(self) -> Dict[str, Dict[str, Any]]:
+        """前回取得以降の変更分（解析プロセスから親プロセスへ返す）"""
+        with self._lock:
+            delta, self._delta = self._delta, {}
+            return delta
+
+    def merge(self, delta: Dict[str, Dict[str, Any]]):
+        """解析プロセスでの変更分を反映"""
+        with self._lock:
+            for slot, change in delta.items():
+                stats = self._stats.setdefault(slot, {"hits": 0, "misses": 0})
+                stats["hits"] += change.get("hits", 0)
+                stats["misses"] += change.get("misses", 0)
+                if change.get("winner"):
+                    self._winners[slot] = change["winner"]
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """slotごとの採用セレクタと的中数"""
+        with self._lock:
+            slots = set(self._winners) | set(self._stats)
+            return {
+                slot: {"winner": self._winners.get(slot), **self._stats.get(slot, {"hits": 0, "misses": 0})}
+                for slot in sorted(slots)
+            }
+
+    def restore(self, data: Dict[str, Dict[str, Any]]):
+        """保存済みの採用セレクタを復元（的中数は実行ごとに数え直す）"""
+        with self._lock:
+            for slot, entry in data.items():
+                if entry.get("winner"):
+                    self._winners[slot] = entry["winner"]
+
+
+class SelectorMemoRegistry:
+    """サイト別セレクタ採用記録の管理（logs/に永続化）"""
+
+    def __init__(self, state_path: Optional[str] = "logs/selector_memo.json"):
+        self.state_path = Path(state_path) if state_path else None
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._memos: Dict[str, SelectorMemo] = {}
+        self._saved: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """保存済み記録を読み込み"""
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self._saved = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Failed to load selector memo: {e}")
+
+    def get(self, site: str) -> SelectorMemo:
+        """サイトの記録を取得"""
+        with self._lock:
+            if site not in self._memos:
+                memo = SelectorMemo(site)
+                if site in self._saved:
+                    memo.restore(self._saved[site])
+                self._memos[site] = memo
+            return self._memos[site]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """全サイトの記録"""
+        with self._lock:
+            memos = list(self._memos.items())
+        return {site: memo.to_dict() for site, memo in memos}
+
+    def save(self):
+        """記録を保存"""
+        if not self.state_path:
+            return
+        data = dict(self._saved)
+        data.update(self.snapshot())
+        try:
+            with self._lock:
+                self.state_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.state_path.with_suffix(".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                tmp_path.replace(self.state_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to save selector memo: {e}")
+
+
+_registry: Optional[SelectorMemoRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_selector_memo_registry() -> SelectorMemoRegistry:
+    """プロセス共有のセレクタ採用記録を取得"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SelectorMemoRegistry()
+        return _registry
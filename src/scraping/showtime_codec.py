@@ -0,0 +1,163 @@
+"""
+上映回のランレングス表現（保存用）
+
+同じ時刻割りが続く日付を「期間＋曜日＋共通の時刻」の1項目にまとめる。
+
+    {"from": "2025-07-05", "to": "2025-07-18", "weekdays": "月火水木金土",
+     "times": ["10:40", "16:15"], "screen": "スクリーン1", "ticket_url": null}
+
+weekdaysは期間内で上映する曜日（全曜日の場合は省略）。1日だけの上映回は従来どおり
+{"date": ..., "times": ...} の形で保存するため、読み込み側は両方の形式を受け付ける。
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .date_normalizer import parse_iso_date
+from .models import ShowtimeInfo
+
+WEEKDAY_NAMES = "月火水木金土日"
+ALL_WEEKDAYS = 0b1111111
+
+
+def _weekday_mask(names: Optional[str]) -> int:
+    if not names:
+        return ALL_WEEKDAYS
+    mask = 0
+    for name in names:
+        index = WEEKDAY_NAMES.find(name)
+        if index >= 0:
+            mask |= 1 << index
+    return mask or ALL_WEEKDAYS
+
+
+def _weekday_names(mask: int) -> str:
+    return "".join(name for index, name in enumerate(WEEKDAY_NAMES) if mask & (1 << index))
+
+
+@dataclass
+class ShowtimeRun:
+    """期間内の指定曜日に同じ時刻で上映する上映回"""
+    start: date
+    end: date
+    weekdays: int
+    times: List[str]
+    screen: Optional[str] = None
+    ticket_url: Optional[str] = None
+
+    def dates(self) -> Iterator[date]:
+        """上映日（期間内で曜日が一致する日）"""
+        day = self.start
+        while day <= self.end:
+            if self.weekdays & (1 << day.weekday()):
+                yield day
+            day += timedelta(days=1)
+
+    def showtimes(self) -> Iterator[ShowtimeInfo]:
+        """日付ごとの上映回に展開"""
+        for day in self.dates():
+            yield ShowtimeInfo(date=day.isoformat(), times=list(self.times), screen=self.screen,
+                               ticket_url=self.ticket_url, date_value=day)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """保存形式（1日だけなら従来の形式）"""
+        if self.start == self.end:
+            return {"date": self.start.isoformat(), "times": self.times,
+                    "screen": self.screen, "ticket_url": self.ticket_url}
+        data: Dict[str, Any] = {"from": self.start.isoformat(), "to": self.end.isoformat()}
+        if self.weekdays != ALL_WEEKDAYS:
+            data["weekdays"] = _weekday_names(self.weekdays)
+        data.update({"times": self.times, "screen": self.screen, "ticket_url": self.ticket_url})
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional["ShowtimeRun"]:
+        """保存形式から復元（期間の形式でなければNone）"""
+        start, end = parse_iso_date(data.get("from")), parse_iso_date(data.get("to"))
+        if start is None or end is None:
+            return None
+        return cls(start=start, end=end, weekdays=_weekday_mask(data.get("weekdays")),
+                   times=list(data.get("times") or []), screen=data.get("screen"),
+                   ticket_url=data.get("ticket_url"))
+
+
+def encode_showtimes(showtimes: Iterable[ShowtimeInfo]) -> List[ShowtimeRun]:
+    """上映回をランにまとめる
+
+    時刻・スクリーン・チケットURLが同じ上映回を日付順に見て、期間内の
+    上映しない日の曜日と上映する日の曜日が重ならない限り同じランに含める。
+    日付を解釈できない上映回は1日分のランにせず、そのまま末尾に残す（encode_showtime_dicts参照）。
+    """
+    patterns: Dict[Tuple, List[date]] = {}
+    for showtime in showtimes:
+        if showtime.date_value is None:
+            continue
+        key = (tuple(showtime.times), showtime.screen, showtime.ticket_url)
+        patterns.setdefault(key, []).append(showtime.date_value)
+
+    runs: List[ShowtimeRun] = []
+    for (times, screen, ticket_url), days in patterns.items():
+        days = sorted(set(days))
+        start = previous = days[0]
+        shown, skipped = 1 << start.weekday(), 0
+        for day in days[1:]:
+            gap = 0
+            for offset in range(1, min((day - previous).days, 8)):
+                gap |= 1 << (previous + timedelta(days=offset)).weekday()
+            weekday = 1 << day.weekday()
+            if (shown | weekday) & (skipped | gap):
+                runs.append(ShowtimeRun(start, previous, shown, list(times), screen, ticket_url))
+                start, shown, skipped = day, weekday, 0
+            else:
+                shown |= weekday
+                skipped |= gap
+            previous = day
+        runs.append(ShowtimeRun(start, previous, shown, list(times), screen, ticket_url))
+
+    runs.sort(key=lambda run: (run.start, run.screen or ""))
+    return runs
+
+
+def encode_showtime_dicts(showtimes: List[ShowtimeInfo]) -> List[Dict[str, Any]]:
+    """上映回を保存形式の辞書リストにする"""
+    encoded = [run.to_dict() for run in encode_showtimes(showtimes)]
+    for showtime in showtimes:
+        if showtime.date_value is None:
+            encoded.append({"date": showtime.date, "times": showtime.times,
+                            "screen": showtime.screen, "ticket_url": showtime.ticket_url})
+    return encoded
+
+
+def iter_showtime_dicts(showtimes: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """保存形式（期間・従来の両形式）を1日ずつの辞書に展開（必要になった分だけ展開する）"""
+    for data in showtimes or []:
+        run = ShowtimeRun.from_dict(data) if "from" in data else None
+        if run is None:
+            yield data
+            continue
+        for day in run.dates():
+            yield {"date": day.isoformat(), "times": list(run.times),
+                   "screen": run.screen, "ticket_url": run.ticket_url}
+
+
+def _showtime_order(showtime: ShowtimeInfo) -> Tuple:
+    """上映回の並び順（日付・スクリーン順、日付を解釈できない上映回は元の順で末尾）"""
+    return (showtime.date_value is None, showtime.date_value or date.min, showtime.screen or "")
+
+
+def decode_showtimes(showtimes: Iterable[Dict[str, Any]]) -> List[ShowtimeInfo]:
+    """保存形式（期間・従来の両形式）をShowtimeInfoに展開（日付・スクリーン順）
+
+    ランは開始日順に保存されるため、展開しただけでは日付が前後する。統合済みの上映回
+    （ScheduleMergerの結果）と同じ順に並べ直し、decode(encode(x)) == x とする。
+    """
+    decoded: List[ShowtimeInfo] = []
+    for data in showtimes or []:
+        run = ShowtimeRun.from_dict(data) if "from" in data else None
+        if run is not None:
+            decoded.extend(run.showtimes())
+        else:
+            decoded.append(ShowtimeInfo(date=data.get("date", ""), times=data.get("times", []),
+                                        screen=data.get("screen"), ticket_url=data.get("ticket_url")))
+    decoded.sort(key=_showtime_order)
+    return decoded
@@ -0,0 +1,381 @@
+"""
+スクレイピング結果ファイルの目録（output/catalog.json）
+
+結果ファイルを保存するたびに、キー（映画館キーまたは all_theaters）・取得日時・
+内容ハッシュ・サイズ・状態を目録に追記する。「映画館ごとの最新」「期間内の結果」は
+ディレクトリを走査せずに目録の索引から引く。目録がなければ初回に一度だけ走査して作る。
+
+圧縮・整理（snapshot_compaction）後の項目は、同じ内容の別の項目への参照（ref）や
+期間アーカイブ（archive）の中身を指す。読み込みは load() がどちらも解決する。
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import zipfile
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .file_lock import file_lock
+from .snapshot_files import COMBINED_KEY, SUMMARY_KEY, parse_snapshot_name, result_hash
+
+CATALOG_FILE = "catalog.json"
+CATALOG_LOCK = "catalog.lock"
+CATALOG_VERSION = 1
+
+# 期間アーカイブの置き場所（output_dirからの相対）とアーカイブ内の目次・内容のパス
+ARCHIVE_DIR = "archive"
+ARCHIVE_INDEX = "index.json"
+
+
+def archive_member(entry: "CatalogEntry") -> str:
+    """アーカイブ内の内容のパス
+
+    映画館別の結果は内容ハッシュで1件だけ持つ。all_theatersは映画館ごとの取得日時・状態を
+    含み内容ハッシュが同じでも回ごとに中身が違うため、回ごとに持つ。
+    """
+    if entry.key == COMBINED_KEY:
+        return f"combined/{Path(entry.file).name}"
+    return f"objects/{entry.content_hash}.json"
+
+
+@dataclass
+class CatalogEntry:
+    """結果ファイル1件"""
+    file: str  # output_dirからの相対パス
+    key: str
+    scraped_at: str  # ISO形式
+    content_hash: str
+    size: int
+    status: str
+    theaters: List[str] = field(default_factory=list)  # all_theatersの場合、結果のあった映画館
+    ref: str = ""  # 同じ内容の項目のfile（重複を削除した場合）
+    archive: str = ""  # 内容を収めた期間アーカイブ（output_dirからの相対パス）
+
+    @property
+    def stored(self) -> bool:
+        """結果ファイルとしてそのまま残っているか"""
+        return not self.ref and not self.archive
+
+    @property
+    def time(self) -> datetime:
+        return datetime.fromisoformat(self.scraped_at)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CatalogEntry":
+        return cls(
+            file=data["file"],
+            key=data["key"],
+            scraped_at=data["scraped_at"],
+            content_hash=data.get("content_hash", ""),
+            size=data.get("size", 0),
+            status=data.get("status", "complete"),
+            theaters=data.get("theaters", []),
+            ref=data.get("ref", ""),
+            archive=data.get("archive", "")
+        )
+
+
+def _combined_hash(results: Dict[str, Any]) -> str:
+    """全映画館分の結果の内容ハッシュ（映画館ごとのハッシュから作る）"""
+    digests = {key: result_hash(result) for key, result in results.items() if result}
+    text = json.dumps(digests, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def describe_result(key: str, result: Dict[str, Any], scraped_at: datetime) -> Dict[str, Any]:
+    """結果の内容から目録の項目（ファイル・サイズ以外）を作る"""
+    if key == COMBINED_KEY:
+        statuses = [value.get("status", "complete") for value in result.values() if value]
+        return {
+            "scraped_at": scraped_at.isoformat(),
+            "content_hash": _combined_hash(result),
+            "status": "partial" if "partial" in statuses or len(statuses) < len(result) else "complete",
+            "theaters": [theater_key for theater_key, value in result.items() if value]
+        }
+    return {
+        "scraped_at": result.get("scraped_at") or scraped_at.isoformat(),
+        "content_hash": result_hash(result),
+        "status": result.get("status", "complete"),
+        "theaters": []
+    }
+
+
+class SnapshotCatalog:
+    """結果ファイルの目録"""
+
+    def __init__(self, output_dir: str = "output"):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / CATALOG_FILE
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._by_key: Dict[str, List[CatalogEntry]] = {}
+        self._loaded_mtime: Optional[float] = None
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._load()
+
+    # ---- 読み込み・保存 ----
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """目録の読み直し・変更・保存を、スレッド間とプロセス間（ロックファイル）で排他する
+
+        同じスレッド内の入れ子では、ロックファイルは最も外側でのみ取る。
+        """
+        with self._lock:
+            if self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            with file_lock(self.output_dir / CATALOG_LOCK):
+                self._lock_depth = 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth = 0
+
+    def _read(self) -> bool:
+        """目録ファイルを読み込み（ない・読めない場合はFalse）"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                mtime = os.fstat(f.fileno()).st_mtime
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            self.logger.warning(f"Failed to load snapshot catalog: {e}")
+            return False
+        self._set_entries(CatalogEntry.from_dict(item) for item in data.get("entries", []))
+        self._loaded_mtime = mtime
+        return True
+
+    def _load(self):
+        """目録を読み込み（なければ結果ファイルを走査して作る）"""
+        with self._lock:
+            if self._read():
+                return
+            # 作り直しは1プロセスだけが行う（待っている間に作られていれば読むだけ）
+            with self._exclusive():
+                if not self._read():
+                    self.rebuild()
+
+    def _reload_if_changed(self):
+        """別のプロセスが目録を更新していれば読み直す"""
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime != self._loaded_mtime:
+            self._load()
+
+    def _set_entries(self, entries: Iterable[CatalogEntry]):
+        self._entries = {entry.file: entry for entry in entries}
+        self._by_key = {}
+        for entry in self._entries.values():
+            self._by_key.setdefault(entry.key, []).append(entry)
+        for items in self._by_key.values():
+            items.sort(key=lambda entry: (entry.scraped_at, entry.file))
+
+    def save(self):
+        """目録を保存（書き手ごとの一時ファイルに書いてから置き換える）"""
+        with self._exclusive():
+            data = {
+                "version": CATALOG_VERSION,
+                "entries": [asdict(entry) for entry in sorted(self._entries.values(), key=lambda e: (e.key, e.scraped_at))]
+            }
+            tmp_name = None
+            try:
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.output_dir,
+                                                 prefix=".catalog.", suffix=".tmp", delete=False) as f:
+                    tmp_name = f.name
+                    json.dump(data, f, ensure_ascii=False, indent=1)
+                os.replace(tmp_name, self.path)
+                tmp_name = None
+                self._loaded_mtime = self.path.stat().st_mtime
+            except Exception as e:
+                self.logger.warning(f"Failed to save snapshot catalog: {e}")
+            finally:
+                if tmp_name:
+                    try:
+                        os.remove(tmp_name)
+                    except OSError:
+                        pass
+
+    def rebuild(self):
+        """output_dir内の結果ファイルを走査して目録を作り直す"""
+        entries = []
+        if self.output_dir.is_dir():
+            for path in sorted(self.output_dir.glob("*.json")):
+                parsed = parse_snapshot_name(path)
+                if not parsed or parsed[0] == SUMMARY_KEY:
+                    continue
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        result = json.load(f)
+                except Exception as e:
+                    self.logger.warning(f"Skipping unreadable snapshot {path.name}: {e}")
+                    continue
+                entries.append(self._entry(path, parsed[0], result, parsed[1]))
+        entries.extend(self._archived_entries())
+        with self._exclusive():
+            self._set_entries(entries)
+            self.save()
+        self.logger.info(f"Rebuilt snapshot catalog: {len(entries)} files")
+
+    def _archived_entries(self) -> List[CatalogEntry]:
+        """期間アーカイブの目次にある項目"""
+        entries = []
+        archive_dir = self.output_dir / ARCHIVE_DIR
+        if not archive_dir.is_dir():
+            return entries
+        for path in sorted(archive_dir.glob("*.zip")):
+            relative = Path(os.path.relpath(path, self.output_dir)).as_posix()
+            try:
+                with zipfile.ZipFile(path) as archive:
+                    index = json.loads(archive.read(ARCHIVE_INDEX))
+            except Exception as e:
+                self.logger.warning(f"Skipping unreadable archive {path.name}: {e}")
+                continue
+            for item in index.get("entries", []):
+                entry = CatalogEntry.from_dict(item)
+                entry.archive = relative
+                entries.append(entry)
+        return entries
+
+    def _entry(self, path: Path, key: str, result: Dict[str, Any], scraped_at: datetime) -> CatalogEntry:
+        return CatalogEntry(
+            file=Path(os.path.relpath(path, self.output_dir)).as_posix(),
+            key=key,
+            size=path.stat().st_size,
+            **describe_result(key, result, scraped_at)
+        )
+
+    # ---- 更新 ----
+
+    def add(self, path, result: Dict[str, Any], key: Optional[str] = None) -> Optional[CatalogEntry]:
+        """保存した結果ファイルを目録に追加"""
+        path = Path(path)
+        parsed = parse_snapshot_name(path)
+        key = key or (parsed[0] if parsed else path.stem)
+        scraped_at = parsed[1] if parsed else datetime.now()
+        try:
+            entry = self._entry(path, key, result, scraped_at)
+        except OSError as e:
+            self.logger.warning(f"Failed to catalog {path.name}: {e}")
+            return None
+        with self._exclusive():
+            self._reload_if_changed()
+            self._entries[entry.file] = entry
+            self._set_entries(list(self._entries.values()))
+            self.save()
+        return entry
+
+    def put(self, entries: Iterable[CatalogEntry]):
+        """項目を追加・置き換え（圧縮・整理で保存場所が変わった場合など）"""
+        with self._exclusive():
+            self._reload_if_changed()
+            for entry in entries:
+                self._entries[entry.file] = entry
+            self._set_entries(list(self._entries.values()))
+            self.save()
+
+    def remove(self, files: Iterable[str]):
+        """目録から削除（ファイル自体は消さない）"""
+        with self._exclusive():
+            self._reload_if_changed()
+            for file in files:
+                self._entries.pop(file, None)
+            self._set_entries(list(self._entries.values()))
+            self.save()
+
+    # ---- 参照 ----
+
+    def entries(self, key: Optional[str] = None) -> List[CatalogEntry]:
+        """項目（取得日時順）"""
+        with self._lock:
+            if key is not None:
+                return list(self._by_key.get(key, []))
+            return sorted(self._entries.values(), key=lambda entry: (entry.scraped_at, entry.file))
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._by_key)
+
+    def latest(self, key: str) -> Optional[CatalogEntry]:
+        """キーの最新の項目"""
+        with self._lock:
+            items = self._by_key.get(key)
+            return items[-1] if items else None
+
+    def latest_per_theater(self) -> Dict[str, CatalogEntry]:
+        """映画館ごとの最新の項目（all_theatersを除く）"""
+        with self._lock:
+            return {key: items[-1] for key, items in self._by_key.items() if key != COMBINED_KEY and items}
+
+    def in_range(self, key: str, start: datetime, end: datetime) -> List[CatalogEntry]:
+        """start以上end以下に取得した項目"""
+        with self._lock:
+            items = self._by_key.get(key, [])
+            times = [entry.scraped_at for entry in items]
+            return items[bisect_left(times, start.isoformat()):bisect_right(times, end.isoformat())]
+
+    def get(self, file: str) -> Optional[CatalogEntry]:
+        with self._lock:
+            return self._entries.get(file)
+
+    def load(self, entry: CatalogEntry) -> Dict[str, Any]:
+        """項目の結果を読み込み（参照・アーカイブも解決する）
+
+        参照先・アーカイブの内容は同じ内容の別の回のものなので、映画館別の結果は
+        取得日時・状態をこの項目のものに置き換えて返す（all_theatersは重複削除せず、
+        アーカイブにも回ごとに持つため、そのまま返す）。
+        """
+        if entry.stored:
+            with open(self.output_dir / entry.file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        if entry.archive:
+            with zipfile.ZipFile(self.output_dir / entry.archive) as archive:
+                result = json.loads(archive.read(archive_member(entry)))
+        else:
+            target = self.get(entry.ref)
+            if target is None or target.file == entry.file:
+                raise FileNotFoundError(f"Missing snapshot {entry.ref} referenced by {entry.file}")
+            result = self.load(target)
+        if entry.key != COMBINED_KEY and result:
+            result["scraped_at"] = entry.scraped_at
+            result["status"] = entry.status
+        return result
+
+    def latest_results(self) -> Dict[str, Dict[str, Any]]:
+        """映画館ごとの最新の結果（all_theaters_*.jsonと同じ形）"""
+        results = {}
+        for key, entry in self.latest_per_theater().items():
+            try:
+                results[key] = self.load(entry)
+            except Exception as e:
+                self.logger.warning(f"Failed to read snapshot {entry.file}: {e}")
+        return results
+
+
+_catalogs: Dict[str, SnapshotCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_snapshot_catalog(output_dir: str = "output") -> SnapshotCatalog:
+    """出力先ごとにプロセス共有の目録を取得"""
+    key = os.path.abspath(output_dir)
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = SnapshotCatalog(output_dir)
+        return _catalogs[key]
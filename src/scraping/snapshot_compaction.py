@@ -0,0 +1,267 @@
+"""
+スクレイピング結果ファイル（output/）の重複削除・期間アーカイブ・保持期限
+
+1. 重複削除: 同じ映画館で以前の結果と内容ハッシュが同じ結果ファイルを削除し、
+   目録の項目は以前の結果への参照にする。all_theaters は映画館ごとの取得日時・状態を
+   含むため対象にしない。
+2. アーカイブ: 保持日数より古い結果を月ごとのzipにまとめる。映画館別の内容はハッシュごとに
+   1件だけ持ち（all_theaters は回ごと）、目次（index.json）に各回の目録の項目を残すので、
+   履歴は目録からそのまま引ける。
+3. 保持期限: 保持月数より古い月のアーカイブを削除する。
+4. ページ本文: 保持日数より古い取得記録と、参照されなくなった本文を削除する（page_archive）。
+
+どの手順でも、映画館（キー）ごとの最新の結果ファイルと、URLごとの最新のページは残す。
+"""
+import json
+import logging
+import os
+import zipfile
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .page_archive import PageArchive, get_page_archive
+from .snapshot_catalog import (ARCHIVE_DIR, ARCHIVE_INDEX, CatalogEntry, SnapshotCatalog,
+                               archive_member, get_snapshot_catalog)
+from .snapshot_files import COMBINED_KEY, SUMMARY_KEY, parse_snapshot_name
+
+
+@dataclass
+class RetentionPolicy:
+    """保持方針"""
+    keep_days: int = 7  # 結果ファイルのまま残す日数
+    archive_months: int = 12  # 月ごとのアーカイブを残す月数（0で無期限）
+    page_keep_days: int = 30  # 取得したページ本文を残す日数（0で無期限）
+
+
+def load_retention_policy() -> RetentionPolicy:
+    """保持方針を環境変数から読み込み
+
+    SNAPSHOT_KEEP_DAYS: 結果ファイルのまま残す日数
+    SNAPSHOT_ARCHIVE_MONTHS: アーカイブを残す月数（0で無期限）
+    PAGE_ARCHIVE_KEEP_DAYS: 取得したページ本文を残す日数（0で無期限）
+    """
+    return RetentionPolicy(
+        keep_days=int(os.getenv("SNAPSHOT_KEEP_DAYS", "7")),
+        archive_months=int(os.getenv("SNAPSHOT_ARCHIVE_MONTHS", "12")),
+        page_keep_days=int(os.getenv("PAGE_ARCHIVE_KEEP_DAYS", "30"))
+    )
+
+
+def period_of(moment: datetime) -> str:
+    """アーカイブの期間（YYYY-MM）"""
+    return moment.strftime("%Y-%m")
+
+
+def archive_path(period: str) -> str:
+    """期間アーカイブのパス（output_dirからの相対）"""
+    return f"{ARCHIVE_DIR}/snapshots_{period}.zip"
+
+
+def _months_between(period: str, now: datetime) -> int:
+    year, month = (int(part) for part in period.split("-"))
+    return (now.year * 12 + now.month) - (year * 12 + month)
+
+
+@dataclass
+class CompactionReport:
+    """圧縮・整理の結果"""
+    deduplicated: int = 0  # 重複として削除した結果ファイル
+    archived: int = 0  # アーカイブにまとめた結果ファイル
+    archived_summaries: int = 0  # アーカイブにまとめたサマリーレポート
+    expired: int = 0  # 保持期限切れで削除した項目
+    archives: List[str] = field(default_factory=list)  # 作成・更新・削除したアーカイブ
+    pages_expired: int = 0  # 保持期限切れで削除したページの取得記録
+    pages_deleted: int = 0  # 参照されなくなって削除したページ本文
+    bytes_before: int = 0
+    bytes_after: int = 0
+    dry_run: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class SnapshotCompactor:
+    """output/の結果ファイルの圧縮・整理"""
+
+    def __init__(self, output_dir: str = "output", policy: Optional[RetentionPolicy] = None,
+                 catalog: Optional[SnapshotCatalog] = None, pages: Optional[PageArchive] = None):
+        self.output_dir = Path(output_dir)
+        self.policy = policy or load_retention_policy()
+        self.catalog = catalog or get_snapshot_catalog(output_dir)
+        self.pages = pages or get_page_archive()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def compact(self, now: Optional[datetime] = None, dry_run: bool = False) -> CompactionReport:
+        """重複削除・アーカイブ・保持期限・ページ本文の整理の順に実行"""
+        now = now or datetime.now()
+        report = CompactionReport(dry_run=dry_run, bytes_before=self._disk_usage())
+        self._deduplicate(report, dry_run)
+        self._archive(now - timedelta(days=self.policy.keep_days), report, dry_run)
+        if self.policy.archive_months > 0:
+            self._expire(now, report, dry_run)
+        if self.pages is not None and self.policy.page_keep_days > 0:
+            report.pages_expired, report.pages_deleted = self.pages.prune(
+                now - timedelta(days=self.policy.page_keep_days), dry_run
+            )
+        report.bytes_after = report.bytes_before if dry_run else self._disk_usage()
+        self.logger.info(
+            f"Compacted snapshots: {report.deduplicated} deduplicated, {report.archived} archived, "
+            f"{report.expired} expired, {report.pages_expired} page records expired, "
+            f"{report.bytes_before} -> {report.bytes_after} bytes"
+            + (" (dry run)" if dry_run else "")
+        )
+        return report
+
+    def _disk_usage(self) -> int:
+        total = 0
+        for pattern in ("*.json", f"{ARCHIVE_DIR}/*.zip"):
+            total += sum(path.stat().st_size for path in self.output_dir.glob(pattern) if path.is_file())
+        if self.pages is not None:
+            total += self.pages.disk_usage()
+        return total
+
+    def _latest_files(self) -> set:
+        return {entry.file for entry in (self.catalog.latest(key) for key in self.catalog.keys()) if entry}
+
+    def _delete_files(self, files: List[str]):
+        for file in files:
+            try:
+                (self.output_dir / file).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"Failed to delete {file}: {e}")
+
+    # ---- 重複削除 ----
+
+    def _deduplicate(self, report: CompactionReport, dry_run: bool):
+        """以前の結果と内容が同じ結果ファイルを参照に置き換える"""
+        latest = self._latest_files()
+        updated = []
+        for key in self.catalog.keys():
+            if key == COMBINED_KEY:
+                continue
+            originals: Dict[str, str] = {}
+            for entry in self.catalog.entries(key):
+                if not entry.stored:
+                    continue
+                original = originals.get(entry.content_hash)
+                if original is None:
+                    originals[entry.content_hash] = entry.file
+                elif entry.file not in latest:
+                    updated.append(replace(entry, ref=original, size=0))
+
+        report.deduplicated = len(updated)
+        if dry_run or not updated:
+            return
+        # 目録を先に更新してからファイルを消す（途中で止まっても読めなくなる項目を作らない）
+        self.catalog.put(updated)
+        self._delete_files([entry.file for entry in updated])
+
+    # ---- アーカイブ ----
+
+    def _archive(self, cutoff: datetime, report: CompactionReport, dry_run: bool):
+        """cutoffより古い結果ファイル・参照を月ごとのアーカイブにまとめる"""
+        latest = self._latest_files()
+        by_period: Dict[str, List[CatalogEntry]] = {}
+        for entry in self.catalog.entries():
+            if entry.archive or entry.file in latest or entry.time >= cutoff:
+                continue
+            by_period.setdefault(period_of(entry.time), []).append(entry)
+
+        summaries: Dict[str, List[Path]] = {}
+        latest_summary = max(self.output_dir.glob(f"{SUMMARY_KEY}_*.json"), default=None)
+        for path in self.output_dir.glob(f"{SUMMARY_KEY}_*.json"):
+            parsed = parse_snapshot_name(path)
+            if parsed and parsed[1] < cutoff and path != latest_summary:
+                summaries.setdefault(period_of(parsed[1]), []).append(path)
+
+        for period in sorted(set(by_period) | set(summaries)):
+            entries = by_period.get(period, [])
+            summary_paths = summaries.get(period, [])
+            report.archived += len(entries)
+            report.archived_summaries += len(summary_paths)
+            report.archives.append(archive_path(period))
+            if dry_run:
+                continue
+            try:
+                archived = self._write_archive(period, entries, summary_paths)
+            except Exception as e:
+                self.logger.error(f"Failed to archive snapshots for {period}: {e}")
+                continue
+            self.catalog.put(archived)
+            # 参照している回は、元の回をアーカイブ済みの項目として引き続き読める
+            self._delete_files([entry.file for entry in entries if entry.stored])
+            self._delete_files([path.name for path in summary_paths])
+
+    def _write_archive(self, period: str, entries: List[CatalogEntry],
+                       summary_paths: List[Path]) -> List[CatalogEntry]:
+        """期間アーカイブにentriesを追加して書き直し、アーカイブ済みの項目を返す"""
+        relative = archive_path(period)
+        path = self.output_dir / relative
+        index: Dict[str, Any] = {"entries": [], "summaries": []}
+        members: Dict[str, bytes] = {}
+        if path.exists():
+            with zipfile.ZipFile(path) as archive:
+                index = json.loads(archive.read(ARCHIVE_INDEX))
+                members = {name: archive.read(name) for name in archive.namelist() if name != ARCHIVE_INDEX}
+
+        archived = []
+        for entry in entries:
+            member = archive_member(entry)
+            if member not in members:
+                result = self.catalog.load(entry)
+                members[member] = json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            archived.append(replace(entry, ref="", archive=relative, size=0))
+        for summary_path in summary_paths:
+            members[f"summaries/{summary_path.name}"] = summary_path.read_bytes()
+            index["summaries"].append(summary_path.name)
+
+        known = {item["file"] for item in index["entries"]}
+        index["entries"].extend(
+            {key: value for key, value in asdict(entry).items() if key != "archive"}
+            for entry in archived if entry.file not in known
+        )
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+            archive.writestr(ARCHIVE_INDEX, json.dumps(index, ensure_ascii=False, indent=1))
+            for name, data in sorted(members.items()):
+                archive.writestr(name, data)
+        os.replace(tmp_path, path)
+        self.logger.info(f"Archived {len(entries)} snapshots and {len(summary_paths)} summaries into {relative}")
+        return archived
+
+    # ---- 保持期限 ----
+
+    def _expire(self, now: datetime, report: CompactionReport, dry_run: bool):
+        """保持月数より古い月のアーカイブを削除"""
+        archive_dir = self.output_dir / ARCHIVE_DIR
+        if not archive_dir.is_dir():
+            return
+        for path in sorted(archive_dir.glob("snapshots_*.zip")):
+            period = path.stem[len("snapshots_"):]
+            try:
+                expired = _months_between(period, now) > self.policy.archive_months
+            except ValueError:
+                continue
+            if not expired:
+                continue
+
+            relative = archive_path(period)
+            files = [entry.file for entry in self.catalog.entries() if entry.archive == relative]
+            referenced = [entry.file for entry in self.catalog.entries() if entry.ref in files]
+            if referenced:
+                self.logger.warning(f"Keeping {relative}: still referenced by {len(referenced)} snapshots")
+                continue
+
+            report.expired += len(files)
+            report.archives.append(relative)
+            if dry_run:
+                continue
+            self.catalog.remove(files)
+            self._delete_files([relative])
+            self.logger.info(f"Expired archive {relative} ({len(files)} snapshots)")
@@ -0,0 +1,98 @@
+"""
+スクレイピング結果ファイル（output/）の名前の解釈と内容ハッシュ
+"""
+import hashlib
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .showtime_codec import iter_showtime_dicts
+
+# 映画館キー_YYYYMMDD_HHMMSS.json（all_theaters・summary_report も同じ形式）
+_SNAPSHOT_NAME = re.compile(r"^(?P<key>.+)_(?P<stamp>\d{8}_\d{6})\.json$")
+
+COMBINED_KEY = "all_theaters"
+SUMMARY_KEY = "summary_report"
+
+
+def parse_snapshot_name(path) -> Optional[Tuple[str, datetime]]:
+    """ファイル名から（キー, 取得日時）を取り出す（形式が違えばNone）"""
+    match = _SNAPSHOT_NAME.match(Path(path).name)
+    if not match:
+        return None
+    try:
+        return match.group("key"), datetime.strptime(match.group("stamp"), "%Y%m%d_%H%M%S")
+    except ValueError:
+        return None
+
+
+def _canonical_schedule(schedule: Dict[str, Any]) -> Dict[str, Any]:
+    # 上映回は期間形式・日付ごとの形式のどちらで保存されていても同じ内容になるよう展開する
+    return {
+        "theater_name": schedule.get("theater_name"),
+        "movie_title": schedule.get("movie_title"),
+        "showtimes": list(iter_showtime_dicts(schedule.get("showtimes") or []))
+    }
+
+
+class ContentHasher:
+    """content_hash と同じハッシュを、レコードを1件ずつ渡して計算する
+
+    映画をすべて渡してからスケジュールを渡す（結果ファイルに書き出す順）。
+    """
+
+    def __init__(self):
+        self._sha = hashlib.sha256()
+        self._kind = "movies"
+        self._first = True
+        self._sha.update(b'{"movies":[')
+
+    def add(self, kind: str, record: Dict[str, Any]):
+        if kind == "schedules":
+            self._start_schedules()
+            record = _canonical_schedule(record)
+        self._sha.update((("" if self._first else ",") + _dumps(record)).encode("utf-8"))
+        self._first = False
+
+    def hexdigest(self, theater_info: Optional[Dict[str, Any]]) -> str:
+        self._start_schedules()
+        self._sha.update(('],"theater_info":' + _dumps(theater_info or {}) + "}").encode("utf-8"))
+        return self._sha.hexdigest()
+
+    def _start_schedules(self):
+        if self._kind != "schedules":
+            self._sha.update(b'],"schedules":[')
+            self._kind = "schedules"
+            self._first = True
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def content_hash(result: Dict[str, Any]) -> str:
+    """映画館1館分の結果の内容ハッシュ（取得日時・状態は含めない）"""
+    content = {
+        "theater_info": result.get("theater_info") or {},
+        "movies": result.get("movies") or [],
+        "schedules": [_canonical_schedule(schedule) for schedule in result.get("schedules") or []]
+    }
+    return hashlib.sha256(_dumps(content).encode("utf-8")).hexdigest()
+
+
+def result_hash(result: Dict[str, Any]) -> str:
+    """結果の内容ハッシュ（scrape_theater の戻り値は計算済みの値を使う）"""
+    return result.get("content_hash") or content_hash(result)
+
+
+def load_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """scrape_theater の戻り値（保存先と件数）から結果ファイルを読み込む
+
+    映画・スケジュールを含む結果（保存先のないもの）はそのまま返す。
+    """
+    if not result or not result.get("file"):
+        return result
+    with open(result["file"], 'r', encoding='utf-8') as f:
+        return json.load(f)
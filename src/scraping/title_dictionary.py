@@ -0,0 +1,212 @@
+"""
+既知の映画タイトル辞書（映画館ごとに過去のスクレイピング結果から構築し、複数パターン照合で検出）
+
+ページテキスト中の既知タイトルをAho-Corasick法で1回の走査で見つけるため、
+照合コストはタイトル数によらずテキスト長にほぼ比例する。
+"""
+import logging
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_DIR = "output"
+
+# 辞書に登録するタイトルの文字数
+MIN_TITLE_LENGTH = 4  # 2〜3文字の一般的な語との誤一致を避ける
+MAX_TITLE_LENGTH = 60
+
+
+class AhoCorasick:
+    """複数文字列の同時検索（Aho-Corasickオートマトン）"""
+
+    def __init__(self, words: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self.words: List[str] = []
+        for word in dict.fromkeys(words):
+            if word:
+                self._add(word)
+        self._build()
+
+    def _add(self, word: str):
+        node = 0
+        for char in word:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(len(self.words))
+        self.words.append(word)
+
+    def _build(self):
+        """失敗遷移を幅優先で設定"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """一致した（開始位置, 語）を終了位置順に返す"""
+        goto, fail, output, words = self._goto, self._fail, self._output, self.words
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for word_index in output[node]:
+                word = words[word_index]
+                yield index - len(word) + 1, word
+
+    def find_all(self, text: str) -> List[str]:
+        """テキストに含まれる語（最初に現れた位置の順、重複なし）"""
+        first_seen: Dict[str, int] = {}
+        for start, word in self.iter_matches(text):
+            if word not in first_seen:
+                first_seen[word] = start
+        return sorted(first_seen, key=first_seen.__getitem__)
+
+
+def _snapshot_titles(data) -> Iterator[str]:
+    """スクレイピング結果1件から、上映予定または作品詳細が取れているタイトル
+
+    テキスト解析系のスクレイパーは見出しやお知らせもタイトルとして拾うため、
+    上映時刻が付いたスケジュールか、監督・上映時間などの詳細がある作品のみを採用する。
+    """
+    if not isinstance(data, dict):
+        return
+    if "movies" not in data and "schedules" not in data:
+        # 全映画館分のファイル（映画館キー→結果）
+        for value in data.values():
+            if isinstance(value, dict) and ("movies" in value or "schedules" in value):
+                yield from _snapshot_titles(value)
+        return
+
+    for schedule in data.get("schedules") or []:
+        if any(showtime.get("times") for showtime in schedule.get("showtimes") or []):
+            yield schedule.get("movie_title") or ""
+    for movie in data.get("movies") or []:
+        if any(movie.get(key) for key in ("director", "duration", "synopsis", "title_en")):
+            yield movie.get("title") or ""
+
+
+class TitleDictionary:
+    """映画館1館分の既知の映画タイトル辞書
+
+    その映画館の過去のスクレイピング結果（output/ の目録に載っている結果。アーカイブ済みの回を含む）と、
+    スクレイパーの既知タイトルから構築する。照合用のオートマトンは初回検索時に作る。
+    ほかの映画館のタイトルは含めない（ページ中で言及されただけの他館の作品を拾わないため）。
+    解析プロセスへは過去の結果を読み込み済みの状態で渡す（解析プロセスでは目録を読まない）。
+    """
+
+    def __init__(self, theater_key: str, snapshot_dir: Optional[str] = None, known: Iterable[str] = ()):
+        self.theater_key = theater_key
+        self.snapshot_dir = Path(snapshot_dir or os.getenv("SCRAPING_SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR))
+        self._titles: Set[str] = set()
+        self._snapshots_loaded = False
+        self._automaton: Optional[AhoCorasick] = None
+        self._lock = threading.Lock()
+        self.add(known)
+
+    def __getstate__(self):
+        self._get_automaton()
+        state = self.__dict__.copy()
+        state.pop("_lock")
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add(self, titles: Iterable[str]):
+        """タイトルを登録"""
+        with self._lock:
+            before = len(self._titles)
+            self._titles.update(self._clean(title) for title in titles)
+            self._titles.discard("")
+            if len(self._titles) != before:
+                self._automaton = None
+
+    def _load_snapshots(self):
+        """この映画館の過去のスクレイピング結果からタイトルを読み込み（内容が同じ回は1回だけ読む）"""
+        if not self.snapshot_dir.is_dir():
+            return
+        from .snapshot_catalog import get_snapshot_catalog
+        catalog = get_snapshot_catalog(str(self.snapshot_dir))
+        titles: Set[str] = set()
+        seen: Set[str] = set()
+        for entry in catalog.entries(self.theater_key):
+            if entry.content_hash in seen:
+                continue
+            seen.add(entry.content_hash)
+            try:
+                titles.update(_snapshot_titles(catalog.load(entry)))
+            except Exception as e:
+                logger.warning(f"Failed to read snapshot {entry.file}: {e}")
+        self._titles.update(self._clean(title) for title in titles)
+        self._titles.discard("")
+        logger.info(f"Title dictionary for {self.theater_key}: {len(self._titles)} titles")
+
+    @staticmethod
+    def _clean(title: str) -> str:
+        title = (title or "").strip()
+        return title if MIN_TITLE_LENGTH <= len(title) <= MAX_TITLE_LENGTH else ""
+
+    def _get_automaton(self) -> AhoCorasick:
+        with self._lock:
+            if not self._snapshots_loaded:
+                self._load_snapshots()
+                self._snapshots_loaded = True
+                self._automaton = None
+            if self._automaton is None:
+                self._automaton = AhoCorasick(sorted(self._titles))
+            return self._automaton
+
+    def find(self, text: str) -> List[str]:
+        """テキストに含まれる既知タイトル（現れた順）"""
+        if not text:
+            return []
+        return self._get_automaton().find_all(text)
+
+    def __len__(self) -> int:
+        return len(self._get_automaton().words)
+
+    def __contains__(self, title: str) -> bool:
+        with self._lock:
+            return title in self._titles
+
+
+_dictionaries: Dict[str, TitleDictionary] = {}
+_snapshot_dir: Optional[str] = None
+_dictionary_lock = threading.Lock()
+
+
+def set_snapshot_dir(snapshot_dir: str):
+    """タイトル辞書を構築する結果の保存先を設定（変わった場合は作成済みの辞書を作り直す）"""
+    global _snapshot_dir
+    with _dictionary_lock:
+        if _snapshot_dir != str(snapshot_dir):
+            _snapshot_dir = str(snapshot_dir)
+            _dictionaries.clear()
+
+
+def get_title_dictionary(theater_key: str, known: Iterable[str] = ()) -> TitleDictionary:
+    """映画館ごとにプロセス共有のタイトル辞書を取得（knownは作成時に登録する既知タイトル）"""
+    with _dictionary_lock:
+        if theater_key not in _dictionaries:
+            _dictionaries[theater_key] = TitleDictionary(theater_key, _snapshot_dir, known)
+        return _dictionaries[theater_key]
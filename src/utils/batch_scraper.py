@@ -1,4 +1,3 @@
-import pandas as pd
 from bs4 import BeautifulSoup
 import os
 import re
@@ -93,6 +92,7 @@ def scrape_html_file(file_path):
 
 
 def process_files(file_list, output_dir="data", combine=False):
+    import pandas as pd  # DataFrame作成時のみ必要（起動を軽くするため遅延読み込み）
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
@@ -0,0 +1,109 @@
+import os
+import re
+import sys
+import timeit
+
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.scraping.line_classifier import DATE, TIME, TITLE, OTHER
+from src.scraping.scrapers import pole_pole_scraper, shimotakaido_scraper, waseda_shochiku_scraper
+
+
+# 行分類エンジン導入前の判定（比較用）
+def legacy_pole_pole(line):
+    date_match = re.match(r'(\d{2})/(\d{2})', line)
+    if date_match:
+        return DATE
+    if (line and
+        len(line) > 3 and
+        not any(keyword in line for keyword in [
+            '月', '火', '水', '木', '金', '土', '日',
+            'ポレポレ東中野', '座席表', '購入', '2D', '字幕',
+            'もっとみる', ':', '〜', 'バリアフリー'
+        ]) and
+        not line.isdigit() and
+        not re.match(r'^\d{1,2}:\d{2}', line)):
+        return TITLE
+    if re.match(r'^(\d{1,2}:\d{2})$', line):
+        return TIME
+    return OTHER
+
+
+def legacy_shimotakaido(line):
+    return bool(
+        line and
+        len(line) > 2 and
+        not any(skip in line for skip in [
+            '年', '月', '日', '時', '分', '～', ':',
+            'http', 'www', '.com', '@', 'トップ',
+            'お知らせ', '上映', '開催', 'トーク', '監督',
+            '先着', 'プレゼント', '決定', '追加'
+        ]) and
+        not line.isdigit() and
+        not re.match(r'^\d{1,2}[/:\-]\d{1,2}', line) and
+        not re.match(r'^(終|開)', line) and
+        len(line) < 50 and
+        (any(char in line for char in ['！', '？', '♪', '☆']) or
+         re.search(r'[ァ-ヴ]+', line) or
+         re.search(r'[A-Za-z]{2,}', line))
+    )
+
+
+def legacy_waseda(line):
+    return bool(
+        line and
+        len(line) > 3 and
+        len(line) < 50 and
+        not any(skip in line for skip in [
+            'official', 'web', 'site', '名画座', '高田馬場',
+            '年', '月', '日', '時', '分', ':',
+            'http', 'www', '.com', '@'
+        ]) and
+        not line.isdigit() and
+        not re.match(r'^\d{1,2}[/:\-]\d{1,2}', line) and
+        (any(char in line for char in ['＋', '＆', '・']) or
+         re.search(r'[ァ-ヴ]+', line) or
+         re.search(r'[A-Za-z]{3,}', line) or
+         len([c for c in line if ord(c) > 127]) > len(line) * 0.3)
+    )
+
+
+CASES = [
+    ("pole_pole schedule", legacy_pole_pole, lambda line: pole_pole_scraper._SCHEDULE_LINES.classify(line)[0]),
+    ("shimotakaido titles", legacy_shimotakaido, shimotakaido_scraper._TITLE_LINES.is_title),
+    ("waseda titles", legacy_waseda, waseda_shochiku_scraper._TITLE_LINES.is_title),
+]
+
+
+def load_lines(html_dir):
+    """html/ディレクトリの全ファイルの行（空白除去済み）"""
+    lines = []
+    for file_name in sorted(os.listdir(html_dir)):
+        if not file_name.endswith(".html"):
+            continue
+        with open(os.path.join(html_dir, file_name), "r", encoding="utf-8") as file:
+            soup = BeautifulSoup(file.read(), "html.parser")
+        lines.extend(line.strip() for line in soup.get_text().split("\n"))
+    return lines
+
+
+def main():
+    html_dir = sys.argv[1] if len(sys.argv) > 1 else "html"
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    lines = load_lines(html_dir)
+    print(f"{len(lines)} lines from {html_dir}/ (x{repeat})")
+
+    for name, legacy, compiled in CASES:
+        mismatches = [line for line in lines if legacy(line) != compiled(line)]
+        legacy_time = timeit.timeit(lambda: [legacy(line) for line in lines], number=repeat)
+        compiled_time = timeit.timeit(lambda: [compiled(line) for line in lines], number=repeat)
+        print(f"{name:22} legacy {legacy_time:.3f}s  compiled {compiled_time:.3f}s  "
+              f"x{legacy_time / compiled_time:.1f}  mismatches {len(mismatches)}")
+        for line in mismatches[:5]:
+            print(f"  {line!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -190,13 +190,13 @@ def analyze_single_file(file_path, detailed=False):
 def main():
     if len(sys.argv) < 2:
         print("Usage:")
-        print("  python html_analyzer.py all                    # Analyze all HTML files in html/ directory")
+        print("  python html_analyzer.py all [dir]              # Analyze all HTML files in html/ (or dir, e.g. html/archive)")
         print("  python html_analyzer.py <file_path>            # Analyze single file")
         print("  python html_analyzer.py <file_path> detailed   # Detailed analysis of single file")
         sys.exit(1)
     
     if sys.argv[1] == "all":
-        analyze_all_html_files()
+        analyze_all_html_files(*sys.argv[2:3])
     else:
         file_path = sys.argv[1]
         detailed = len(sys.argv) > 2 and sys.argv[2] == "detailed"
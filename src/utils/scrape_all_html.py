@@ -1,4 +1,3 @@
-import pandas as pd
 from bs4 import BeautifulSoup
 import os
 import re
@@ -91,6 +90,7 @@ def scrape_html_file(file_path):
 
 
 def scrape_all_html_files(html_dir="html", output_dir="data"):
+    import pandas as pd  # DataFrame作成時のみ必要（起動を軽くするため遅延読み込み）
     if not os.path.exists(html_dir):
         print(f"HTML directory '{html_dir}' not found")
         return pd.DataFrame()
@@ -151,7 +151,9 @@ def scrape_all_html_files(html_dir="html", output_dir="data"):
 
 
 if __name__ == "__main__":
-    result_df = scrape_all_html_files()
+    import sys
+    # 引数でHTMLディレクトリを指定可能（run_scraping.py export-pages の書き出し先など）
+    result_df = scrape_all_html_files(*sys.argv[1:2])
     
     if not result_df.empty:
         print("\n=== Sample of extracted data ===")
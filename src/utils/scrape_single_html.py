@@ -1,4 +1,3 @@
-import pandas as pd
 from bs4 import BeautifulSoup
 import re
 import sys
@@ -45,6 +44,7 @@ def process_movie_box(box, is_special=False, special_title=None):
 
 
 def scrape_html_file(file_path):
+    import pandas as pd  # DataFrame作成時のみ必要（起動を軽くするため遅延読み込み）
     with open(file_path, "r", encoding="utf-8") as file:
         html_content = file.read()
     
@@ -0,0 +1,82 @@
+"""
+日付・時刻の正規化（date_normalizer）の確認
+"""
+import unittest
+from datetime import date
+
+from src.scraping.date_normalizer import (DateNormalizer, infer_year, minutes_to_time, parse_date_parts,
+                                          parse_iso_date, time_to_minutes)
+
+
+class InferYearTest(unittest.TestCase):
+    """年のない日付の年の推定"""
+
+    def test_same_year(self):
+        self.assertEqual(infer_year(7, 10, date(2025, 7, 1)), date(2025, 7, 10))
+
+    def test_january_seen_in_december_is_next_year(self):
+        self.assertEqual(infer_year(1, 5, date(2025, 12, 20)), date(2026, 1, 5))
+
+    def test_december_seen_in_january_is_previous_year(self):
+        self.assertEqual(infer_year(12, 28, date(2026, 1, 3)), date(2025, 12, 28))
+
+    def test_leap_day_uses_nearest_valid_year(self):
+        self.assertEqual(infer_year(2, 29, date(2025, 3, 1)), date(2024, 2, 29))
+
+    def test_invalid_date(self):
+        self.assertIsNone(infer_year(2, 30, date(2025, 3, 1)))
+
+
+class DateNormalizerTest(unittest.TestCase):
+    """取得日基準の変換"""
+
+    def setUp(self):
+        self.normalizer = DateNormalizer(date(2025, 12, 20))
+
+    def test_formats(self):
+        for text, expected in [
+            ("2025-07-05", "2025-07-05"),
+            ("2025/7/5(土)", "2025-07-05"),
+            ("2025年7月5日", "2025-07-05"),
+            ("１／５（月）", "2026-01-05"),
+            ("12月24日", "2025-12-24"),
+            ("12.31", "2025-12-31"),
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(self.normalizer.format_date(text), expected)
+
+    def test_unparseable(self):
+        self.assertIsNone(self.normalizer.format_date("近日公開"))
+        self.assertIsNone(self.normalizer.format_date(""))
+        self.assertIsNone(self.normalizer.format_month_day("x", "1"))
+
+    def test_full_date_with_invalid_day_falls_back(self):
+        self.assertEqual(parse_date_parts("2025-02-30 2/3"), (None, 2, 3))
+
+    def test_reference_defaults_to_today(self):
+        self.assertEqual(DateNormalizer().reference, date.today())
+
+    def test_month_day(self):
+        self.assertEqual(self.normalizer.format_month_day("1", "5"), "2026-01-05")
+
+
+class TimeTest(unittest.TestCase):
+    """時刻の変換"""
+
+    def test_time_to_minutes(self):
+        for text, expected in [("10:40", 640), ("10：40～", 640), ("9時05分", 545), ("25:10", 1510),
+                               ("30:00", None), ("レイト", None), ("", None)]:
+            with self.subTest(text=text):
+                self.assertEqual(time_to_minutes(text), expected)
+
+    def test_minutes_to_time(self):
+        self.assertEqual(minutes_to_time(545), "9:05")
+
+    def test_parse_iso_date(self):
+        self.assertEqual(parse_iso_date("2025-07-05T10:00:00"), date(2025, 7, 5))
+        self.assertIsNone(parse_iso_date("7/5"))
+        self.assertIsNone(parse_iso_date(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+実行期限（deadline）の確認
+"""
+import math
+import unittest
+
+from src.scraping.deadline import Deadline
+
+
+class DeadlineTest(unittest.TestCase):
+    """期限・子期限・キャンセル"""
+
+    def test_unbounded(self):
+        deadline = Deadline()
+        self.assertEqual(deadline.remaining(), math.inf)
+        self.assertFalse(deadline.expired())
+        self.assertEqual(deadline.clip(10.0), 10.0)
+
+    def test_child_is_clipped_by_parent(self):
+        parent = Deadline(1.0)
+        self.assertLessEqual(parent.child(60.0).remaining(), 1.0)
+        self.assertLessEqual(parent.child(None).remaining(), 1.0)
+        self.assertLessEqual(Deadline().child(0.5).remaining(), 0.5)
+
+    def test_expired(self):
+        deadline = Deadline(0.0)
+        self.assertTrue(deadline.expired())
+        self.assertEqual(deadline.clip(5.0), 0.0)
+
+    def test_cancel_reaches_children(self):
+        parent = Deadline()
+        child = parent.child(60.0)
+        grandchild = child.child(None)
+        parent.cancel()
+        self.assertTrue(grandchild.cancelled)
+        self.assertEqual(grandchild.remaining(), 0.0)
+
+    def test_cancel_does_not_reach_parent(self):
+        parent = Deadline()
+        parent.child(None).cancel()
+        self.assertFalse(parent.cancelled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+宣言的な抽出定義（declarative・config/extractors）の確認
+
+ユーロスペースの定義を html/ の保存済みページと、定義のセレクタに合わせた小さなページで動かす。
+"""
+import unittest
+from datetime import date
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.scraping.base_scraper import MOVIES, SCHEDULES, PageRequest
+from src.scraping.date_normalizer import DateNormalizer
+from src.scraping.declarative import CompiledField, CompiledSelector, DeclarativeScraper
+from src.scraping.selector_memo import SelectorMemo
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+EUROSPACE_HTML = PROJECT_ROOT / "html" / "ユーロスペース.html"
+
+_SCHEDULE_PAGE = """
+<html><body>
+<table class="schedule"><caption>作品A</caption>
+  <tr><td class="date">1/5</td><td class="time">10:00</td><td class="time">14:30</td></tr>
+  <tr><td class="date">日付未定</td><td class="time">19:00</td></tr>
+</table>
+<table class="schedule"><caption>作品B</caption>
+  <tr><td class="date">12/31</td><td class="time">21:00</td></tr>
+</table>
+</body></html>
+"""
+
+_MOVIE_PAGE = """
+<html><body>
+<div class="movie-item"><h3>作品A</h3><p class="title-en">Film A</p>
+  <p>監督：山田太郎</p>
+  <p>出演：甲,乙</p>
+  <p>2024年／日本／112分</p><img src="/img/a.jpg"></div>
+<div class="movie-item"><p>タイトルのない紹介</p></div>
+</body></html>
+"""
+
+
+def _soup(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, 'html.parser')
+
+
+class EurospaceSpecTest(unittest.TestCase):
+    """config/extractors/eurospace.json"""
+
+    def setUp(self):
+        self.scraper = DeclarativeScraper.from_file("ユーロスペース", "https://www.eurospace.co.jp", "eurospace.json")
+        self.scraper.date_normalizer = DateNormalizer(date(2025, 12, 20))
+        # 保存済みの採用記録を使わない
+        self.scraper.selector_memo = SelectorMemo("eurospace-test")
+
+    def test_page_plan_fetches_each_url_once(self):
+        plan = self.scraper.page_plan()
+        urls = [page.url for page, _ in plan]
+        self.assertEqual(len(urls), len(set(urls)))
+        self.assertIn("https://www.eurospace.co.jp/schedule/", urls)
+        self.assertTrue(all(page.render for page, _ in plan))
+
+    def test_theater_defaults(self):
+        self.scraper.fetch = lambda page: None
+        info = self.scraper.get_theater_info()
+        self.assertEqual(info.phone, "03-3461-0211")
+        self.assertEqual(info.screens, 2)
+
+    @unittest.skipUnless(EUROSPACE_HTML.exists(), "html/ fixture is not available")
+    def test_saved_page_uses_heading_fallback(self):
+        soup = _soup(EUROSPACE_HTML.read_bytes())
+        movies = list(self.scraper.extract(MOVIES, PageRequest(self.scraper.base_url), soup))
+        self.assertEqual(len(movies), 9)
+        self.assertTrue(all(movie.title for movie in movies))
+        # 定義の候補セレクタはどれも一致せず、見出しの親要素へのフォールバックになる
+        self.assertEqual(self.scraper.selector_memo.to_dict()["movie_items"]["winner"], None)
+        self.assertEqual(list(self.scraper.extract(SCHEDULES, PageRequest(self.scraper.base_url), soup)), [])
+
+    def test_movie_fields(self):
+        movies = list(self.scraper.extract_movies(PageRequest(self.scraper.base_url), _soup(_MOVIE_PAGE)))
+        self.assertEqual(len(movies), 1)
+        movie = movies[0]
+        self.assertEqual((movie.title, movie.title_en, movie.director), ("作品A", "Film A", "山田太郎"))
+        self.assertEqual(movie.cast, ["甲", "乙"])
+        self.assertEqual(movie.duration, 112)
+        self.assertEqual(movie.poster_url, "https://www.eurospace.co.jp/img/a.jpg")
+
+    def test_schedule_dates_use_the_fetch_date(self):
+        schedules = list(self.scraper.extract_schedules(PageRequest(self.scraper.base_url), _soup(_SCHEDULE_PAGE)))
+        self.assertEqual([schedule.movie_title for schedule in schedules], ["作品A", "作品B"])
+        showtimes = schedules[0].showtimes
+        self.assertEqual([(showtime.date, showtime.times, showtime.screen) for showtime in showtimes],
+                         [("2026-01-05", ["10:00", "14:30"], "スクリーン1")])
+        self.assertEqual(schedules[1].showtimes[0].date, "2025-12-31")
+
+
+class CompiledFieldTest(unittest.TestCase):
+    """項目定義"""
+
+    def test_selector_candidates_in_priority_order(self):
+        selector = CompiledSelector(["p.missing", "span", "p"])
+        self.assertEqual(selector.first(_soup("<p>段落</p><span>範囲</span>")).get_text(), "範囲")
+
+    def test_value_conversions(self):
+        soup = _soup('<div><a href="tel:03-0000-0000">電話</a><p> 上映時間 ： 95分 </p></div>')
+        self.assertEqual(CompiledField({"selector": "a", "attr": "href", "strip_prefix": "tel:"}).extract(soup),
+                         "03-0000-0000")
+        self.assertEqual(CompiledField({"selector": "p", "regex": r"(\d+)分", "type": "int"}).extract(soup), 95)
+        self.assertEqual(CompiledField({"value": "固定"}).extract(soup), "固定")
+
+    def test_date_format(self):
+        field = CompiledField({"selector": "p", "format": "date"})
+        self.assertEqual(field.extract(_soup("<p>2025年7月5日</p>")), "2025-07-05")
+        self.assertIsNone(field.extract(_soup("<p>近日</p>")))
+
+
+if __name__ == "__main__":
+    unittest.main()
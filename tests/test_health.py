@@ -0,0 +1,101 @@
+"""
+映画館別のヘルス管理（health のサーキットブレーカー・適応タイムアウト）の確認
+"""
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from src.scraping.health import CLOSED, OPEN, HealthRegistry, TheaterHealth
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    """遮断・復帰"""
+
+    def test_opens_after_consecutive_failures(self):
+        changes = []
+        health = TheaterHealth("テスト劇場", failure_threshold=3, on_change=lambda: changes.append(1))
+        health.record_failure("timeout")
+        health.record_success(0.1)
+        health.record_failure("timeout")
+        health.record_failure("timeout")
+        self.assertEqual(health.state, CLOSED)
+        with self.assertLogs("TheaterHealth", level="WARNING"):
+            health.record_failure("timeout")
+        self.assertEqual(health.state, OPEN)
+        self.assertFalse(health.allow_request())
+        self.assertEqual((health.rejected, len(changes)), (1, 1))
+
+    def test_probe_closes_the_circuit(self):
+        health = TheaterHealth("テスト劇場", failure_threshold=1, cooldown=0.0)
+        health.set_probe(lambda: True)
+        with self.assertLogs("TheaterHealth", level="WARNING"):
+            health.record_failure("down")
+        deadline = time.monotonic() + 2.0
+        while health.state != CLOSED and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(health.state, CLOSED)
+        self.assertTrue(health.allow_request())
+
+    def test_failed_probe_extends_cooldown(self):
+        probed = threading.Event()
+        health = TheaterHealth("テスト劇場", failure_threshold=1, cooldown=0.0, on_change=probed.set)
+        with self.assertLogs("TheaterHealth", level="WARNING"):
+            health.record_failure("down")
+        health.cooldown = 10.0
+        health.opened_until = 0.0
+        probed.clear()
+        health.set_probe(lambda: False)
+        self.assertTrue(probed.wait(2.0))
+        self.assertEqual(health.state, OPEN)
+        self.assertEqual(health.cooldown, 20.0)
+
+    def test_adaptive_timeout(self):
+        health = TheaterHealth("テスト劇場", default_timeout=30.0, min_timeout=5.0, max_timeout=30.0)
+        self.assertEqual(health.timeout(), 30.0)
+        for _ in range(20):
+            health.record_success(0.5)
+        self.assertEqual(health.timeout(), 5.0)
+        for _ in range(20):
+            health.record_success(4.0)
+        self.assertEqual(health.timeout(), 12.0)
+
+
+class HealthRegistryTest(unittest.TestCase):
+    """状態の保存と復元"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.state_path = str(Path(self.directory) / "theater_health.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_open_circuit_survives_restart(self):
+        registry = HealthRegistry(self.state_path)
+        health = registry.get("テスト劇場")
+        with self.assertLogs("TheaterHealth", level="WARNING"):
+            for _ in range(health.failure_threshold):
+                health.record_failure("down")
+        restored = HealthRegistry(self.state_path).get("テスト劇場")
+        self.assertEqual(restored.state, OPEN)
+
+    def test_expired_open_circuit_allows_one_trial(self):
+        registry = HealthRegistry(self.state_path)
+        health = registry.get("テスト劇場")
+        with self.assertLogs("TheaterHealth", level="WARNING"):
+            for _ in range(health.failure_threshold):
+                health.record_failure("down")
+        health.opened_until = time.time() - 1
+        registry.save()
+        restored = HealthRegistry(self.state_path).get("テスト劇場")
+        self.assertEqual(restored.state, CLOSED)
+        with self.assertLogs("TheaterHealth", level="WARNING"):
+            restored.record_failure("still down")
+        self.assertEqual(restored.state, OPEN)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+「ラベル：値」形式の項目抽出（labeled_fields）の確認
+"""
+import unittest
+
+from bs4 import BeautifulSoup
+
+from src.scraping.labeled_fields import LabeledFieldExtractor
+
+FIELDS = {"director": ["監督", "Director"], "screenplay": ["脚本・監督", "脚本"], "cast": ["出演", "キャスト"]}
+
+
+class LabeledFieldExtractorTest(unittest.TestCase):
+    """ラベルをまとめて1回で走査する"""
+
+    def setUp(self):
+        self.extractor = LabeledFieldExtractor(FIELDS)
+
+    def test_values_per_line(self):
+        text = "監督：山田太郎\n出演: 甲、乙\nDirector：別表記"
+        self.assertEqual(self.extractor.extract(text), {"director": "山田太郎", "cast": "甲、乙"})
+
+    def test_longer_label_wins_at_same_position(self):
+        self.assertEqual(self.extractor.extract("脚本・監督：佐藤花子"), {"screenplay": "佐藤花子"})
+
+    def test_several_labels_on_one_line(self):
+        # 値は行末まで。次のラベルは値の途中から探し直す（個別に検索した場合と同じ値）
+        self.assertEqual(self.extractor.extract("監督：A 出演：B"), {"director": "A 出演：B", "cast": "B"})
+
+    def test_first_occurrence_in_text_wins(self):
+        self.assertEqual(self.extractor.extract("キャスト：甲\n出演：乙")["cast"], "甲")
+
+    def test_empty_input(self):
+        self.assertEqual(self.extractor.extract(None), {})
+        self.assertEqual(LabeledFieldExtractor({}).extract("監督：A"), {})
+
+    def test_extract_element(self):
+        element = BeautifulSoup("<div><p>監督：山田太郎</p>\n<p>出演：甲</p></div>", 'html.parser').div
+        text, values = self.extractor.extract_element(element)
+        self.assertIn("山田太郎", text)
+        self.assertEqual(values, {"director": "山田太郎", "cast": "甲"})
+        self.assertEqual(self.extractor.extract_element(None), ("", {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+テキスト行の分類（line_classifier）の確認
+"""
+import unittest
+
+from src.scraping.line_classifier import DATE, OTHER, TIME, TITLE, LineClassifier, compile_keywords
+
+
+class CompileKeywordsTest(unittest.TestCase):
+    """除外語の正規表現"""
+
+    def test_longest_word_first(self):
+        pattern = compile_keywords(["上映", "上映中", "＊"])
+        self.assertEqual(pattern.search("現在上映中").group(), "上映中")
+        self.assertTrue(pattern.search("＊注意"))
+        self.assertIsNone(pattern.search("作品"))
+
+    def test_no_words(self):
+        self.assertIsNone(compile_keywords([]))
+
+
+class LineClassifierTest(unittest.TestCase):
+    """日付 → タイトル → 時刻 → その他 の順に判定"""
+
+    def setUp(self):
+        self.classifier = LineClassifier(
+            skip_words=["料金", "円"],
+            reject_patterns=[r"\d{1,2}:\d{2}"],
+            non_ascii_ratio=0.3,
+            min_length=2,
+            max_length=40,
+            date_pattern=r"(\d{1,2})/(\d{1,2})",
+            time_pattern=r"(\d{1,2}):(\d{2})",
+        )
+
+    def test_classify(self):
+        for line, expected in [
+            ("7/5(土)", DATE),
+            ("ラ・ジュテ", TITLE),
+            ("10:40〜12:10", TIME),
+            ("一般 1,900円", OTHER),
+            ("OK", OTHER),
+            ("English Title", OTHER),
+            ("12345", OTHER),
+            ("", OTHER),
+        ]:
+            with self.subTest(line=line):
+                self.assertEqual(self.classifier.classify(line)[0], expected)
+
+    def test_date_match_groups(self):
+        kind, match = self.classifier.classify("12/24 ほか")
+        self.assertEqual(kind, DATE)
+        self.assertEqual(match.group(2), "12")
+
+    def test_title_markers(self):
+        classifier = LineClassifier(title_markers=["『"], title_patterns=[r"^【.+】$"])
+        self.assertTrue(classifier.is_title("『惑星ソラリス』"))
+        self.assertTrue(classifier.is_title("【特集上映】"))
+        self.assertFalse(classifier.is_title("お知らせ"))
+
+    def test_without_conditions_everything_is_a_title(self):
+        self.assertTrue(LineClassifier().is_title("anything"))
+
+
+if __name__ == "__main__":
+    unittest.main()
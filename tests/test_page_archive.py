@@ -0,0 +1,73 @@
+"""
+取得したページ本文の保存（page_archive）の確認
+"""
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from src.scraping.page_archive import INDEX_FILE, PageArchive
+
+URL = "https://example.com/schedule/"
+
+
+class PageArchiveTest(unittest.TestCase):
+    """本文の保存・参照・保持期限"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.archive = PageArchive(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def objects(self):
+        return sorted((Path(self.root) / "objects").glob("*/*.html.gz"))
+
+    def test_same_body_is_stored_once(self):
+        self.archive.store("alpha", URL, b"<html>1</html>", fetched_at=datetime(2025, 7, 1))
+        self.archive.store("alpha", URL, b"<html>1</html>", fetched_at=datetime(2025, 7, 2))
+        self.assertEqual(len(self.objects()), 1)
+        self.assertEqual(self.archive.stats()["records"], 2)
+
+    def test_latest_at(self):
+        self.archive.store("alpha", URL, b"first", fetched_at=datetime(2025, 7, 1))
+        self.archive.store("alpha", URL, b"second", fetched_at=datetime(2025, 7, 3))
+        self.assertEqual(self.archive.body("alpha", URL), b"second")
+        self.assertEqual(self.archive.body("alpha", URL, datetime(2025, 7, 2)), b"first")
+        self.assertIsNone(self.archive.body("alpha", URL, datetime(2025, 6, 30)))
+
+    def test_other_instances_read_appended_records(self):
+        other = PageArchive(self.root)
+        self.assertEqual(other.theaters(), [])
+        self.archive.store("alpha", URL, b"body")
+        self.assertEqual(other.urls("alpha"), [URL])
+
+    def test_prune_keeps_latest_record_per_url(self):
+        self.archive.store("alpha", URL, b"old", fetched_at=datetime(2025, 6, 1))
+        self.archive.store("alpha", URL, b"new", fetched_at=datetime(2025, 6, 2))
+        self.archive.store("alpha", URL + "?page=2", b"only", fetched_at=datetime(2025, 5, 1))
+
+        self.assertEqual(self.archive.prune(datetime(2025, 7, 1), dry_run=True), (1, 1))
+        self.assertEqual(len(self.objects()), 3)
+
+        self.assertEqual(self.archive.prune(datetime(2025, 7, 1)), (1, 1))
+        self.assertEqual(len(self.objects()), 2)
+        self.assertEqual(self.archive.body("alpha", URL, datetime(2025, 6, 1, 12)), None)
+        self.assertEqual(self.archive.body("alpha", URL + "?page=2"), b"only")
+        self.assertEqual(len((Path(self.root) / INDEX_FILE).read_text(encoding='utf-8').splitlines()), 2)
+
+    def test_export(self):
+        self.archive.store("alpha", URL, "<html>上映</html>".encode("cp932"))
+        dest = tempfile.mkdtemp()
+        try:
+            written = self.archive.export(dest, "alpha")
+            self.assertEqual([path.name for path in written], ["alpha_schedule.html"])
+            self.assertIn("上映", written[0].read_text(encoding='utf-8'))
+        finally:
+            shutil.rmtree(dest, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
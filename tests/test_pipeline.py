@@ -0,0 +1,110 @@
+"""
+取得・解析を分離したパイプライン（pipeline）の確認
+"""
+import unittest
+
+from src.scraping.base_scraper import MOVIES, SCHEDULES, BaseScraper, PageRequest
+from src.scraping.models import MovieInfo, MovieSchedule, ShowtimeInfo, TheaterInfo
+from src.scraping.pipeline import ParsePipeline, parse_page
+
+BASE_URL = "https://pipeline.example.com"
+
+PAGE_HTML = {
+    f"{BASE_URL}/": """
+        <ul><li class="movie">作品A</li><li class="movie">作品B</li></ul>
+        <table>
+          <tr><td>作品A</td><td>2025-07-05</td><td>10:00</td></tr>
+          <tr><td>作品B</td><td>2025-07-05</td><td>12:30</td></tr>
+        </table>""",
+    f"{BASE_URL}/next": """
+        <table class="schedule">
+          <tr><td>作品A</td><td>2025-07-05</td><td>18:00</td></tr>
+          <tr><td>作品A</td><td>2025-07-06</td><td>10:00</td></tr>
+        </table>""",
+}
+PAGES = {url: html.encode("utf-8") for url, html in PAGE_HTML.items()}
+
+
+class FakeScraper(BaseScraper):
+    """通信せず、用意したページを返すスクレイパー（解析プロセスへ渡せるようモジュール直下に置く）"""
+
+    def __init__(self):
+        super().__init__("パイプライン劇場", BASE_URL)
+        self.fetched = []
+
+    def get_theater_info(self) -> TheaterInfo:
+        return TheaterInfo(name=self.theater_name, url=self.base_url)
+
+    def movie_pages(self):
+        return [PageRequest(f"{BASE_URL}/")]
+
+    def schedule_pages(self):
+        return [PageRequest(f"{BASE_URL}/"), PageRequest(f"{BASE_URL}/next"), PageRequest(f"{BASE_URL}/missing")]
+
+    def fetch(self, page: PageRequest):
+        self.fetched.append(page.url)
+        return PAGES.get(page.url)
+
+    def extract_movies(self, page, soup):
+        for element in soup.select("li.movie"):
+            yield MovieInfo(title=element.get_text(strip=True))
+
+    def extract_schedules(self, page, soup):
+        table = self.selector_memo.select_one("schedule", soup, ["table.schedule", "table"])
+        for row in table.select("tr"):
+            title, day, time = (cell.get_text(strip=True) for cell in row.select("td"))
+            yield MovieSchedule(self.theater_name, title, [ShowtimeInfo(date=day, times=[time])])
+
+
+class ParsePipelineTest(unittest.TestCase):
+    """解析プロセスでの抽出結果が直列の抽出と一致する"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.scraper = FakeScraper()
+        cls.expected = list(cls.scraper.iter_records())
+
+    def test_each_page_is_fetched_once(self):
+        scraper = FakeScraper()
+        list(scraper.iter_records())
+        self.assertEqual(scraper.fetched, [f"{BASE_URL}/", f"{BASE_URL}/next", f"{BASE_URL}/missing"])
+        self.assertEqual([kind for kind, _ in self.expected], [MOVIES, MOVIES, SCHEDULES, SCHEDULES,
+                                                               SCHEDULES, SCHEDULES])
+
+    def test_parse_page_in_process(self):
+        [(fetch_page, targets), *_] = self.scraper.page_plan()
+        results, _ = parse_page(self.scraper, targets, PAGES[fetch_page.url])
+        self.assertEqual(results, [[record for kind, record in self.expected[:2]],
+                                   [record for kind, record in self.expected[2:4]]])
+
+    def test_registered_and_unregistered_scrapers(self):
+        registered, unregistered = FakeScraper(), FakeScraper()
+        with ParsePipeline(1, scrapers={"pipeline": registered}) as pipeline:
+            self.assertEqual(list(pipeline.iter_records(registered)), self.expected)
+            self.assertEqual(list(pipeline.iter_records(unregistered)), self.expected)
+            scraped = pipeline.scrape(registered)
+        self.assertEqual(scraped.theater_info.name, "パイプライン劇場")
+        self.assertEqual([movie.title for movie in scraped.movies], ["作品A", "作品B"])
+        self.assertEqual({schedule.movie_title: len(schedule.showtimes) for schedule in scraped.schedules},
+                         {"作品A": 2, "作品B": 1})
+
+    def test_selector_memo_delta_is_returned(self):
+        scraper = FakeScraper()
+        before = scraper.selector_memo.to_dict().get("schedule", {"hits": 0, "misses": 0})
+        with ParsePipeline(1, scrapers={"pipeline": scraper}) as pipeline:
+            list(pipeline.iter_records(scraper))
+        after = scraper.selector_memo.to_dict()["schedule"]
+        # スケジュールを抽出した2ページ分の記録が解析プロセスから戻る
+        self.assertEqual(after["hits"] + after["misses"] - before["hits"] - before["misses"], 2)
+
+    def test_submit_after_close_fails(self):
+        scraper = FakeScraper()
+        pipeline = ParsePipeline(1).start()
+        pipeline.close()
+        [(fetch_page, targets), *_] = scraper.page_plan()
+        with self.assertRaises(RuntimeError):
+            pipeline.submit(scraper, targets, PAGES[fetch_page.url]).result(timeout=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
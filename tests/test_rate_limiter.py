@@ -0,0 +1,59 @@
+"""
+ホスト別のリクエスト間隔制御（rate_limiter）の確認
+"""
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+from src.scraping.rate_limiter import HostRateLimiter, RateLimit, TokenBucket, load_rate_limits
+
+
+class TokenBucketTest(unittest.TestCase):
+    """トークンバケット"""
+
+    def test_burst_then_spacing(self):
+        bucket = TokenBucket(RateLimit(rate=2.0, burst=2))
+        waits = [bucket.reserve() for _ in range(4)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        # 予約が重なるほど待ちが 1/rate 秒ずつ延びる
+        self.assertAlmostEqual(waits[2], 0.5, delta=0.05)
+        self.assertAlmostEqual(waits[3], 1.0, delta=0.05)
+
+    def test_acquire_async_waits(self):
+        bucket = TokenBucket(RateLimit(rate=20.0, burst=1))
+
+        async def acquire_twice():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await bucket.acquire_async()
+            await bucket.acquire_async()
+            return loop.time() - started
+
+        self.assertGreaterEqual(asyncio.run(acquire_twice()), 0.04)
+
+
+class HostRateLimiterTest(unittest.TestCase):
+    """ホストごとのバケット"""
+
+    def test_bucket_per_host(self):
+        limiter = HostRateLimiter(RateLimit(rate=1.0), {"slow.example.com": RateLimit(rate=0.5)})
+        self.assertIs(limiter.bucket("https://a.example.com/x"), limiter.bucket("https://a.example.com/y"))
+        self.assertIsNot(limiter.bucket("https://a.example.com/"), limiter.bucket("https://b.example.com/"))
+        self.assertEqual(limiter.bucket("https://slow.example.com/").rate, 0.5)
+
+    def test_load_from_environment(self):
+        environ = {
+            "SCRAPING_RATE_LIMIT": "2.5",
+            "SCRAPING_RATE_BURST": "3",
+            "SCRAPING_HOST_RATE_LIMITS": "pole2.co.jp=0.5:1, broken, www.eurospace.co.jp=0.25"
+        }
+        with mock.patch.dict(os.environ, environ):
+            limiter = load_rate_limits()
+        self.assertEqual((limiter.default.rate, limiter.default.burst), (2.5, 3))
+        self.assertEqual(limiter.bucket("https://pole2.co.jp/").rate, 0.5)
+        self.assertEqual(limiter.bucket("https://www.eurospace.co.jp/").rate, 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
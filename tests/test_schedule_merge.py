@@ -0,0 +1,97 @@
+"""
+スケジュールの統合（schedule_merge・merge_schedule_records）の確認
+"""
+import unittest
+
+from src.scraping.base_scraper import MOVIES, SCHEDULES, merge_schedule_records
+from src.scraping.models import MovieSchedule, ShowtimeInfo
+from src.scraping.schedule_merge import ScheduleMerger, merge_schedules
+
+THEATER = "テスト劇場"
+
+
+def _schedule(title, *showtimes):
+    return MovieSchedule(theater_name=THEATER, movie_title=title, showtimes=list(showtimes))
+
+
+class ScheduleMergerTest(unittest.TestCase):
+    """映画ごとの統合"""
+
+    def test_fragments_are_merged_per_movie(self):
+        merged = merge_schedules([
+            _schedule("作品A", ShowtimeInfo(date="2025-07-06", times=["14:00"])),
+            _schedule("作品B", ShowtimeInfo(date="2025-07-05", times=["11:00"])),
+            _schedule(" 作品A ", ShowtimeInfo(date="2025-07-05", times=["19:00", "10:00"])),
+        ])
+        self.assertEqual([schedule.movie_title for schedule in merged], ["作品A", "作品B"])
+        self.assertEqual([(showtime.date, showtime.times) for showtime in merged[0].showtimes],
+                         [("2025-07-05", ["10:00", "19:00"]), ("2025-07-06", ["14:00"])])
+
+    def test_duplicate_times_are_removed(self):
+        merged = merge_schedules([
+            _schedule("作品A", ShowtimeInfo(date="2025-07-05", times=["10:00", "10：00", " 10:00 "])),
+            _schedule("作品A", ShowtimeInfo(date="2025-07-05", times=["10:00", "レイト"])),
+        ])
+        self.assertEqual(merged[0].showtimes[0].times, ["10:00", "レイト"])
+
+    def test_screens_are_kept_apart(self):
+        merged = merge_schedules([
+            _schedule("作品A", ShowtimeInfo(date="2025-07-05", times=["10:00"], screen="スクリーン2"),
+                      ShowtimeInfo(date="2025-07-05", times=["12:00"], screen="スクリーン1")),
+        ])
+        self.assertEqual([showtime.screen for showtime in merged[0].showtimes], ["スクリーン1", "スクリーン2"])
+
+    def test_dated_groups_without_times_are_kept(self):
+        merged = merge_schedules([
+            _schedule("作品A", ShowtimeInfo(date="2025-07-06", times=[]),
+                      ShowtimeInfo(date="2025-07-05", times=["10:00"])),
+        ])
+        self.assertEqual([(showtime.date, showtime.times) for showtime in merged[0].showtimes],
+                         [("2025-07-05", ["10:00"]), ("2025-07-06", [])])
+
+    def test_movies_without_showtimes_are_dropped(self):
+        merged = merge_schedules([
+            _schedule("作品A", ShowtimeInfo(date="", times=[])),
+            _schedule("", ShowtimeInfo(date="2025-07-05", times=["10:00"])),
+        ])
+        self.assertEqual(merged, [])
+
+    def test_undated_groups_come_last(self):
+        merged = merge_schedules([
+            _schedule("作品A", ShowtimeInfo(date="近日", times=["10:00"]),
+                      ShowtimeInfo(date="2025-07-05", times=["10:00"])),
+        ])
+        self.assertEqual([showtime.date for showtime in merged[0].showtimes], ["2025-07-05", "近日"])
+
+    def test_group_count(self):
+        merger = ScheduleMerger().extend([
+            _schedule("作品A", ShowtimeInfo(date="2025-07-05", times=["10:00"]),
+                      ShowtimeInfo(date="2025-07-05", times=["12:00"])),
+            _schedule("作品B", ShowtimeInfo(date="2025-07-05", times=["10:00"])),
+        ])
+        self.assertEqual(merger.group_count, 2)
+
+
+class MergeScheduleRecordsTest(unittest.TestCase):
+    """(種別, レコード) の列の統合"""
+
+    def records(self):
+        yield MOVIES, "映画1"
+        for day in range(1, 6):
+            yield SCHEDULES, _schedule("作品A", ShowtimeInfo(date=f"2025-07-0{day}", times=["10:00"]))
+        yield MOVIES, "映画2"
+
+    def test_movies_stream_and_schedules_follow(self):
+        records = list(merge_schedule_records(self.records()))
+        self.assertEqual([kind for kind, _ in records], [MOVIES, MOVIES, SCHEDULES])
+        self.assertEqual(len(records[-1][1].showtimes), 5)
+
+    def test_buffer_is_flushed_at_limit(self):
+        with self.assertLogs("src.scraping.base_scraper", level="WARNING"):
+            records = list(merge_schedule_records(self.records(), max_groups=2))
+        schedules = [record for kind, record in records if kind == SCHEDULES]
+        self.assertEqual([len(schedule.showtimes) for schedule in schedules], [2, 2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+定時・定期ジョブのスケジューラ（scheduler）の確認
+"""
+import asyncio
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, time as dt_time, timedelta, timezone
+from pathlib import Path
+
+from src.discord_bot.scheduler import (
+    IntervalTrigger, Job, JobScheduler, WeeklyTrigger, format_weekly_time, parse_weekly_time, stagger_phases
+)
+
+JST = timezone(timedelta(hours=9))
+
+
+async def _noop():
+    pass
+
+
+class WeeklyTimeTest(unittest.TestCase):
+    """"MON 07:30" 形式"""
+
+    def test_parse(self):
+        self.assertEqual(parse_weekly_time("MON 07:30"), (0, dt_time(7, 30)))
+        self.assertEqual(parse_weekly_time(" sunday 9:05 "), (6, dt_time(9, 5)))
+        self.assertEqual(format_weekly_time("FRI 18:00"), "金曜日 18:00")
+
+    def test_invalid(self):
+        for text in ["", "XYZ 07:30", "MON", "MON 7", "MON 25:00", None]:
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                parse_weekly_time(text)
+
+
+class TriggerTest(unittest.TestCase):
+    """次回実行時刻"""
+
+    def test_weekly_trigger(self):
+        trigger = WeeklyTrigger.parse("MON 07:30", JST)
+        # 2025-07-09 は水曜日
+        self.assertEqual(trigger.next_after(datetime(2025, 7, 9, 12, 0, tzinfo=JST)),
+                         datetime(2025, 7, 14, 7, 30, tzinfo=JST))
+        self.assertEqual(trigger.next_after(datetime(2025, 7, 14, 7, 0, tzinfo=JST)),
+                         datetime(2025, 7, 14, 7, 30, tzinfo=JST))
+        self.assertEqual(trigger.next_after(datetime(2025, 7, 14, 7, 30, tzinfo=JST)),
+                         datetime(2025, 7, 21, 7, 30, tzinfo=JST))
+
+    def test_weekly_trigger_with_offset(self):
+        trigger = WeeklyTrigger.parse("MON 07:30", JST, offset=-timedelta(hours=1))
+        self.assertEqual(trigger.next_after(datetime(2025, 7, 14, 6, 0, tzinfo=JST)),
+                         datetime(2025, 7, 14, 6, 30, tzinfo=JST))
+        self.assertEqual(trigger.next_after(datetime(2025, 7, 14, 7, 0, tzinfo=JST)),
+                         datetime(2025, 7, 21, 6, 30, tzinfo=JST))
+
+    def test_interval_trigger(self):
+        now = datetime(2025, 7, 9, 12, 0, tzinfo=JST)
+        trigger = IntervalTrigger(timedelta(hours=6), phase=timedelta(minutes=10))
+        self.assertEqual(trigger.next_after(now), now + timedelta(minutes=10))
+        self.assertEqual(trigger.next_after(now, now - timedelta(hours=1)), now + timedelta(hours=5))
+        # 停止中に過ぎていた場合は初回と同じだけずらす
+        self.assertEqual(trigger.next_after(now, now - timedelta(hours=7)), now + timedelta(minutes=10))
+
+    def test_interval_from_function(self):
+        trigger = IntervalTrigger(lambda: timedelta(hours=2))
+        now = datetime(2025, 7, 9, 12, 0, tzinfo=JST)
+        self.assertEqual(trigger.next_after(now, now - timedelta(hours=1)), now + timedelta(hours=1))
+
+    def test_stagger_phases(self):
+        self.assertEqual(stagger_phases(["a", "b", "c", "d"], timedelta(hours=4)),
+                         {"a": timedelta(0), "b": timedelta(hours=1), "c": timedelta(hours=2), "d": timedelta(hours=3)})
+        self.assertEqual(stagger_phases([], timedelta(hours=4)), {})
+
+
+class JobSchedulerTest(unittest.TestCase):
+    """実行記録の引き継ぎ"""
+
+    NOW = datetime(2025, 7, 9, 12, 0, tzinfo=JST)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.state_path = str(Path(self.directory) / "scheduler_state.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _save_state(self, next_run: datetime):
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump({"report": {"last_run": None, "scheduled": next_run.isoformat(),
+                                  "next_run": next_run.isoformat()}}, f)
+
+    def _job(self):
+        return Job("report", WeeklyTrigger.parse("MON 07:30", JST), _noop, misfire_grace=timedelta(hours=1))
+
+    def test_new_job(self):
+        scheduler = JobScheduler(self.state_path)
+        job = self._job()
+        scheduler.add_job(job, now=self.NOW)
+        self.assertEqual(job.next_run, datetime(2025, 7, 14, 7, 30, tzinfo=JST))
+
+    def test_missed_run_within_grace_runs_now(self):
+        self._save_state(self.NOW - timedelta(minutes=30))
+        scheduler = JobScheduler(self.state_path)
+        job = self._job()
+        scheduler.add_job(job, now=self.NOW)
+        self.assertEqual(job.next_run, self.NOW)
+
+    def test_missed_run_past_grace_is_skipped(self):
+        self._save_state(self.NOW - timedelta(hours=3))
+        scheduler = JobScheduler(self.state_path)
+        job = self._job()
+        with self.assertLogs("JobScheduler", level="WARNING"):
+            scheduler.add_job(job, now=self.NOW)
+        self.assertEqual(job.next_run, datetime(2025, 7, 14, 7, 30, tzinfo=JST))
+
+    def test_future_run_is_kept(self):
+        saved = self.NOW + timedelta(days=1)
+        self._save_state(saved)
+        job = self._job()
+        JobScheduler(self.state_path).add_job(job, now=self.NOW)
+        self.assertEqual(job.next_run, saved)
+
+    def test_run_records_last_run(self):
+        runs = []
+
+        async def func():
+            runs.append(1)
+
+        async def main():
+            scheduler = JobScheduler(self.state_path)
+            job = Job("refresh", IntervalTrigger(timedelta(hours=1)), func)
+            scheduler.add_job(job)
+            scheduler.start()
+            for _ in range(100):
+                if runs and not job.running:
+                    break
+                await asyncio.sleep(0.01)
+            scheduler.stop()
+            return job
+
+        job = asyncio.run(main())
+        self.assertEqual(runs, [1])
+        self.assertEqual(job.next_run - job.last_run, timedelta(hours=1))
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)["refresh"]
+        self.assertEqual(saved["last_run"], job.last_run.isoformat())
+
+
+if __name__ == "__main__":
+    unittest.main()
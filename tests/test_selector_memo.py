@@ -0,0 +1,86 @@
+"""
+セレクタ採用記録（selector_memo）の確認
+"""
+import pickle
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.scraping.selector_memo import SelectorMemo, SelectorMemoRegistry
+
+PAGE = BeautifulSoup('<div class="b">B1</div><div class="b">B2</div><p class="c">C</p>', 'html.parser')
+CANDIDATES = ["div.a", "div.b", "p.c"]
+
+
+class SelectorMemoTest(unittest.TestCase):
+    """前回一致した候補を先に試す"""
+
+    def test_winner_is_tried_first(self):
+        memo = SelectorMemo("テスト劇場")
+        self.assertEqual([element.get_text() for element in memo.select("items", PAGE, CANDIDATES)], ["B1", "B2"])
+        self.assertEqual(memo.select_one("items", PAGE, CANDIDATES).get_text(), "B1")
+        self.assertEqual(memo.to_dict()["items"], {"winner": "div.b", "hits": 1, "misses": 1})
+
+    def test_no_match(self):
+        memo = SelectorMemo("テスト劇場")
+        self.assertEqual(memo.select("items", PAGE, ["span"]), [])
+        self.assertIsNone(memo.select_one("items", PAGE, ["span"]))
+        self.assertEqual(memo.to_dict()["items"], {"winner": None, "hits": 0, "misses": 2})
+
+    def test_winner_not_in_candidates_is_ignored(self):
+        memo = SelectorMemo("テスト劇場")
+        memo.restore({"items": {"winner": "span.removed"}})
+        self.assertEqual(memo.select_one("items", PAGE, ["p.c"]).get_text(), "C")
+        self.assertEqual(memo.to_dict()["items"]["winner"], "p.c")
+
+    def test_delta_from_worker_copy(self):
+        memo = SelectorMemo("テスト劇場")
+        memo.select("items", PAGE, CANDIDATES)
+        worker = pickle.loads(pickle.dumps(memo))
+        self.assertEqual(worker.to_dict()["items"], {"winner": "div.b", "hits": 0, "misses": 0})
+
+        worker.select("items", PAGE, CANDIDATES)
+        worker.select_one("other", PAGE, CANDIDATES)
+        memo.merge(worker.drain_delta())
+        self.assertEqual(worker.drain_delta(), {})
+        self.assertEqual(memo.to_dict(), {
+            "items": {"winner": "div.b", "hits": 1, "misses": 1},
+            "other": {"winner": "div.b", "hits": 0, "misses": 1},
+        })
+
+
+class SelectorMemoRegistryTest(unittest.TestCase):
+    """保存と復元"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.state_path = str(Path(self.directory) / "selector_memo.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_winners_survive_restart_and_counts_reset(self):
+        registry = SelectorMemoRegistry(self.state_path)
+        registry.get("テスト劇場").select("items", PAGE, CANDIDATES)
+        registry.save()
+
+        restored = SelectorMemoRegistry(self.state_path).get("テスト劇場")
+        self.assertEqual(restored.to_dict()["items"], {"winner": "div.b", "hits": 0, "misses": 0})
+        restored.select("items", PAGE, CANDIDATES)
+        self.assertEqual(restored.to_dict()["items"]["hits"], 1)
+
+    def test_unused_sites_are_kept(self):
+        registry = SelectorMemoRegistry(self.state_path)
+        registry.get("劇場1").select("items", PAGE, CANDIDATES)
+        registry.save()
+        second = SelectorMemoRegistry(self.state_path)
+        second.get("劇場2").select("items", PAGE, CANDIDATES)
+        second.save()
+        self.assertEqual(sorted(SelectorMemoRegistry(self.state_path)._saved), ["劇場1", "劇場2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
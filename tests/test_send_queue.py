@@ -0,0 +1,103 @@
+"""
+チャンネル別のメッセージ送信キュー（send_queue）の確認
+"""
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+import discord
+
+from src.discord_bot.send_queue import MessageSendQueue
+from src.scraping.rate_limiter import RateLimit
+
+
+def _http_error(status: int, headers=None) -> discord.HTTPException:
+    response = SimpleNamespace(status=status, reason="error", headers=headers or {})
+    return discord.HTTPException(response, "error")
+
+
+class FakeChannel:
+    """送信内容を記録するチャンネル（errorsの例外を先頭から順に送出する）"""
+
+    def __init__(self, channel_id: int, errors=()):
+        self.id = channel_id
+        self.errors = list(errors)
+        self.sent = []
+
+    async def send(self, **kwargs):
+        await asyncio.sleep(0)
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append(kwargs["content"])
+        return kwargs["content"]
+
+
+class RetryAfterTest(unittest.TestCase):
+    """再送の判定と待ち時間"""
+
+    def setUp(self):
+        self.queue = MessageSendQueue(retry_base_seconds=5.0)
+
+    def test_rate_limited(self):
+        self.assertEqual(self.queue._retry_after(discord.RateLimited(3.5), 1), (True, 3.5))
+        self.assertEqual(self.queue._retry_after(_http_error(429, {"Retry-After": "2"}), 1), (True, 2.0))
+        self.assertEqual(self.queue._retry_after(_http_error(429), 2), (True, 10.0))
+
+    def test_client_errors_are_not_retried(self):
+        self.assertEqual(self.queue._retry_after(_http_error(403), 1), (False, 0.0))
+        self.assertEqual(self.queue._retry_after(_http_error(400), 1), (False, 0.0))
+
+    def test_server_errors_back_off(self):
+        self.assertEqual(self.queue._retry_after(_http_error(503), 1), (True, 5.0))
+        self.assertEqual(self.queue._retry_after(_http_error(500), 3), (True, 20.0))
+        self.assertEqual(self.queue._retry_after(asyncio.TimeoutError(), 2), (True, 10.0))
+
+
+class MessageSendQueueTest(unittest.TestCase):
+    """チャンネルごとの順序と再送"""
+
+    def _queue(self, attempts=3):
+        return MessageSendQueue(limit=RateLimit(rate=1000.0, burst=100), attempts=attempts, retry_base_seconds=0.0)
+
+    def test_messages_keep_their_order(self):
+        async def main():
+            queue = self._queue()
+            first, second = FakeChannel(1), FakeChannel(2)
+            results = await asyncio.gather(*[
+                queue.send(channel, content=f"{channel.id}-{index}")
+                for index in range(5) for channel in (first, second)
+            ])
+            return first, second, results
+
+        first, second, results = asyncio.run(main())
+        self.assertEqual(first.sent, [f"1-{index}" for index in range(5)])
+        self.assertEqual(second.sent, [f"2-{index}" for index in range(5)])
+        self.assertEqual(results[:2], ["1-0", "2-0"])
+
+    def test_retry_after_server_error(self):
+        channel = FakeChannel(1, errors=[_http_error(502)])
+        with self.assertLogs("MessageSendQueue", level="WARNING"):
+            result = asyncio.run(self._queue().send(channel, content="hello"))
+        self.assertEqual((result, channel.sent), ("hello", ["hello"]))
+
+    def test_client_error_is_raised_without_retry(self):
+        async def main():
+            queue = self._queue()
+            channel = FakeChannel(1, errors=[_http_error(403)])
+            with self.assertRaises(discord.HTTPException):
+                await queue.send(channel, content="denied")
+            # 失敗した送信のあとも同じチャンネルに送れる
+            self.assertEqual(await queue.send(channel, content="next"), "next")
+            return channel
+
+        self.assertEqual(asyncio.run(main()).sent, ["next"])
+
+    def test_gives_up_after_attempts(self):
+        channel = FakeChannel(1, errors=[_http_error(500), _http_error(500)])
+        with self.assertLogs("MessageSendQueue", level="WARNING"), self.assertRaises(discord.HTTPException):
+            asyncio.run(self._queue(attempts=2).send(channel, content="lost"))
+        self.assertEqual(channel.sent, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
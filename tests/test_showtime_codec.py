@@ -0,0 +1,78 @@
+"""
+上映回のランレングス表現（showtime_codec）の確認
+"""
+import random
+import unittest
+from datetime import date, timedelta
+
+from src.scraping.models import MovieSchedule, ShowtimeInfo
+from src.scraping.schedule_merge import merge_schedules
+from src.scraping.showtime_codec import (decode_showtimes, encode_showtime_dicts, encode_showtimes,
+                                         iter_showtime_dicts)
+
+
+def _merged(showtimes):
+    """統合済み（ScheduleMergerの結果と同じ並び）の上映回"""
+    merged = merge_schedules([MovieSchedule(theater_name="テスト劇場", movie_title="作品", showtimes=showtimes)])
+    return merged[0].showtimes if merged else []
+
+
+class ShowtimeCodecTest(unittest.TestCase):
+    """保存形式への変換と復元"""
+
+    def test_daily_run_is_one_period(self):
+        showtimes = [
+            ShowtimeInfo(date=(date(2025, 7, 5) + timedelta(days=offset)).isoformat(), times=["10:40", "16:15"])
+            for offset in range(14)
+        ]
+        encoded = encode_showtime_dicts(showtimes)
+        self.assertEqual(encoded, [{"from": "2025-07-05", "to": "2025-07-18", "times": ["10:40", "16:15"],
+                                    "screen": None, "ticket_url": None}])
+
+    def test_weekdays_are_recorded_for_skipped_days(self):
+        # 2025-07-07（月）から2週間、日曜を除く
+        days = [date(2025, 7, 7) + timedelta(days=offset) for offset in range(14)]
+        showtimes = [ShowtimeInfo(date=day.isoformat(), times=["19:00"]) for day in days if day.weekday() != 6]
+        runs = encode_showtimes(showtimes)
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs[0].to_dict()["weekdays"], "月火水木金土")
+
+    def test_single_day_uses_legacy_form(self):
+        encoded = encode_showtime_dicts([ShowtimeInfo(date="2025-07-05", times=["10:00"], screen="A")])
+        self.assertEqual(encoded, [{"date": "2025-07-05", "times": ["10:00"], "screen": "A", "ticket_url": None}])
+
+    def test_undated_showtimes_are_kept(self):
+        showtimes = [ShowtimeInfo(date="2025-07-05", times=["10:00"]), ShowtimeInfo(date="近日公開", times=["10:00"])]
+        self.assertEqual(decode_showtimes(encode_showtime_dicts(showtimes)), showtimes)
+
+    def test_round_trip(self):
+        generator = random.Random(20250705)
+        for _ in range(200):
+            showtimes = []
+            for _ in range(generator.randint(0, 30)):
+                day = date(2025, 7, 1) + timedelta(days=generator.randint(0, 40))
+                showtimes.append(ShowtimeInfo(
+                    date=day.isoformat(),
+                    times=generator.choice([["10:00"], ["10:00", "14:00"], ["19:00"], []]),
+                    screen=generator.choice([None, "スクリーン1", "スクリーン2"])
+                ))
+            expected = _merged(showtimes)
+            self.assertEqual(decode_showtimes(encode_showtime_dicts(expected)), expected)
+
+    def test_decode_orders_by_date_and_screen(self):
+        encoded = [
+            {"from": "2025-07-01", "to": "2025-07-03", "times": ["10:00"], "screen": "B", "ticket_url": None},
+            {"from": "2025-07-02", "to": "2025-07-03", "times": ["12:00"], "screen": "A", "ticket_url": None},
+        ]
+        decoded = [(showtime.date, showtime.screen) for showtime in decode_showtimes(encoded)]
+        self.assertEqual(decoded, [("2025-07-01", "B"), ("2025-07-02", "A"), ("2025-07-02", "B"),
+                                   ("2025-07-03", "A"), ("2025-07-03", "B")])
+
+    def test_iter_showtime_dicts_expands_periods(self):
+        encoded = [{"from": "2025-07-05", "to": "2025-07-07", "times": ["10:00"], "screen": None, "ticket_url": None}]
+        self.assertEqual([item["date"] for item in iter_showtime_dicts(encoded)],
+                         ["2025-07-05", "2025-07-06", "2025-07-07"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+結果ファイルの目録（snapshot_catalog）と圧縮・整理（snapshot_compaction）の確認
+"""
+import json
+import multiprocessing
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from src.scraping.page_archive import PageArchive
+from src.scraping.snapshot_catalog import CATALOG_FILE, CatalogEntry, SnapshotCatalog
+from src.scraping.snapshot_compaction import RetentionPolicy, SnapshotCompactor, archive_path
+from src.scraping.snapshot_files import COMBINED_KEY, content_hash
+
+
+def _result(title: str, scraped_at: datetime):
+    return {
+        "theater_info": {"name": "テスト劇場"},
+        "movies": [{"title": title}],
+        "schedules": [{"theater_name": "テスト劇場", "movie_title": title,
+                       "showtimes": [{"date": "2025-07-05", "times": ["10:00"], "screen": None, "ticket_url": None}]}],
+        "scraped_at": scraped_at.isoformat(),
+        "status": "complete"
+    }
+
+
+def _write(catalog: SnapshotCatalog, key: str, result, scraped_at: datetime) -> CatalogEntry:
+    path = catalog.output_dir / f"{key}_{scraped_at.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return catalog.add(path, result, key=key)
+
+
+def _add_entries(output_dir: str, worker: int):
+    catalog = SnapshotCatalog(output_dir)
+    for index in range(20):
+        catalog.put([CatalogEntry(file=f"worker{worker}_{index}.json", key=f"worker{worker}",
+                                  scraped_at="2025-07-05T10:00:00", content_hash="-", size=1, status="complete")])
+
+
+class SnapshotCatalogTest(unittest.TestCase):
+    """目録"""
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.catalog = SnapshotCatalog(self.output_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def test_latest_and_range(self):
+        for day in (1, 2, 3):
+            _write(self.catalog, "alpha", _result(f"作品{day}", datetime(2025, 7, day)), datetime(2025, 7, day))
+        self.assertEqual(self.catalog.latest("alpha").scraped_at, "2025-07-03T00:00:00")
+        in_range = self.catalog.in_range("alpha", datetime(2025, 7, 2), datetime(2025, 7, 3))
+        self.assertEqual([entry.scraped_at[:10] for entry in in_range], ["2025-07-02", "2025-07-03"])
+        self.assertEqual(self.catalog.latest_results()["alpha"]["movies"], [{"title": "作品3"}])
+
+    def test_content_hash_matches_the_file(self):
+        result = _result("作品", datetime(2025, 7, 1))
+        entry = _write(self.catalog, "alpha", result, datetime(2025, 7, 1))
+        self.assertEqual(entry.content_hash, content_hash(result))
+
+    def test_other_instances_see_updates(self):
+        other = SnapshotCatalog(self.output_dir)
+        _write(self.catalog, "alpha", _result("作品", datetime(2025, 7, 1)), datetime(2025, 7, 1))
+        other.put([])
+        self.assertIsNotNone(other.latest("alpha"))
+
+    def test_rebuild_without_catalog_file(self):
+        _write(self.catalog, "alpha", _result("作品", datetime(2025, 7, 1)), datetime(2025, 7, 1))
+        (Path(self.output_dir) / CATALOG_FILE).unlink()
+        rebuilt = SnapshotCatalog(self.output_dir)
+        self.assertEqual(rebuilt.keys(), ["alpha"])
+
+    def test_concurrent_processes_keep_all_entries(self):
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=_add_entries, args=(self.output_dir, worker)) for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(len(SnapshotCatalog(self.output_dir).entries()), 80)
+        self.assertEqual(sorted(path.name for path in Path(self.output_dir).glob("*.tmp")), [])
+
+
+class SnapshotCompactorTest(unittest.TestCase):
+    """重複削除・アーカイブ・保持期限"""
+
+    NOW = datetime(2025, 9, 15, 12, 0)
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.catalog = SnapshotCatalog(self.output_dir)
+        self.pages = PageArchive(str(Path(self.output_dir) / "pages"))
+        self.compactor = SnapshotCompactor(
+            self.output_dir, RetentionPolicy(keep_days=7, archive_months=1, page_keep_days=30),
+            catalog=self.catalog, pages=self.pages
+        )
+        self.results = {}
+        for moment, title in [(datetime(2025, 7, 10), "作品A"), (datetime(2025, 8, 10), "作品A"),
+                              (datetime(2025, 9, 1), "作品B"), (datetime(2025, 9, 14), "作品B")]:
+            result = _result(title, moment)
+            self.results[moment] = result
+            _write(self.catalog, "alpha", result, moment)
+        combined = {"alpha": self.results[datetime(2025, 9, 14)], "beta": {}}
+        _write(self.catalog, COMBINED_KEY, combined, datetime(2025, 8, 1))
+        _write(self.catalog, COMBINED_KEY, combined, datetime(2025, 9, 14))
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def test_dry_run_changes_nothing(self):
+        before = sorted(path.name for path in Path(self.output_dir).iterdir())
+        report = self.compactor.compact(self.NOW, dry_run=True)
+        self.assertEqual(report.deduplicated, 1)
+        self.assertEqual(sorted(path.name for path in Path(self.output_dir).iterdir()), before)
+
+    def test_compact(self):
+        report = self.compactor.compact(self.NOW)
+        self.assertEqual(report.deduplicated, 1)
+        self.assertEqual(report.archived, 4)
+        # 2025-07 は保持月数を過ぎたので削除（参照している回はアーカイブに自分の内容を持つ）
+        self.assertEqual(report.expired, 1)
+        self.assertFalse((Path(self.output_dir) / archive_path("2025-07")).exists())
+
+        entries = {entry.scraped_at[:10]: entry for entry in self.catalog.entries("alpha")}
+        self.assertEqual(sorted(entries), ["2025-08-10", "2025-09-01", "2025-09-14"])
+        self.assertTrue(entries["2025-09-14"].stored)
+        for day, moment in [("2025-08-10", datetime(2025, 8, 10)), ("2025-09-01", datetime(2025, 9, 1))]:
+            self.assertEqual(self.catalog.load(entries[day]), self.results[moment])
+
+        combined = self.catalog.entries(COMBINED_KEY)
+        self.assertEqual(combined[0].archive, archive_path("2025-08"))
+        self.assertEqual(self.catalog.load(combined[0]), self.catalog.load(combined[-1]))
+
+    def test_latest_files_are_kept(self):
+        self.compactor.compact(datetime(2026, 12, 1))
+        self.assertEqual(self.catalog.latest("alpha").scraped_at[:10], "2025-09-14")
+        self.assertTrue(self.catalog.latest("alpha").stored)
+        self.assertTrue(self.catalog.latest(COMBINED_KEY).stored)
+
+    def test_page_archive_is_pruned(self):
+        url = "https://example.com/schedule/"
+        self.pages.store("alpha", url, b"old", fetched_at=datetime(2025, 7, 1))
+        self.pages.store("alpha", url, b"new", fetched_at=datetime(2025, 9, 14))
+        report = self.compactor.compact(self.NOW)
+        self.assertEqual((report.pages_expired, report.pages_deleted), (1, 1))
+        self.assertEqual(self.pages.body("alpha", url), b"new")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+起動時の読み込みの確認（スクレイピングを行わないコマンドは重い依存を読み込まない）
+"""
+import json
+import subprocess
+import sys
+import time
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# run_scraping.py list では読み込まないモジュール
+HEAVY_MODULES = ("selenium", "pandas", "discord", "requests", "bs4")
+
+# 起動に許す時間（秒）。現状は0.2秒程度
+STARTUP_BUDGET_SECONDS = 2.0
+
+_RUN_LIST = """
+import json, runpy, sys
+sys.argv = ["run_scraping.py", "list"]
+runpy.run_path("run_scraping.py", run_name="__main__")
+loaded = sorted({name.split(".")[0] for name in sys.modules})
+sys.stderr.write(json.dumps(loaded))
+"""
+
+
+class StartupTest(unittest.TestCase):
+    """run_scraping.py list の起動"""
+
+    def run_list(self):
+        started = time.monotonic()
+        completed = subprocess.run(
+            [sys.executable, "-c", _RUN_LIST],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60
+        )
+        elapsed = time.monotonic() - started
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        return set(json.loads(completed.stderr.strip().splitlines()[-1])), completed.stdout, elapsed
+
+    def test_list_does_not_import_heavy_modules(self):
+        loaded, stdout, _ = self.run_list()
+        self.assertIn("利用可能な映画館一覧", stdout)
+        self.assertEqual(sorted(loaded & set(HEAVY_MODULES)), [])
+
+    def test_list_starts_within_budget(self):
+        _, _, elapsed = self.run_list()
+        self.assertLess(elapsed, STARTUP_BUDGET_SECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+既知の映画タイトル辞書（title_dictionary）の確認
+"""
+import json
+import pickle
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.scraping.snapshot_catalog import get_snapshot_catalog
+from src.scraping.title_dictionary import AhoCorasick, TitleDictionary
+
+
+class AhoCorasickTest(unittest.TestCase):
+    """複数文字列の同時検索"""
+
+    def test_overlapping_matches(self):
+        automaton = AhoCorasick(["he", "she", "his", "hers"])
+        self.assertEqual(sorted(automaton.iter_matches("ushers")), [(1, "she"), (2, "he"), (2, "hers")])
+
+    def test_find_all_in_order_of_first_appearance(self):
+        automaton = AhoCorasick(["惑星ソラリス", "ストーカー", "ソラリス"])
+        text = "ストーカー／惑星ソラリス／ストーカー"
+        self.assertEqual(automaton.find_all(text), ["ストーカー", "惑星ソラリス", "ソラリス"])
+
+    def test_empty_and_duplicate_words(self):
+        automaton = AhoCorasick(["", "abc", "abc"])
+        self.assertEqual(automaton.words, ["abc"])
+        self.assertEqual(automaton.find_all("xyz"), [])
+
+
+class TitleDictionaryTest(unittest.TestCase):
+    """映画館ごとの辞書"""
+
+    def setUp(self):
+        self.snapshot_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.snapshot_dir, ignore_errors=True)
+
+    def _write_snapshot(self, key: str, result):
+        path = Path(self.snapshot_dir) / f"{key}_20250705_100000.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        get_snapshot_catalog(self.snapshot_dir).add(path, result, key=key)
+
+    def test_short_titles_are_not_registered(self):
+        dictionary = TitleDictionary("alpha", self.snapshot_dir, ["ラ・ジュテ", "PERFECT DAYS", "ソラ", ""])
+        self.assertIn("PERFECT DAYS", dictionary)
+        self.assertNotIn("ソラ", dictionary)
+        self.assertEqual(dictionary.find("本日：ラ・ジュテ、PERFECT DAYS、ソラ"), ["ラ・ジュテ", "PERFECT DAYS"])
+        self.assertEqual(dictionary.find(""), [])
+
+    def test_titles_from_past_results_of_the_same_theater(self):
+        self._write_snapshot("alpha", {
+            "movies": [{"title": "惑星ソラリス", "director": "タルコフスキー"}, {"title": "お知らせです"}],
+            "schedules": [{"movie_title": "ストーカー",
+                           "showtimes": [{"date": "2025-07-05", "times": ["10:00"]}]}],
+        })
+        self._write_snapshot("beta", {
+            "movies": [{"title": "ノスタルジア", "director": "タルコフスキー"}], "schedules": []
+        })
+        dictionary = TitleDictionary("alpha", self.snapshot_dir)
+        self.assertEqual(dictionary.find("ノスタルジア／ストーカー／お知らせです／惑星ソラリス"),
+                         ["ストーカー", "惑星ソラリス"])
+        self.assertEqual(len(dictionary), 2)
+
+    def test_pickled_copy_is_loaded(self):
+        self._write_snapshot("alpha", {
+            "movies": [{"title": "惑星ソラリス", "duration": 167}], "schedules": []
+        })
+        dictionary = TitleDictionary("alpha", self.snapshot_dir, ["ストーカー"])
+        copy = pickle.loads(pickle.dumps(dictionary))
+        shutil.rmtree(self.snapshot_dir)
+        self.assertEqual(copy.find("惑星ソラリス・ストーカー"), ["惑星ソラリス", "ストーカー"])
+
+    def test_added_titles_rebuild_the_automaton(self):
+        dictionary = TitleDictionary("alpha", self.snapshot_dir, ["ストーカー"])
+        self.assertEqual(dictionary.find("鏡・ストーカー"), ["ストーカー"])
+        dictionary.add(["ノスタルジア"])
+        self.assertEqual(dictionary.find("ノスタルジア・ストーカー"), ["ノスタルジア", "ストーカー"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+週次上映ラインナップの集計（weekly_lineup）の確認
+"""
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from src.discord_bot.weekly_lineup import WeeklyLineupAggregate, monday_of
+
+WEEK = date(2025, 7, 7)
+
+
+def _schedule(theater: str, title: str, *days: str):
+    return {"theater_name": theater, "movie_title": title,
+            "showtimes": [{"date": day, "times": ["10:00"], "screen": None, "ticket_url": None} for day in days]}
+
+
+def _result(theater: str, schedules, movies=(), status="complete"):
+    return {"theater_info": {"name": theater}, "movies": list(movies), "schedules": list(schedules),
+            "scraped_at": "2025-07-06T12:00:00", "status": status}
+
+
+class WeeklyLineupAggregateTest(unittest.TestCase):
+    """差分更新と週ごとの切り出し"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.state_path = str(Path(self.directory) / "weekly_lineup.json")
+        self.lineup = WeeklyLineupAggregate(self.state_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _titles(self, week_start=WEEK):
+        return sorted(info.movie.title for info in self.lineup.weekly_schedule(week_start).movies)
+
+    def test_monday_of(self):
+        self.assertEqual(monday_of(date(2025, 7, 13)), WEEK)
+        self.assertEqual(monday_of(WEEK), WEEK)
+
+    def test_two_week_window(self):
+        self.lineup.update_theater("alpha", _result("アルファ座", [
+            _schedule("アルファ座", "今週の作品", "2025-07-08"),
+            _schedule("アルファ座", "来週の作品", "2025-07-20"),
+            _schedule("アルファ座", "再来週の作品", "2025-07-21"),
+            _schedule("アルファ座", "先週の作品", "2025-07-06"),
+        ]))
+        schedule = self.lineup.weekly_schedule(date(2025, 7, 9))
+        self.assertEqual((schedule.week_start, schedule.week_end), (WEEK, date(2025, 7, 20)))
+        self.assertEqual(self._titles(), ["今週の作品", "来週の作品"])
+        self.assertEqual(schedule.total_theaters, 1)
+
+    def test_same_title_at_several_theaters(self):
+        self.lineup.update_theater("alpha", _result("アルファ座", [_schedule("アルファ座", "共通作品", "2025-07-08")],
+                                                    movies=[{"title": "共通作品", "director": "監督A"}]))
+        self.lineup.update_theater("beta", _result("ベータ座", [_schedule("ベータ座", "共通作品", "2025-07-09")]))
+        [info] = self.lineup.weekly_schedule(WEEK).movies
+        self.assertEqual(info.theaters, ["アルファ座", "ベータ座"])
+        self.assertEqual(info.movie.director, "監督A")
+
+    def test_complete_result_replaces_and_partial_result_adds(self):
+        self.lineup.update_theater("alpha", _result("アルファ座", [_schedule("アルファ座", "作品A", "2025-07-08")]))
+        self.assertEqual(self._titles(), ["作品A"])
+
+        self.lineup.update_theater("alpha", _result("アルファ座", [_schedule("アルファ座", "作品B", "2025-07-08")],
+                                                    status="partial"))
+        self.assertEqual(self._titles(), ["作品A", "作品B"])
+
+        self.lineup.update_theater("alpha", _result("アルファ座", [_schedule("アルファ座", "作品C", "2025-07-08")]))
+        self.assertEqual(self._titles(), ["作品C"])
+        self.assertIsNone(self.lineup.movie("作品A"))
+
+    def test_on_record_updates_built_weeks(self):
+        self.assertEqual(self._titles(), [])
+        self.lineup.on_record("alpha", "movies", {"title": "新作", "duration": 100})
+        self.lineup.on_record("alpha", "schedules", _schedule("アルファ座", "新作", "2025-07-10"))
+        [info] = self.lineup.weekly_schedule(WEEK).movies
+        self.assertEqual((info.movie.title, info.movie.duration, info.theaters), ("新作", 100, ["アルファ座"]))
+        self.assertEqual(self.lineup.theater_names(), {"alpha": "アルファ座"})
+
+    def test_theater_lineup_skips_undated_showtimes(self):
+        schedule = _schedule("アルファ座", "作品A", "2025-07-09", "2025-07-08")
+        schedule["showtimes"].append({"date": None, "times": ["18:00"], "screen": None, "ticket_url": None})
+        self.lineup.update_theater("alpha", _result("アルファ座", [schedule]))
+        [(title, movie, showtimes)] = self.lineup.theater_lineup("alpha")
+        self.assertEqual(title, "作品A")
+        self.assertIsNone(movie)
+        self.assertEqual([showtime.date for showtime in showtimes], ["2025-07-08", "2025-07-09"])
+        self.assertEqual(self.lineup.theater_lineup("unknown"), [])
+
+    def test_save_and_load(self):
+        self.lineup.update_theater("alpha", _result("アルファ座", [_schedule("アルファ座", "作品A", "2025-07-08")]))
+        self.lineup.save()
+        restored = WeeklyLineupAggregate(self.state_path)
+        self.assertEqual(len(restored), 1)
+        self.assertEqual([info.movie.title for info in restored.weekly_schedule(WEEK).movies], ["作品A"])
+
+    def test_without_state_path_nothing_is_written(self):
+        lineup = WeeklyLineupAggregate(None)
+        lineup.update_theater("alpha", _result("アルファ座", [_schedule("アルファ座", "作品A", "2025-07-08")]))
+        lineup.save()
+        self.assertEqual(list(Path(self.directory).iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()